@@ -0,0 +1,63 @@
+import os
+import sys
+from typing import Callable
+
+import pytest
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+INPUT_DIR = os.path.join(REPOSITORY_DIR, "input_files")
+
+# the tests import the modules of the repository, so that they run from any working directory
+if REPOSITORY_DIR not in sys.path:
+    sys.path.insert(0, REPOSITORY_DIR)
+
+from dpp import DegreeLoad  # noqa: E402
+from input_loader import load_degree_plan  # noqa: E402
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem  # noqa: E402
+
+
+def catalog_path(catalog: str) -> str:
+    """
+    Returns the path of a bundled catalog.
+
+    :param catalog: The file name of the catalog in input_files, e.g. 'mini_cs.json'.
+    :type catalog: str
+    :return: The absolute path of the catalog.
+    :rtype: str
+    """
+    return os.path.join(INPUT_DIR, catalog)
+
+
+def describe_degree_plan(degree_plan: tuple) -> tuple:
+    """
+    Describes a loaded degree plan (see `load_degree_plan`) by plain values, so that degree plans loaded in
+    different ways can be compared.
+
+    :param degree_plan: The mandatory points, the target points and the courses.
+    :type degree_plan: tuple
+    :return: The points and every attribute of every course.
+    :rtype: tuple
+    """
+    mandatory_points, target_points, degree_courses = degree_plan
+    return mandatory_points, target_points, [
+        (c.number, c.semester_type, c.name, c.points, c.avg_grade, type(c.avg_grade), c.is_mandatory,
+         c.prerequisites.cnf_course_numbers) for c in degree_courses]
+
+
+@pytest.fixture
+def make_problem() -> Callable[..., LocalDegreePlanningProblem]:
+    """
+    Returns a factory of local search problems of the bundled catalogs: make_problem(catalog, load, **kwargs)
+    builds a LocalDegreePlanningProblem of a catalog of input_files with the semester points of a DegreeLoad name,
+    and passes the other arguments (e.g. the initializer) to it.
+
+    :return: The factory.
+    :rtype: Callable[..., LocalDegreePlanningProblem]
+    """
+    def make(catalog: str = "mini_math.json", load: str = "LOW", **kwargs) -> LocalDegreePlanningProblem:
+        mandatory_points, target_points, degree_courses = load_degree_plan(catalog_path(catalog))
+        min_semester_points, max_semester_points = DegreeLoad[load].value
+        return LocalDegreePlanningProblem(degree_courses, mandatory_points, target_points, min_semester_points,
+                                          max_semester_points, **kwargs)
+
+    return make
@@ -0,0 +1,97 @@
+import random
+
+import numpy as np
+import pytest
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_plan import LocalDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import hill_climbing
+
+
+def sample_plans(problem: LocalDegreePlanningProblem) -> list[LocalDegreePlan]:
+    plans = [LocalDegreePlan()]
+    for seed in range(4):
+        random.seed(seed)
+        state = problem.get_initial_state()
+        plans += [state, hill_climbing(problem, max_iter=5).state]
+        plans += problem.get_neighbors(state)[:5]
+    return plans
+
+
+def assert_same_plan(plan: LocalDegreePlan, other: LocalDegreePlan):
+    # the plans compare their strings, whose average grades are rounded differently when built course by course
+    assert plan.course_semesters == other.course_semesters
+    assert (plan.total_points, plan.mandatory_points, plan.semesters_num) == (
+        other.total_points, other.mandatory_points, other.semesters_num)
+    assert plan.avg_grade == pytest.approx(other.avg_grade)
+
+
+def local_semester_points(problem: LocalDegreePlanningProblem, plan: LocalDegreePlan) -> list[int]:
+    points = [0] * plan.semesters_num
+    for number, semester in plan.course_semesters.items():
+        points[semester] += problem.catalog.offering(problem.catalog.course_id(number), semester % 2).points
+    return points
+
+
+# the physics catalogs offer a few courses twice in the same semester type, and a catalog keeps one of the offerings
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'mini_math.json', 'math.json'])
+def test_plans_round_trip(make_problem, catalog):
+    problem = make_problem(catalog, initializer='mixed')
+    for plan in sample_plans(problem):
+        array_plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, plan)
+        assert_same_plan(array_plan.to_local_degree_plan(), plan)
+        assert (array_plan.total_points, array_plan.mandatory_points, array_plan.semesters_num) == (
+            plan.total_points, plan.mandatory_points, plan.semesters_num)
+        assert array_plan.avg_grade == pytest.approx(plan.avg_grade)
+        assert array_plan.semester_points.tolist() == local_semester_points(problem, plan)
+
+        encoding = array_plan.to_bytes()
+        assert len(encoding) == len(problem.catalog)
+        decoded = ArrayDegreePlan.from_bytes(problem.catalog, encoding)
+        assert decoded == array_plan and hash(decoded) == hash(array_plan)
+        assert_same_plan(problem.decode(problem.encode(plan)), plan)
+
+
+def test_add_and_remove_match_the_local_plan(make_problem):
+    problem = make_problem(initializer='mixed')
+    random.seed(0)
+    plan = problem.get_initial_state()
+    array_plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, plan)
+    changes = 0
+    for neighbor in problem.get_neighbors(plan):
+        before, after = plan.course_semesters, neighbor.course_semesters
+        added, removed = after.items() - before.items(), before.items() - after.items()
+        if len(added) == 1 and not removed:
+            ((number, semester),) = added
+            course = problem.catalog.offering(problem.catalog.course_id(number), semester % 2)
+            assert_same_plan(array_plan.add_course(course, semester).to_local_degree_plan(), neighbor)
+            changes += 1
+        elif len(removed) == 1 and not added:
+            ((number, semester),) = removed
+            course = problem.catalog.offering(problem.catalog.course_id(number), semester % 2)
+            assert array_plan.took_course(course)
+            assert_same_plan(array_plan.remove_course(course).to_local_degree_plan(), neighbor)
+            changes += 1
+    assert changes > 0
+    # the plan itself is not changed
+    assert_same_plan(array_plan.to_local_degree_plan(), plan)
+
+
+def test_invalid_changes_are_rejected(make_problem):
+    problem = make_problem()
+    course_id = next(i for i in range(len(problem.catalog)) if problem.catalog.offering(i, 0) is not None)
+    course = problem.catalog.offering(course_id, 0)
+    plan = ArrayDegreePlan(problem.catalog).add_course(course, 0)
+    for semester in [0, 2]:
+        with pytest.raises(ValueError):
+            plan.add_course(course, semester)
+    # a semester of the other type, and a semester after the next one
+    for semester in [1, 4]:
+        with pytest.raises(ValueError):
+            ArrayDegreePlan(problem.catalog).add_course(course, semester)
+    with pytest.raises(ValueError):
+        ArrayDegreePlan(problem.catalog).remove_course(course)
+    with pytest.raises(ValueError):
+        plan.semester_of[course_id] = ArrayDegreePlan.NOT_TAKEN
+    assert np.count_nonzero(plan.semester_of >= 0) == 1
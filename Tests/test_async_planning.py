@@ -0,0 +1,99 @@
+import asyncio
+import multiprocessing
+import random
+import time
+
+import pytest
+
+import cancellation
+from async_planning import AsyncPlanner
+from cancellation import SearchCancelled, cancellation_scope, check_cancelled, init_worker, is_cancelled
+from conftest import INPUT_DIR, catalog_path
+from dpp import run_graph_search_main
+from input_loader import load_degree_plan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import hill_climbing
+
+
+@pytest.fixture
+def flags(monkeypatch):
+    flags = multiprocessing.RawArray('b', 2)
+    monkeypatch.setattr(cancellation, '_flags', None)
+    init_worker(flags)
+    return flags
+
+
+def test_cancellation_flags(flags):
+    assert not is_cancelled()
+    flags[1] = 1
+    with cancellation_scope(0):
+        assert not is_cancelled()
+        check_cancelled()
+    with cancellation_scope(1):
+        assert is_cancelled()
+        with pytest.raises(SearchCancelled):
+            check_cancelled()
+    # outside a scope nothing is cancelled
+    assert not is_cancelled()
+
+
+def test_cancelled_searches_stop(flags):
+    mandatory_points, target_points, degree_courses = load_degree_plan(catalog_path("mini_cs.json"))
+    flags[0] = 1
+    with cancellation_scope(0):
+        with pytest.raises(SearchCancelled):
+            run_graph_search_main('ucs', {'degree_courses': degree_courses, 'mandatory_points': mandatory_points,
+                                          'target_points': target_points, 'min_semester_points': 15,
+                                          'max_semester_points': 25})
+        random.seed(0)
+        result = hill_climbing(LocalDegreePlanningProblem(degree_courses, mandatory_points, target_points, 15, 25))
+    assert result.stop_reason == 'cancelled'
+
+
+def test_planner_runs_searches():
+    async def run():
+        planner = AsyncPlanner(INPUT_DIR, max_concurrent=2)
+        try:
+            return await asyncio.gather(planner.plan('mini_math.json', 'hill', 'low', seed=1),
+                                        planner.plan('mini_cs.json', 'sa', 'medium', {'max_evaluations': 500},
+                                                     seed=1))
+        finally:
+            planner.close()
+
+    for solution, expanded in asyncio.run(run()):
+        assert solution is not None and expanded > 0
+
+
+@pytest.mark.parametrize('arguments', [('nothing.json', 'hill', 'low'), ('mini_math.json', 'nothing', 'low'),
+                                       ('../mini_math.json', 'hill', 'low')])
+def test_planner_rejects_invalid_requests(arguments):
+    async def run():
+        planner = AsyncPlanner(INPUT_DIR, max_concurrent=1)
+        try:
+            await planner.plan(*arguments)
+        finally:
+            planner.close()
+
+    with pytest.raises(ValueError):
+        asyncio.run(run())
+
+
+def test_cancelling_a_call_frees_its_worker():
+    async def run() -> float:
+        planner = AsyncPlanner(INPUT_DIR, max_concurrent=1)
+        try:
+            # uniform cost search on the full catalog runs for minutes
+            task = asyncio.create_task(planner.plan('cs.json', 'ucs', 'medium'))
+            await asyncio.sleep(1)
+            assert not task.done()
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+            start = time.monotonic()
+            solution, _ = await planner.plan('mini_math.json', 'hill', 'low', seed=1)
+            assert solution is not None
+            return time.monotonic() - start
+        finally:
+            planner.close()
+
+    assert asyncio.run(run()) < 30
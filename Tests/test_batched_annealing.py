@@ -0,0 +1,60 @@
+import random
+
+import numpy as np
+import pytest
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.batched_annealing import batched_simulated_annealing, random_moves
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import exp_cool_schedule
+
+
+def initial_plans(problem: LocalDegreePlanningProblem, chains: int) -> np.ndarray:
+    return np.stack([ArrayDegreePlan.from_local_degree_plan(problem.catalog, problem.get_initial_state()).semester_of
+                     for _ in range(chains)])
+
+
+def test_random_moves_change_at_most_two_courses(make_problem):
+    problem = make_problem(initializer='mixed')
+    random.seed(0)
+    plans = initial_plans(problem, 64)
+    candidates = random_moves(problem, plans, np.random.default_rng(0))
+    assert ((candidates != plans).sum(axis=1) <= 2).all()
+    assert ((candidates >= ArrayDegreePlan.NOT_TAKEN) & (candidates < problem.max_semester_num)).all()
+    placed = candidates >= 0
+    parities = np.where(placed, candidates % 2, 0)
+    assert problem.catalog.offered[np.nonzero(placed)[1], parities[placed]].all()
+
+
+@pytest.mark.parametrize('catalog', ['mini_math.json', 'mini_cs.json'])
+def test_batched_annealing_plan_keeps_constraints(make_problem, catalog):
+    problem = make_problem(catalog, initializer='mixed')
+    random.seed(0)
+    result = batched_simulated_annealing(problem, exp_cool_schedule, chains=32, max_iter=300)
+    plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, result.state).semester_of
+    assert problem.array_is_feasible(plan[None])[0]
+    assert result.iterations <= 300
+    assert problem.expanded == 32 * result.iterations
+
+
+def test_batched_annealing_completes_the_degree(make_problem):
+    problem = make_problem(initializer='mixed')
+    random.seed(0)
+    assert problem.is_valid(batched_simulated_annealing(problem, exp_cool_schedule, chains=64, max_iter=500).state)
+
+
+def test_same_seed_gives_same_plan(make_problem):
+    plans = []
+    for _ in range(2):
+        random.seed(2)
+        plans.append(batched_simulated_annealing(make_problem(initializer='mixed'), exp_cool_schedule, chains=16,
+                                                 max_iter=100).state)
+    assert plans[0] == plans[1]
+
+
+def test_batched_annealing_stops_at_the_evaluation_budget(make_problem):
+    random.seed(0)
+    result = batched_simulated_annealing(make_problem(initializer='mixed'), exp_cool_schedule, chains=16,
+                                         max_evaluations=160)
+    assert result.stop_reason == 'max_evaluations'
+    assert result.evaluations == 160
@@ -0,0 +1,22 @@
+import random
+
+import numpy as np
+import pytest
+
+from local_search.local_search_ import process_stochastic_beam_search, stochastic_beam_search
+
+
+def run(problem, search, **kwargs) -> tuple:
+    # the initial states are drawn with random and the beams are sampled with numpy
+    random.seed(4)
+    np.random.seed(4)
+    result = search(problem, k=10, max_iter=5, **kwargs)
+    return result.state, result.iterations, problem.expanded
+
+
+@pytest.mark.parametrize('threads', [1, 10])
+def test_threaded_beam_counts_every_expansion(make_problem, threads):
+    state, iterations, expanded = run(make_problem(initializer='mixed'), stochastic_beam_search, threads=threads)
+    assert (state, expanded) == run(make_problem(initializer='mixed'), process_stochastic_beam_search,
+                                    processes=2)[::2]
+    assert 0 < expanded <= 10 * iterations
@@ -0,0 +1,86 @@
+import itertools
+import json
+
+import pytest
+
+from catalog_generator import generate_catalog, main
+from input_loader import load_json_degree_plan
+
+
+def courses_of(catalog: dict) -> dict[int, dict]:
+    return {course['course_number']: course for course in catalog['degree_courses']}
+
+
+def meets_prerequisites(course: dict, taken: set[int]) -> bool:
+    return all(taken.intersection(clause) for clause in course['prerequisites'] or ())
+
+
+# every set of electives that completes the degree with exactly its target points, by brute force
+def completions(catalog: dict) -> list[set[int]]:
+    courses = courses_of(catalog)
+    mandatory = {number for number, course in courses.items() if course['is_mandatory']}
+    electives = [number for number in courses if number not in mandatory]
+    elective_points = catalog['target_points'] - sum(courses[number]['points'] for number in mandatory)
+    found = []
+    for size in range(len(electives) + 1):
+        for chosen in itertools.combinations(electives, size):
+            taken = mandatory.union(chosen)
+            if (sum(courses[number]['points'] for number in chosen) == elective_points and
+                    all(meets_prerequisites(courses[number], taken) for number in taken)):
+                found.append(set(chosen))
+    return found
+
+
+def test_catalog_loads_with_the_json_loader(tmp_path):
+    catalog = generate_catalog(courses=40, depth=4, departments=2, seed=0)
+    path = tmp_path / "catalog.json"
+    path.write_text(json.dumps(catalog))
+    mandatory_points, target_points, degree_courses = load_json_degree_plan(str(path))
+    assert target_points == catalog['target_points']
+    assert mandatory_points == sum(course['points'] for course in courses_of(catalog).values()
+                                   if course['is_mandatory'])
+    assert len(degree_courses) == len(catalog['degree_courses'])
+    for course, record in zip(degree_courses, catalog['degree_courses']):
+        assert (course.number, course.semester_type, course.points, course.is_mandatory) == (
+            record['course_number'], record['semester_type'], record['points'], record['is_mandatory'])
+        clauses = course.prerequisites.cnf_course_numbers
+        assert clauses == (None if record['prerequisites'] is None else set(map(frozenset, record['prerequisites'])))
+    assert {number // 1000 for number in courses_of(catalog)} == {10, 11}
+
+
+def test_main_writes_the_catalog(tmp_path):
+    path = tmp_path / "catalog.json"
+    main([str(path), '--courses', '20', '--seed', '3'])
+    assert json.loads(path.read_text()) == generate_catalog(courses=20, seed=3)
+
+
+def test_same_seed_gives_same_catalog():
+    assert generate_catalog(seed=7) == generate_catalog(seed=7)
+    assert generate_catalog(seed=7) != generate_catalog(seed=8)
+
+
+@pytest.mark.parametrize('mandatory_ratio', [0.1, 0.5, 0.9])
+@pytest.mark.parametrize('seed', range(20))
+def test_mandatory_courses_can_be_completed_on_their_own(mandatory_ratio, seed):
+    catalog = generate_catalog(courses=30, depth=4, mandatory_ratio=mandatory_ratio, seed=seed)
+    mandatory = {number for number, course in courses_of(catalog).items() if course['is_mandatory']}
+    for course in catalog['degree_courses']:
+        if course['is_mandatory']:
+            assert meets_prerequisites(course, mandatory)
+        if course['prerequisites'] is not None:
+            # prerequisites are courses of lower levels
+            assert max(map(max, course['prerequisites'])) < course['course_number']
+
+
+@pytest.mark.parametrize('mandatory_ratio', [0.1, 0.3, 0.6])
+@pytest.mark.parametrize('seed', range(15))
+def test_default_target_can_be_reached(mandatory_ratio, seed):
+    catalog = generate_catalog(courses=12, depth=3, mandatory_ratio=mandatory_ratio, seed=seed)
+    assert completions(catalog)
+
+
+@pytest.mark.parametrize('arguments', [{'courses': 0}, {'depth': 0}, {'mandatory_ratio': 1.5},
+                                       {'both_offerings_ratio': -0.1}, {'elective_ratio': -1}])
+def test_invalid_parameters_are_rejected(arguments):
+    with pytest.raises(ValueError):
+        generate_catalog(**arguments)
@@ -0,0 +1,102 @@
+import glob
+import json
+import os
+import shutil
+import struct
+
+import pytest
+
+import compiled_catalog
+from conftest import INPUT_DIR, catalog_path, describe_degree_plan
+from compiled_catalog import load_compiled_catalog, write_compiled_catalog
+from input_loader import compile_degree_plan, load_degree_plan, load_json_degree_plan
+from solution_cache import catalog_hash
+
+CATALOGS = sorted(glob.glob(os.path.join(INPUT_DIR, "*.json")))
+
+
+def copy_catalog(tmp_path, catalog: str = catalog_path("mini_cs.json")) -> str:
+    path = str(tmp_path / os.path.basename(catalog))
+    shutil.copy(catalog, path)
+    return path
+
+
+@pytest.mark.parametrize('catalog', CATALOGS)
+def test_compiled_catalog_loads_the_same_courses(tmp_path, catalog):
+    path = copy_catalog(tmp_path, catalog)
+    compiled_file = compile_degree_plan(path)
+    assert load_compiled_catalog(compiled_file, verify=True)
+    assert describe_degree_plan(load_degree_plan(path)) == describe_degree_plan(load_json_degree_plan(path))
+
+
+def test_stale_compiled_catalog_is_ignored(tmp_path):
+    path = copy_catalog(tmp_path)
+    compiled_file = compile_degree_plan(path)
+    with open(path) as file:
+        data = json.load(file)
+    data['target_points'] += 1
+    with open(path, 'w') as file:
+        json.dump(data, file)
+    os.utime(compiled_file, (0, 0))
+    assert load_degree_plan(path)[1] == data['target_points']
+
+
+def test_compiled_catalog_of_another_version_is_ignored(tmp_path, monkeypatch):
+    path = copy_catalog(tmp_path)
+    monkeypatch.setattr(compiled_catalog, 'FORMAT_VERSION', compiled_catalog.FORMAT_VERSION + 1)
+    compile_degree_plan(path)
+    monkeypatch.undo()
+    with pytest.raises(ValueError):
+        load_compiled_catalog(path[:-len(".json")] + ".dpc")
+    assert describe_degree_plan(load_degree_plan(path)) == describe_degree_plan(load_json_degree_plan(path))
+
+
+def corrupt_points(data: bytes) -> bytes:
+    _, _, header_length = struct.unpack_from("<8sII", data)
+    header = json.loads(data[16:16 + header_length])
+    start = -(-(16 + header_length) // 64) * 64 + header['arrays']['points']['offset']
+    return data[:start] + b"\xff" * 8 + data[start + 8:]
+
+
+@pytest.mark.parametrize('corrupt', [
+    lambda data: b"",
+    lambda data: data[:len(data) // 2],
+    corrupt_points,
+    lambda data: data[:16] + b"[" + data[17:],
+    lambda data: struct.pack("<8sII", b"DPCATLOG", 1, 2) + b"{}",
+])
+def test_corrupt_compiled_catalog_falls_back_to_json(tmp_path, corrupt):
+    path = copy_catalog(tmp_path)
+    compiled_file = compile_degree_plan(path)
+    with open(compiled_file, 'rb') as file:
+        data = file.read()
+    with open(compiled_file, 'wb') as file:
+        file.write(corrupt(data))
+    with pytest.raises(ValueError):
+        load_compiled_catalog(compiled_file, verify=True)
+    assert describe_degree_plan(load_degree_plan(path)) == describe_degree_plan(load_json_degree_plan(path))
+
+
+def test_content_hash_does_not_depend_on_clause_order(tmp_path):
+    path = copy_catalog(tmp_path)
+    with open(path) as file:
+        data = json.load(file)
+    for course in data['degree_courses']:
+        if course.get('prerequisites'):
+            course['prerequisites'] = [clause[::-1] for clause in course['prerequisites'][::-1]]
+    reordered = str(tmp_path / "reordered.json")
+    with open(reordered, 'w') as file:
+        json.dump(data, file, indent=4)
+    assert catalog_hash(*load_json_degree_plan(path)) == catalog_hash(*load_json_degree_plan(reordered))
+
+
+def test_rewriting_keeps_mapped_catalog_intact(tmp_path):
+    mandatory_points, target_points, degree_courses = load_json_degree_plan(catalog_path("mini_cs.json"))
+    compiled_file = str(tmp_path / "catalog.dpc")
+    write_compiled_catalog(compiled_file, mandatory_points, target_points, degree_courses)
+    mapped = load_compiled_catalog(compiled_file)
+    before = describe_degree_plan((mapped.mandatory_points, mapped.target_points, mapped.courses()))
+    write_compiled_catalog(compiled_file, mandatory_points, target_points, degree_courses[:3])
+    assert describe_degree_plan((mapped.mandatory_points, mapped.target_points, mapped.courses())) == before
+    assert len(load_compiled_catalog(compiled_file)) == 3
+    assert os.listdir(tmp_path) == ["catalog.dpc"]
@@ -0,0 +1,39 @@
+import random
+
+import pytest
+
+from local_search.local_degree_plan import LocalDegreePlan
+from local_search.local_search_ import hill_climbing, random_restart_hill_climbing
+
+
+def test_bound_of_empty_plan_bounds_every_plan(make_problem):
+    problem = make_problem('mini_cs.json', 'MEDIUM')
+    random.seed(0)
+    bound = problem.fitness_upper_bound(LocalDegreePlan())
+    for _ in range(5):
+        assert problem.fitness(hill_climbing(problem).state) <= bound + 1e-9
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_bound_depends_on_state_and_bounds_completions(make_problem, seed):
+    problem = make_problem('mini_cs.json', 'MEDIUM')
+    random.seed(seed)
+    state = problem.random_initial_state()
+    bound = problem.fitness_upper_bound(state)
+    assert problem.fitness(state) <= bound + 1e-9
+    assert bound <= problem.fitness_upper_bound(LocalDegreePlan()) + 1e-9
+    # adding courses keeps the completions of the larger plan among those of the smaller one
+    for neighbor in problem.get_neighbors(state):
+        if neighbor.total_points > state.total_points and set(state.course_semesters) <= set(
+                neighbor.course_semesters):
+            assert problem.fitness_upper_bound(neighbor) <= bound + 1e-9
+
+
+def test_random_restarts_abandon_hopeless_restarts(make_problem):
+    problem = make_problem('mini_cs.json', 'MEDIUM')
+    random.seed(0)
+    result, statistics = random_restart_hill_climbing(problem, restarts=16, processes=1)
+    assert statistics.abandoned > 0
+    assert problem.is_valid(result.state)
+    # a valid plan has no other completion
+    assert problem.fitness_upper_bound(result.state) == pytest.approx(problem.fitness(result.state))
@@ -1,6 +1,7 @@
 from local_search.local_degree_plan import LocalDegreePlan
 from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
 from local_search.local_search_ import *
+from local_search.plan_repair import repair_plan
 import time
 
 
@@ -29,7 +30,7 @@ def test_sa_param(degree_planning_search_params):
                     print(f"Started iteration {i}")
                     # start_time = time.time()
                     solution: LocalDegreePlan = (
-                        simulated_annealing(dpp, schedule=lambda t: exp_cool_schedule(t, T0, alpha), eps=eps))
+                        simulated_annealing(dpp, schedule=lambda t: exp_cool_schedule(t, T0, alpha), eps=eps).state)
                     # total_time = time.time() - start_time
                     # print(f"Params: eps={eps}, T0={T0}, alpha={alpha}")
                     # print(f"Average Grade: {solution.avg_grade}")
@@ -46,14 +47,16 @@ def test_sa_param(degree_planning_search_params):
                 print(f"Params: eps={eps}, T0={T0}, alpha={alpha}")
 
 
-def test_local(degree_planning_search_params, algorithm, number_of_runs):
+def test_local(degree_planning_search_params, algorithm, number_of_runs, repair=False):
     runs = []
     expanded = 0
     for i in range(number_of_runs):
         print(f"Iteration num {i}")
         dpp = LocalDegreePlanningProblem(**degree_planning_search_params)
         start_time = time.time()
-        solution: LocalDegreePlan = algorithm(dpp)
+        solution: LocalDegreePlan = algorithm(dpp).state
+        if repair:
+            solution = repair_plan(dpp, solution)
         total_time = time.time() - start_time
         runs.append((solution, total_time))
         expanded += dpp.expanded
@@ -0,0 +1,30 @@
+import random
+
+import numpy as np
+import pytest
+
+from local_search.genetic_algorithm import genetic_algorithm, random_population, repair_population
+
+
+@pytest.mark.parametrize('population_size, elite_size', [(5, 20), (20, 20), (8, 0)])
+def test_elite_size_is_clamped_to_population(make_problem, population_size, elite_size):
+    random.seed(0)
+    result = genetic_algorithm(make_problem(), population_size=population_size, elite_size=elite_size,
+                               max_generations=5)
+    assert result.state is not None
+
+
+def test_repaired_population_keeps_constraints(make_problem):
+    problem = make_problem()
+    rng = np.random.default_rng(0)
+    population = repair_population(problem, random_population(problem, 50, rng), rng)
+    assert not problem.catalog.unmet_prerequisites(population).any()
+    assert (population < problem.max_semester_num).all()
+
+
+def test_same_seed_gives_same_plan(make_problem):
+    plans = []
+    for _ in range(2):
+        random.seed(3)
+        plans.append(genetic_algorithm(make_problem(), population_size=100, max_generations=10).state)
+    assert plans[0] == plans[1]
@@ -0,0 +1,68 @@
+import random
+
+import pytest
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+
+CATALOGS = ['mini_cs.json', 'mini_math.json', 'mini_physics.json', 'math.json', 'physics.json']
+
+
+def assert_keeps_constraints(problem: LocalDegreePlanningProblem, state):
+    plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, state)
+    assert problem.array_is_feasible(plan.semester_of[None])[0]
+    assert not problem.catalog.unmet_prerequisites(plan.semester_of).any()
+    semester_points = plan.semester_points
+    assert (semester_points <= problem.max_semester_points).all()
+    # as in LocalDegreePlan.possible_semesters_to_course, a semester is opened after one with the minimum points
+    assert (semester_points[:-2] >= problem.min_semester_points).all()
+    assert state.mandatory_points <= problem.mandatory_points
+    assert state.total_points - state.mandatory_points <= problem.elective_points
+
+
+@pytest.mark.parametrize('catalog', CATALOGS)
+@pytest.mark.parametrize('load', ['LOW', 'MEDIUM', 'HIGH'])
+def test_greedy_initial_state_keeps_constraints(make_problem, catalog, load):
+    problem = make_problem(catalog, load)
+    for seed in range(10):
+        random.seed(seed)
+        assert_keeps_constraints(problem, problem.greedy_initial_state())
+
+
+@pytest.mark.parametrize('catalog', ['mini_math.json', 'mini_physics.json', 'physics.json'])
+def test_greedy_initial_state_is_usually_complete(make_problem, catalog):
+    problem = make_problem(catalog)
+    random.seed(0)
+    assert sum(problem.is_valid(problem.greedy_initial_state()) for _ in range(10)) >= 5
+
+
+def test_greedy_initial_states_are_diverse(make_problem):
+    problem = make_problem('math.json')
+    random.seed(0)
+    assert len(dict.fromkeys(problem.greedy_initial_state() for _ in range(5))) > 1
+    quiet = make_problem('math.json', greedy_noise=0)
+    assert len(dict.fromkeys(quiet.greedy_initial_state() for _ in range(3))) == 1
+
+
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'mini_physics.json'])
+def test_random_initial_state_keeps_constraints(make_problem, catalog):
+    problem = make_problem(catalog)
+    for seed in range(10):
+        random.seed(seed)
+        assert_keeps_constraints(problem, problem.random_initial_state())
+
+
+@pytest.mark.parametrize('initializer, expected', [('random', {'random'}), ('greedy', {'greedy'}),
+                                                   ('mixed', {'random', 'greedy'})])
+def test_initializer_selects_the_initial_states(make_problem, monkeypatch, initializer, expected):
+    problem = make_problem(initializer=initializer)
+    assert problem.initializer == initializer
+    monkeypatch.setattr(problem, 'greedy_initial_state', lambda: 'greedy')
+    monkeypatch.setattr(problem, 'random_initial_state', lambda: 'random')
+    random.seed(0)
+    assert set(problem.get_initial_state() for _ in range(50)) == expected
+
+
+def test_unknown_initializer_is_rejected(make_problem):
+    with pytest.raises(ValueError):
+        make_problem(initializer='smart')
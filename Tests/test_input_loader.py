@@ -0,0 +1,62 @@
+import glob
+import json
+import os
+
+import pytest
+
+from conftest import INPUT_DIR, describe_degree_plan
+from input_loader import load_json_degree_plan, stream_degree_plan
+
+CATALOGS = sorted(glob.glob(os.path.join(INPUT_DIR, "*.json")))
+
+
+def course_record(number: int, programs: list[str], is_mandatory: bool = False) -> dict:
+    return {'course_number': number, 'semester_type': "A", 'name': f"Course {number}", 'points': 2,
+            'avg_grade': 80, 'is_mandatory': is_mandatory, 'prerequisites': None, 'programs': programs}
+
+
+@pytest.fixture
+def filtered_catalog(tmp_path) -> str:
+    path = str(tmp_path / "catalog.json")
+    with open(path, 'w') as file:
+        json.dump({'target_points': 10, 'degree_courses': [
+            course_record(67101, ['cs'], is_mandatory=True),
+            course_record(671010, ['cs', 'data']),
+            course_record(6710, ['data']),
+            course_record(80131, ['math', 'cs'], is_mandatory=True),
+            course_record(800, []),
+            course_record(7, ['math']),
+        ]}, file)
+    return path
+
+
+def kept_numbers(path: str, **filters) -> list[int]:
+    return [course.number for course in stream_degree_plan(path, **filters)[2]]
+
+
+@pytest.mark.parametrize('catalog', CATALOGS)
+def test_streaming_in_single_characters_matches_json_loading(catalog):
+    streamed = stream_degree_plan(catalog, chunk_size=1)
+    assert describe_degree_plan(streamed) == describe_degree_plan(load_json_degree_plan(catalog))
+
+
+def test_department_filter_uses_leading_digits(filtered_catalog):
+    assert kept_numbers(filtered_catalog, departments={67}) == [67101, 671010, 6710]
+    assert kept_numbers(filtered_catalog, departments=[80, 7]) == [80131, 800, 7]
+    assert stream_degree_plan(filtered_catalog, departments={67})[0] == 2
+
+
+def test_program_filter(filtered_catalog):
+    assert kept_numbers(filtered_catalog, programs={'cs'}) == [67101, 671010, 80131]
+    assert kept_numbers(filtered_catalog, programs=['data', 'math']) == [671010, 6710, 80131, 7]
+    assert kept_numbers(filtered_catalog, programs=set()) == []
+
+
+def test_combined_filters(filtered_catalog):
+    assert kept_numbers(filtered_catalog, departments={67}, programs={'data'}) == [671010, 6710]
+
+
+@pytest.mark.parametrize('departments', [{670}, {-1}, {True}, {"67"}])
+def test_invalid_departments_are_rejected(filtered_catalog, departments):
+    with pytest.raises(ValueError):
+        stream_degree_plan(filtered_catalog, departments=departments)
@@ -0,0 +1,125 @@
+import random
+
+import numpy as np
+import pytest
+
+from course import Course
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_plan import LocalDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+
+OPERATORS = LocalDegreePlanningProblem.OPERATORS
+
+
+def move_kind(state: LocalDegreePlan, neighbor: LocalDegreePlan) -> str:
+    before, after = state.course_semesters, neighbor.course_semesters
+    added = after.keys() - before.keys()
+    removed = before.keys() - after.keys()
+    moved = [number for number in before.keys() & after.keys() if before[number] != after[number]]
+    if len(added) == 1 and not removed and not moved:
+        return 'add'
+    if len(removed) == 1 and not added and not moved:
+        return 'remove'
+    if len(added) == 1 and len(removed) == 1 and not moved:
+        return 'swap_elective'
+    if len(moved) == 1 and not added and not removed:
+        return 'move' if (before[moved[0]] - after[moved[0]]) % 2 == 0 else 'swap_offering'
+    return 'other'
+
+
+def initial_states(problem: LocalDegreePlanningProblem, count: int = 5) -> list[LocalDegreePlan]:
+    states = []
+    for seed in range(count):
+        random.seed(seed)
+        states.append(problem.get_initial_state())
+    return states
+
+
+def assert_feasible(problem: LocalDegreePlanningProblem, neighbor: LocalDegreePlan):
+    plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, neighbor).semester_of
+    assert problem.array_is_feasible(plan[None])[0]
+    assert neighbor.mandatory_points <= problem.mandatory_points
+
+
+@pytest.mark.parametrize('operator', OPERATORS)
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'mini_math.json'])
+def test_each_operator_yields_only_its_feasible_moves(make_problem, operator, catalog):
+    problem = make_problem(catalog, initializer='mixed',
+                           operator_weights={name: float(name == operator) for name in OPERATORS})
+    kinds = set()
+    for state in initial_states(problem):
+        for neighbor in problem.iter_neighbors(state):
+            kinds.add(move_kind(state, neighbor))
+            assert_feasible(problem, neighbor)
+            if operator == 'swap_elective':
+                assert neighbor.mandatory_points == state.mandatory_points
+    assert kinds == {operator}
+
+
+@pytest.mark.parametrize('operator', OPERATORS)
+def test_zero_weight_disables_an_operator(make_problem, operator):
+    weighted = make_problem(initializer='mixed', operator_weights={operator: 0})
+    assert weighted.operator_weights[operator] == 0
+    kinds = set()
+    for state in initial_states(weighted):
+        kinds.update(move_kind(state, neighbor) for neighbor in weighted.iter_neighbors(state))
+    assert kinds == set(OPERATORS) - {operator}
+
+
+def test_invalid_operator_weights_are_rejected(make_problem):
+    for weights in [{'jump': 1}, {'add': -1}]:
+        with pytest.raises(ValueError):
+            make_problem(operator_weights=weights)
+
+
+def test_lazy_neighborhood_differs_from_the_full_one(make_problem):
+    problem = make_problem('cs.json', 'MEDIUM')
+    random.seed(1)
+    state = problem.random_initial_state()
+    lazy = list(dict.fromkeys(problem.iter_neighbors(state)))
+    full = problem.get_neighbors(state)
+    assert (len(lazy), len(full)) == (14, 30)
+    # the full neighborhood removes a course and adds or moves another one in one step
+    assert 'other' in {move_kind(state, neighbor) for neighbor in full}
+
+
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'mini_math.json'])
+def test_random_neighbors_are_neighbors(make_problem, catalog):
+    problem = make_problem(catalog, initializer='mixed')
+    for state in initial_states(problem):
+        neighbors = dict.fromkeys(problem.get_neighbors(state))
+        expanded = problem.expanded
+        for _ in range(30):
+            assert problem.get_random_neighbor(state) in neighbors
+        assert problem.expanded == expanded + 30
+
+
+def test_random_neighbor_of_a_state_without_moves_is_the_state():
+    # the only course is an elective, and the degree has no elective points
+    problem = LocalDegreePlanningProblem([Course(1, 'A', "Elective", 3, 90)], 3, 3, 10, 20)
+    state = LocalDegreePlan()
+    assert problem.get_neighbors(state) == []
+    assert problem.get_random_neighbor(state) is state
+
+
+def test_random_neighbor_falls_back_to_the_full_neighborhood(make_problem, monkeypatch):
+    problem = make_problem(initializer='mixed')
+    random.seed(0)
+    state = problem.get_initial_state()
+    # every random draw is rejected
+    monkeypatch.setattr(problem, '_random_single_step_neighbor', lambda *args: None)
+    monkeypatch.setattr(problem, '_random_double_step_neighbor', lambda *args: None)
+    assert problem.get_random_neighbor(state) in dict.fromkeys(problem.get_neighbors(state))
+
+
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'mini_math.json', 'math.json'])
+def test_batch_fitness_matches_fitness(make_problem, catalog):
+    problem = make_problem(catalog, initializer='mixed')
+    for state in initial_states(problem, 3):
+        neighbors = problem.get_neighbors(state) + [state, LocalDegreePlan()]
+        expected = [problem.fitness(neighbor) for neighbor in neighbors]
+        np.testing.assert_allclose(problem.batch_fitness(neighbors), expected, rtol=1e-12)
+        plans = np.stack([ArrayDegreePlan.from_local_degree_plan(problem.catalog, neighbor).semester_of
+                          for neighbor in neighbors])
+        np.testing.assert_allclose(problem.array_fitness(plans), expected, rtol=1e-12)
+    assert len(problem.batch_fitness([])) == 0
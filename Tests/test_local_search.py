@@ -0,0 +1,228 @@
+import math
+import random
+import time
+
+import numpy as np
+import pytest
+
+from local_search import local_search_
+from local_search.local_search_ import (AdaptiveSchedule, LocalSearchProblem, SearchTracker, _tempering_run,
+                                       exp_cool_schedule, first_improvement_hill_climbing, hill_climbing,
+                                       parallel_tempering, simulated_annealing)
+
+
+# walks on the integers from 0, with a single peak of fitness 0: random neighbors are the next integer, so
+# simulated annealing walks past the peak when it accepts every move
+class WalkProblem(LocalSearchProblem):
+
+    def __init__(self, peak: int = 3, valid: tuple[int, ...] = (), delay: float = 0):
+        self.peak, self.valid, self.delay = peak, valid, delay
+        self.expanded = 0
+
+    def get_initial_state(self) -> int:
+        return 0
+
+    def get_neighbors(self, state: int) -> list[int]:
+        return [state - 1, state + 1]
+
+    def get_random_neighbor(self, state: int) -> int:
+        time.sleep(self.delay)
+        return state + 1
+
+    def fitness(self, state: int) -> float:
+        return -abs(state - self.peak)
+
+    def is_valid(self, state: int) -> bool:
+        return state in self.valid
+
+
+# yields the neighbors in a fixed order and records the ones that were drawn
+class OrderedWalkProblem(WalkProblem):
+
+    def __init__(self, peak: int = 4):
+        super().__init__(peak)
+        self.drawn = []
+
+    def iter_neighbors(self, state: int):
+        for neighbor in [state - 1, state + 1, state + 2]:
+            self.drawn.append(neighbor)
+            yield neighbor
+
+
+def hot(t: int) -> float:
+    # every move is accepted
+    return 1e12
+
+
+def test_tracker_keeps_the_best_and_the_best_valid_states():
+    tracker = SearchTracker(WalkProblem(valid=(1, 5)))
+    for state in range(8):
+        tracker.next_iteration(1)
+        tracker.observe(state, WalkProblem().fitness(state))
+    result = tracker.result(7)
+    assert (result.best, result.best_fitness, result.best_valid, result.best_valid_fitness) == (3, 0, 1, -2)
+    # the valid state is the solution
+    assert result.state == 1 and result.final == 7
+    assert (result.iterations, result.evaluations, result.stop_reason) == (8, 8, 'completed')
+    # only the improvements are recorded
+    assert [(iteration, best, best_valid) for iteration, _, _, best, best_valid in result.trajectory] == [
+        (1, -3, -math.inf), (2, -2, -2), (3, -1, -2), (4, 0, -2)]
+
+
+def test_result_without_valid_states_is_the_best_state():
+    tracker = SearchTracker(WalkProblem())
+    for state in [5, 4, 6]:
+        tracker.observe(state, WalkProblem().fitness(state))
+    result = tracker.result(6)
+    assert result.best_valid is None and result.best_valid_fitness == -math.inf
+    assert result.state == result.best == 4
+
+
+def test_observe_batch_copies_the_best_rows():
+    tracker = SearchTracker(WalkProblem())
+    states = np.array([[0, 1], [2, 3], [4, 5]])
+    tracker.observe_batch(states, np.array([1.0, 3.0, 2.0]), np.array([True, False, True]))
+    states[:] = -1
+    result = tracker.result(None)
+    assert result.best.tolist() == [2, 3] and result.best_valid.tolist() == [4, 5]
+
+
+def test_simulated_annealing_returns_the_best_visited_state():
+    random.seed(0)
+    result = simulated_annealing(WalkProblem(valid=(2, 6)), hot, max_iter=10)
+    assert result.final == 10
+    assert (result.best, result.best_fitness) == (3, 0)
+    assert result.state == result.best_valid == 2
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_simulated_annealing_plan_is_the_best_valid_plan_visited(make_problem, seed):
+    # the greedy initial states of this catalog are valid, and the search moves away from them
+    problem = make_problem('mini_physics.json', initializer='greedy')
+    random.seed(seed)
+    result = simulated_annealing(problem, exp_cool_schedule, max_iter=2000)
+    assert result.best_valid is not None and problem.is_valid(result.state)
+    assert problem.fitness(result.state) == result.trajectory[-1][-1] == result.best_valid_fitness
+    assert problem.fitness(result.state) >= problem.fitness(result.final)
+    assert problem.fitness(result.best) == result.best_fitness >= problem.fitness(result.final)
+
+
+def test_hill_climbing_stops_at_a_local_maximum():
+    random.seed(0)
+    result = hill_climbing(WalkProblem())
+    assert result.state == result.final == 3
+    assert result.stop_reason == 'local_maximum'
+    # three moves, and the iteration that finds no better neighbor
+    assert (result.iterations, result.evaluations) == (4, 8)
+
+
+def test_first_improvement_hill_climbing_moves_to_the_first_better_neighbor():
+    problem = OrderedWalkProblem()
+    result = first_improvement_hill_climbing(problem)
+    # state + 2 is better than state + 1 on the way to the peak, but it is never drawn
+    assert problem.drawn == [-1, 1, 0, 2, 1, 3, 2, 4, 3, 5, 6]
+    assert result.state == result.final == 4
+    assert result.stop_reason == 'local_maximum'
+    assert (result.iterations, result.evaluations) == (5, 11)
+
+
+@pytest.mark.parametrize('budget, value', [('max_iter', 20), ('max_evaluations', 15), ('max_seconds', 0.2)])
+def test_budget_stops_simulated_annealing(budget, value):
+    random.seed(0)
+    budgets = {'max_iter': 10 ** 6, budget: value}
+    result = simulated_annealing(WalkProblem(delay=0.01 if budget == 'max_seconds' else 0), hot, **budgets)
+    assert result.stop_reason == budget
+    if budget == 'max_seconds':
+        assert value <= result.seconds < value + 1
+    else:
+        assert getattr(result, {'max_iter': 'iterations', 'max_evaluations': 'evaluations'}[budget]) == value
+
+
+def test_cold_schedule_stops_simulated_annealing():
+    result = simulated_annealing(WalkProblem(), lambda t: 0.0)
+    assert result.stop_reason == 'temperature'
+    assert result.iterations == 0 and result.state == 0
+
+
+@pytest.mark.parametrize('accepted, expected', [(True, 0.8), (False, 1.2)])
+def test_adaptive_temperature_moves_toward_the_target_ratio(accepted, expected):
+    schedule = AdaptiveSchedule(T0=1.0, window=20, adjust=0.2)
+    # every worsening move is accepted (more than the target ratio) or rejected (fewer)
+    for _ in range(19):
+        schedule.feedback(-1.0, accepted)
+    assert schedule(0) == 1.0
+    schedule.feedback(-1.0, accepted)
+    assert schedule(0) == pytest.approx(expected)
+    # improving moves do not adjust the temperature
+    for _ in range(40):
+        schedule.feedback(1.0, True)
+    assert schedule(0) == pytest.approx(expected)
+
+
+def test_adaptive_temperature_is_capped():
+    schedule = AdaptiveSchedule(T0=1.0, window=1, adjust=0.5, max_T=2.0)
+    for _ in range(10):
+        schedule.feedback(-100.0, False)
+    assert schedule(0) == 2.0
+
+
+def test_adaptive_target_ratio_decreases_over_the_horizon():
+    schedule = AdaptiveSchedule(initial_ratio=0.5, final_ratio=0.005, horizon=100, patience=10 ** 6)
+    assert schedule.target_ratio == pytest.approx(0.5)
+    for _ in range(50):
+        schedule.feedback(1.0, True)
+    assert schedule.target_ratio == pytest.approx(0.05)
+    for _ in range(100):
+        schedule.feedback(1.0, True)
+    assert schedule.target_ratio == pytest.approx(0.005)
+
+
+def test_adaptive_schedule_reheats_on_stagnation_and_then_freezes():
+    schedule = AdaptiveSchedule(initial_ratio=0.5, final_ratio=0.005, horizon=100, patience=100, max_reheats=2)
+    # the best fitness improves on the first move only
+    schedule.feedback(1.0, True)
+    for _ in range(99):
+        schedule.feedback(0.0, False)
+    assert schedule.reheats == 0 and schedule.target_ratio == pytest.approx(0.005)
+    schedule.feedback(0.0, False)
+    # the progress over the horizon is halved
+    assert schedule.reheats == 1 and schedule.target_ratio == pytest.approx(0.05)
+    for _ in range(100):
+        schedule.feedback(0.0, False)
+    assert schedule.reheats == 2 and schedule(0) > 0
+    for _ in range(100):
+        schedule.feedback(0.0, False)
+    assert schedule.reheats == 2 and schedule(0) == 0
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_simulated_annealing_with_adaptive_schedule_ends_within_budget(make_problem, seed):
+    problem = make_problem(initializer='mixed')
+    random.seed(seed)
+    result = simulated_annealing(problem, AdaptiveSchedule(patience=200), max_iter=5000)
+    # the schedule freezes after its reheats, long before the iterations run out
+    assert result.stop_reason == 'temperature'
+    assert result.iterations < 5000
+    assert result.evaluations == result.iterations
+
+
+def test_tempering_run_keeps_its_valid_initial_state(monkeypatch):
+    # the chain starts at the valid peak, and at a low temperature it never accepts the worse moves
+    monkeypatch.setattr(local_search_, '_worker_problem', WalkProblem(valid=(3,)))
+    assert _tempering_run(3, 1e-9, 10, 0) == (3, 0, 3, 0, 3, 0, 0)
+    # a chain that moves keeps the best valid state it visited
+    assert _tempering_run(1, 1e12, 10, 0)[2:6] == (3, 0, 3, 0)
+    assert _tempering_run(4, 1e12, 10, 0)[2:6] == (4, -1, None, -math.inf)
+
+
+@pytest.mark.parametrize('seed', range(2))
+def test_parallel_tempering_returns_the_best_valid_plan_of_all_chains(make_problem, seed):
+    # the greedy initial states of this catalog are valid
+    problem = make_problem('mini_physics.json', initializer='greedy')
+    random.seed(seed)
+    result = parallel_tempering(problem, temperatures=[0.05, 1, 50], exchange_interval=30, max_exchanges=4,
+                                processes=1)
+    assert result.stop_reason == 'max_iter'
+    assert problem.is_valid(result.state)
+    assert problem.fitness(result.state) == result.best_valid_fitness == result.trajectory[-1][-1]
+    assert result.best_valid_fitness >= problem.fitness(result.final)
@@ -0,0 +1,84 @@
+import itertools
+import random
+
+import numpy as np
+import pytest
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import hill_climbing
+from local_search.plan_repair import _best_exact_subset, repair_plan
+
+
+def assert_feasible(problem: LocalDegreePlanningProblem, state):
+    plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, state).semester_of
+    assert not problem.catalog.unmet_prerequisites(plan[None]).any()
+    assert problem.array_is_feasible(plan[None])[0]
+
+
+@pytest.mark.parametrize('catalog', ['mini_math.json', 'mini_physics.json'])
+@pytest.mark.parametrize('seed', range(4))
+def test_repaired_plan_completes_the_degree(make_problem, catalog, seed):
+    problem = make_problem(catalog)
+    random.seed(seed)
+    state = hill_climbing(problem).state
+    repaired = repair_plan(problem, state)
+    assert problem.is_valid(repaired)
+    assert repaired.total_points == problem.target_points
+    assert repaired.mandatory_points == problem.mandatory_points
+    assert_feasible(problem, repaired)
+
+
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'cs.json'])
+@pytest.mark.parametrize('seed', range(4))
+def test_repaired_plan_keeps_constraints(make_problem, catalog, seed):
+    problem = make_problem(catalog, 'MEDIUM')
+    random.seed(seed)
+    state = problem.random_initial_state()
+    repaired = repair_plan(problem, state)
+    assert_feasible(problem, repaired)
+    assert repaired.mandatory_points <= problem.mandatory_points
+    assert repaired.total_points - repaired.mandatory_points <= problem.elective_points
+
+
+def test_valid_plan_is_not_changed(make_problem):
+    problem = make_problem('mini_math.json')
+    random.seed(0)
+    valid = repair_plan(problem, hill_climbing(problem).state)
+    assert repair_plan(problem, valid) is valid
+
+
+def test_best_exact_subset_of_small_knapsack():
+    # four courses, each offered in semesters of type A and B: (points, weighted grades)
+    points = np.array([[3, 3], [2, 2], [4, 4], [1, 1]])
+    weighted_grades = np.array([[240, 270], [160, 150], [300, 320], [90, 95]])
+    options = np.array([[True, True], [True, False], [True, True], [True, True]])
+    # 3 + 2 points (270 + 160) beat 4 + 1 points (320 + 95)
+    assert _best_exact_subset(points, weighted_grades, options, 5).tolist() == [1, 0, -1, -1]
+    assert _best_exact_subset(points, weighted_grades, options, 10).tolist() == [1, 0, 1, 1]
+    assert _best_exact_subset(points, weighted_grades, options, 0).tolist() == [-1, -1, -1, -1]
+    assert _best_exact_subset(points, weighted_grades, options, 11) is None
+    assert _best_exact_subset(points, weighted_grades, options, -1) is None
+
+
+@pytest.mark.parametrize('seed', range(10))
+def test_best_exact_subset_matches_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    points = rng.integers(1, 5, size=(6, 2))
+    weighted_grades = points * rng.integers(60, 100, size=(6, 2))
+    options = rng.random((6, 2)) < 0.7
+    for total_points in range(12):
+        best = None
+        for chosen in itertools.product(*([-1] + np.flatnonzero(row).tolist() for row in options)):
+            taken = [(course, parity) for course, parity in enumerate(chosen) if parity >= 0]
+            if sum(points[c, p] for c, p in taken) == total_points:
+                value = sum(weighted_grades[c, p] for c, p in taken)
+                best = value if best is None else max(best, value)
+        subset = _best_exact_subset(points, weighted_grades, options, total_points)
+        if best is None:
+            assert subset is None
+        else:
+            taken = [(course, parity) for course, parity in enumerate(subset) if parity >= 0]
+            assert all(options[c, p] for c, p in taken)
+            assert sum(points[c, p] for c, p in taken) == total_points
+            assert sum(weighted_grades[c, p] for c, p in taken) == best
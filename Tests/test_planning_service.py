@@ -0,0 +1,123 @@
+import json
+import sys
+import threading
+import time
+import urllib.error
+import urllib.request
+
+import pytest
+
+import dpp
+from conftest import INPUT_DIR, REPOSITORY_DIR
+from planning_service import PlanningService, serve
+from solution_cache import SolutionCache
+
+BASE_REQUEST = {'algorithm': 'hill', 'catalog': 'mini_math.json', 'load': 'low'}
+
+
+@pytest.fixture
+def service(tmp_path):
+    service = PlanningService(INPUT_DIR, workers=1, cache=SolutionCache(str(tmp_path / "cache.sqlite")))
+    yield service
+    service.close()
+
+
+@pytest.fixture
+def server_url(service):
+    server = serve(service, port=0)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
+
+
+def wait_for_computations(service: PlanningService):
+    while service.statistics['in_flight']:
+        time.sleep(0.01)
+
+
+def post(url: str, body) -> tuple[int, dict]:
+    request = urllib.request.Request(f"{url}/plan", json.dumps(body).encode('utf-8'),
+                                     {'Content-Type': 'application/json'})
+    try:
+        with urllib.request.urlopen(request, timeout=120) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+@pytest.mark.parametrize('changes', [
+    {'repair': "false"},
+    {'repair': 1},
+    {'seed': True},
+    {'seed': 1.5},
+    {'max_seconds': True},
+    {'max_evaluations': 0},
+    {'algorithm': 'unknown'},
+    {'algorithm': 'bfs'},
+    {'load': 'extreme'},
+    {'unknown': 1},
+])
+def test_invalid_requests_are_rejected(changes):
+    with pytest.raises(ValueError):
+        PlanningService.normalize(dict(BASE_REQUEST, **changes))
+
+
+def test_requests_are_normalized():
+    normalized = PlanningService.normalize(dict(BASE_REQUEST, repair=True, seed=3, max_evaluations=100))
+    assert normalized == {'algorithm': 'hill', 'catalog': 'mini_math.json', 'load': 'LOW', 'seed': 3,
+                          'initializer': 'greedy', 'repair': True, 'budget': {'max_evaluations': 100}}
+
+
+def test_reproducible_requests_are_cached(service):
+    request = dict(BASE_REQUEST, seed=1)
+    computed = service.plan(request)
+    wait_for_computations(service)
+    cached = service.plan(request)
+    assert (computed['source'], cached['source']) == ('computed', 'cache')
+    assert computed['plan'] == cached['plan'] and computed['expanded'] == cached['expanded']
+
+
+@pytest.mark.parametrize('arguments, changes', [(['astar', 'mini_math.json', 'low'], {'algorithm': 'astar'}),
+                                                (['hill', 'mini_math.json', 'low', 'repair', '--seed', '1'],
+                                                 {'repair': True, 'seed': 1})])
+def test_command_line_runs_are_cached_for_the_service(service, tmp_path, monkeypatch, arguments, changes):
+    class ServiceCache(SolutionCache):
+        def __init__(self):
+            super().__init__(str(tmp_path / "cache.sqlite"))
+
+    monkeypatch.setattr(dpp, 'SolutionCache', ServiceCache)
+    monkeypatch.setattr(dpp, 'generate_html', lambda solution: None)
+    monkeypatch.chdir(REPOSITORY_DIR)
+    monkeypatch.setattr(sys, 'argv', ['dpp.py', *arguments])
+    dpp.main()
+    assert service.plan(dict(BASE_REQUEST, **changes))['source'] == 'cache'
+
+
+@pytest.mark.parametrize('changes', [{}, {'max_seconds': 30}, {'algorithm': 'rhill', 'seed': 1}])
+def test_irreproducible_requests_are_not_cached(service, changes):
+    request = dict(BASE_REQUEST, **changes)
+    sources = []
+    for _ in range(2):
+        sources.append(service.plan(request)['source'])
+        wait_for_computations(service)
+    assert sources == ['computed', 'computed']
+
+
+def test_http_errors(service, server_url, monkeypatch):
+    assert post(server_url, dict(BASE_REQUEST, repair="false"))[0] == 400
+
+    def fail(request, timeout=None):
+        raise RuntimeError("broken")
+
+    monkeypatch.setattr(service, 'plan', fail)
+    status, body = post(server_url, BASE_REQUEST)
+    assert status == 500
+    assert "broken" in body['error']
+
+
+def test_http_plan(server_url):
+    status, body = post(server_url, dict(BASE_REQUEST, seed=2))
+    assert status == 200
+    assert body['plan']['semesters']
@@ -0,0 +1,48 @@
+import json
+import os
+import subprocess
+import sys
+
+import pytest
+
+from conftest import REPOSITORY_DIR, catalog_path
+from dpp import DegreeLoad, run_many
+from input_loader import load_degree_plan
+
+# runs a seeded search and prints its solution and expanded nodes
+RUN_SEEDED = """
+import json, sys
+from dpp import DegreeLoad, _run_seeded
+from input_loader import load_degree_plan
+mandatory_points, target_points, degree_courses = load_degree_plan("input_files/mini_cs.json")
+min_semester_points, max_semester_points = DegreeLoad.MEDIUM.value
+params = {'degree_courses': degree_courses, 'mandatory_points': mandatory_points, 'target_points': target_points,
+          'min_semester_points': min_semester_points, 'max_semester_points': max_semester_points}
+initializer = None if sys.argv[1] == 'astar' else 'random'
+result = _run_seeded(sys.argv[1], params, initializer, False, 5)
+print(json.dumps([result['solution'], result['expanded']]))
+"""
+
+
+def run_in_subprocess(algorithm: str, hash_seed: str) -> list:
+    environment = dict(os.environ, PYTHONHASHSEED=hash_seed, PYTHONPATH=REPOSITORY_DIR)
+    output = subprocess.run([sys.executable, "-c", RUN_SEEDED, algorithm], cwd=REPOSITORY_DIR, env=environment,
+                            capture_output=True, text=True, check=True, timeout=300).stdout
+    return json.loads(output.splitlines()[-1])
+
+
+@pytest.mark.parametrize('algorithm', ['astar', 'hill', 'sa', 'tabu'])
+def test_same_seed_in_processes_with_different_hash_seeds(algorithm):
+    assert run_in_subprocess(algorithm, "1") == run_in_subprocess(algorithm, "2")
+
+
+def test_runs_do_not_depend_on_jobs():
+    mandatory_points, target_points, degree_courses = load_degree_plan(catalog_path("mini_math.json"))
+    min_semester_points, max_semester_points = DegreeLoad.LOW.value
+    params = {'degree_courses': degree_courses, 'mandatory_points': mandatory_points,
+              'target_points': target_points, 'min_semester_points': min_semester_points,
+              'max_semester_points': max_semester_points}
+    serial = run_many('hill', params, runs=4, jobs=1, seed=7)
+    parallel = run_many('hill', params, runs=4, jobs=2, seed=7)
+    assert ([(run['seed'], run['solution'], run['expanded']) for run in serial] ==
+            [(run['seed'], run['solution'], run['expanded']) for run in parallel])
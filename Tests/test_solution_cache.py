@@ -0,0 +1,81 @@
+import json
+
+import pytest
+
+from conftest import catalog_path
+from dpp import DegreeLoad, _run_seeded, is_reproducible
+from input_loader import load_degree_plan
+from solution_cache import SolutionCache, catalog_hash, decode_solution, encode_solution
+
+MANDATORY_POINTS, TARGET_POINTS, DEGREE_COURSES = load_degree_plan(catalog_path("mini_math.json"))
+PARAMS = {'degree_courses': DEGREE_COURSES, 'mandatory_points': MANDATORY_POINTS, 'target_points': TARGET_POINTS,
+          'min_semester_points': DegreeLoad.LOW.value[0], 'max_semester_points': DegreeLoad.LOW.value[1]}
+
+
+def make_key(**changes) -> str:
+    inputs = {'catalog_hash': catalog_hash(MANDATORY_POINTS, TARGET_POINTS, DEGREE_COURSES), 'algorithm': 'hill',
+              'semester_points': DegreeLoad.LOW.value, 'params': SolutionCache.search_params('greedy'), 'seed': 1}
+    inputs.update(changes)
+    return SolutionCache.key(**inputs)
+
+
+def test_key_depends_on_every_input(monkeypatch):
+    keys = {make_key(), make_key(catalog_hash='0' * 64), make_key(algorithm='sa'),
+            make_key(semester_points=DegreeLoad.HIGH.value),
+            make_key(params=SolutionCache.search_params('random')), make_key(seed=2), make_key(seed=None)}
+    assert len(keys) == 7
+    assert make_key() == make_key(params={'budget': {}, 'repair': False, 'initializer': 'greedy'})
+    monkeypatch.setattr(SolutionCache, 'SEARCH_VERSION', SolutionCache.SEARCH_VERSION + 1)
+    assert make_key() not in keys
+
+
+def test_put_and_get(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.sqlite"))
+    assert cache.get(make_key()) is None
+    cache.put(make_key(), {'kind': 'none'}, 12, 0.5)
+    assert cache.get(make_key()) == ({'kind': 'none'}, 12, 0.5)
+    assert len(cache) == 1
+    cache.clear()
+    assert len(cache) == 0
+
+
+def test_least_recently_used_runs_are_evicted(tmp_path):
+    solution = {'kind': 'courses', 'courses': [[1, "A"]] * 10}
+    cache = SolutionCache(str(tmp_path / "cache.sqlite"), max_bytes=2 * len(str(solution)))
+    cache.put(make_key(seed=1), solution, 1, 0)
+    cache.put(make_key(seed=2), solution, 2, 0)
+    cache.get(make_key(seed=1))
+    cache.put(make_key(seed=3), solution, 3, 0)
+    assert cache.get(make_key(seed=2)) is None
+    assert cache.get(make_key(seed=1)) is not None and cache.get(make_key(seed=3)) is not None
+    assert cache.size <= 2 * len(str(solution))
+
+
+def test_cached_seeded_run_matches_a_fresh_run(tmp_path):
+    cache = SolutionCache(str(tmp_path / "cache.sqlite"))
+    run = _run_seeded('sa', PARAMS, 'random', False, 4)
+    cache.put(make_key(algorithm='sa', seed=4), run['solution'], run['expanded'], run['seconds'])
+    fresh = _run_seeded('sa', PARAMS, 'random', False, 4)
+    solution, expanded, _ = cache.get(make_key(algorithm='sa', seed=4))
+    assert (json.dumps(solution), expanded) == (json.dumps(fresh['solution']), fresh['expanded'])
+
+
+def test_encoded_solutions_decode_to_the_same_solution():
+    run = _run_seeded('hill', PARAMS, 'random', False, 0)
+    plan = decode_solution(run['solution'], DEGREE_COURSES)
+    assert encode_solution(plan) == run['solution']
+    courses = DEGREE_COURSES[:3]
+    assert decode_solution(encode_solution(courses), DEGREE_COURSES) == courses
+    assert decode_solution(encode_solution(None), DEGREE_COURSES) is None
+
+
+@pytest.mark.parametrize('algorithm, seed, budget, reproducible', [
+    ('astar', None, None, True),
+    ('hill', None, None, False),
+    ('hill', 1, None, True),
+    ('hill', 1, {'max_evaluations': 100}, True),
+    ('hill', 1, {'max_seconds': 1}, False),
+    ('rhill', 1, None, False),
+])
+def test_only_reproducible_runs_are_cacheable(algorithm, seed, budget, reproducible):
+    assert is_reproducible(algorithm, seed, budget) == reproducible
@@ -0,0 +1,73 @@
+import random
+
+import numpy as np
+import pytest
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.tabu_search import TabuList, candidate_moves, tabu_search
+
+
+def test_tabu_list_forgets_the_oldest_keys():
+    tabu = TabuList(3)
+    for key in ['a', 'b', 'a', 'c']:
+        tabu.add(key)
+    # the first 'a' is forgotten, but its second copy is still remembered
+    assert 'a' in tabu and 'b' in tabu and 'c' in tabu
+    assert len(tabu) == 3
+    tabu.add('d')
+    assert 'b' not in tabu and len(tabu) == 3
+
+
+def test_empty_tabu_list_remembers_nothing():
+    tabu = TabuList(0)
+    tabu.add('a')
+    assert 'a' not in tabu and len(tabu) == 0
+
+
+@pytest.mark.parametrize('seed', range(3))
+def test_candidate_moves_features_match_the_moved_plans(make_problem, seed):
+    problem = make_problem('mini_cs.json', 'MEDIUM')
+    random.seed(seed)
+    plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, problem.get_initial_state()).semester_of.copy()
+    features = problem.array_features(plan[None])[0]
+    removed, courses, semesters, move_features = candidate_moves(problem, plan, features)
+    assert len(courses) > 0
+    candidates = np.repeat(plan[None], len(courses), axis=0)
+    rows = np.arange(len(courses))
+    candidates[rows, courses] = semesters
+    swaps = removed >= 0
+    candidates[rows[swaps], removed[swaps]] = ArrayDegreePlan.NOT_TAKEN
+    np.testing.assert_allclose(move_features, problem.array_features(candidates))
+    # the moves stay within the allowed semesters
+    assert (candidates < problem.max_semester_num).all()
+
+
+@pytest.mark.parametrize('catalog', ['mini_cs.json', 'mini_math.json'])
+def test_tabu_search_plan_keeps_constraints(make_problem, catalog):
+    problem = make_problem(catalog, 'MEDIUM')
+    random.seed(0)
+    result = tabu_search(problem, max_iter=300)
+    plan = ArrayDegreePlan.from_local_degree_plan(problem.catalog, result.state).semester_of
+    assert problem.array_is_feasible(plan[None])[0]
+    assert result.iterations <= 300
+
+
+def test_tabu_search_completes_the_degree(make_problem):
+    problem = make_problem('mini_cs.json', 'MEDIUM')
+    random.seed(0)
+    assert problem.is_valid(tabu_search(problem, max_iter=300).state)
+
+
+def test_tabu_search_is_deterministic_given_the_initial_state(make_problem):
+    plans = []
+    for _ in range(2):
+        random.seed(5)
+        plans.append(tabu_search(make_problem('mini_cs.json', 'MEDIUM'), max_iter=200).state)
+    assert plans[0] == plans[1]
+
+
+def test_tabu_search_stops_at_the_evaluation_budget(make_problem):
+    random.seed(1)
+    result = tabu_search(make_problem('mini_cs.json', 'MEDIUM'), max_evaluations=500, patience=10 ** 4)
+    assert result.stop_reason == 'max_evaluations'
+    assert result.evaluations >= 500
@@ -0,0 +1,143 @@
+import asyncio
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional, Union
+
+from cancellation import SearchCancelled, cancellation_scope, init_worker
+from course import Course
+from local_search.local_degree_plan import LocalDegreePlan
+from planning_service import PlanningService, _load_catalog, _plan_in_worker
+from solution_cache import decode_solution
+
+
+def _plan_cancellable(slot: int, input_dir: str, request: dict) -> Optional[tuple[dict, int, float, str]]:
+    """
+    Runs a planning request in a worker process of an AsyncPlanner, checking the cancellation flag of its slot.
+
+    :param slot: The index of the cancellation flag of the request.
+    :type slot: int
+    :param input_dir: The directory of the catalogs.
+    :type input_dir: str
+    :param request: The normalized request (see `PlanningService.normalize`).
+    :type request: dict
+    :return: The result of `_plan_in_worker`, or None if a graph search was cancelled.
+    :rtype: Optional[tuple[dict, int, float, str]]
+    """
+    with cancellation_scope(slot):
+        try:
+            return _plan_in_worker(input_dir, request)
+        except SearchCancelled:
+            return None
+
+
+class AsyncPlanner:
+    """
+    An asyncio API for the degree planning searches, which runs them on a pool of worker processes.
+
+    At most max_concurrent searches run at once, and the other calls wait for their turn. Cancelling the task of a
+    call stops its search: the searches check a shared cancellation flag on every expansion (see `cancellation`),
+    so an abandoned search frees its worker within an iteration instead of running until its budget ends.
+    """
+
+    def __init__(self, input_dir: str = "input_files", max_concurrent: Optional[int] = None):
+        """
+        Starts the worker pool of the planner.
+
+        :param input_dir: The directory of the catalogs.
+        :type input_dir: str
+        :param max_concurrent: Maximum number of searches that run at once, which is also the number of worker
+            processes (default: the number of CPUs).
+        :type max_concurrent: Optional[int]
+        """
+        max_concurrent = max_concurrent or os.cpu_count() or 1
+        self.__input_dir = input_dir
+        self.__flags = multiprocessing.RawArray('b', max_concurrent)
+        self.__free_slots = list(range(max_concurrent))
+        self.__semaphore = asyncio.Semaphore(max_concurrent)
+        self.__executor = ProcessPoolExecutor(max_concurrent, initializer=init_worker, initargs=(self.__flags,))
+        self.__catalogs: dict = {}
+
+    async def plan(self, catalog: str, algorithm: str, load: str, budget: Optional[dict] = None,
+                   initializer: Optional[str] = None, repair: bool = False,
+                   seed: Optional[int] = None) -> tuple[Union[LocalDegreePlan, Optional[list[Course]]], int]:
+        """
+        Runs a search on the worker pool, once fewer than max_concurrent searches are running.
+
+        :param catalog: The file name of the catalog, e.g. 'cs.json'.
+        :type catalog: str
+        :param algorithm: The algorithm name, as given to dpp.py.
+        :type algorithm: str
+        :param load: The semester load: 'low', 'medium' or 'high'.
+        :type load: str
+        :param budget: The budgets of a local search ('max_evaluations' and/or 'max_seconds').
+        :type budget: Optional[dict]
+        :param initializer: The initial states of a local search (see `LocalDegreePlanningProblem.INITIALIZERS`).
+        :type initializer: Optional[str]
+        :param repair: Whether to repair the solution of a local search (see `repair_plan`).
+        :type repair: bool
+        :param seed: The random seed of the search.
+        :type seed: Optional[int]
+        :return: The solution and the number of expanded nodes, as `run_graph_search_main` and
+            `run_local_search_main` return them.
+        :rtype: tuple[Union[LocalDegreePlan, Optional[list[Course]]], int]
+        :raises ValueError: If the request is not valid.
+        """
+        request = PlanningService.normalize(dict(budget or {}, catalog=catalog, algorithm=algorithm, load=load,
+                                                 initializer=initializer, repair=repair, seed=seed))
+        if os.path.basename(catalog) != catalog or not os.path.isfile(os.path.join(self.__input_dir, catalog)):
+            raise ValueError(f"No such catalog: {catalog}")
+        _, _, degree_courses = _load_catalog(self.__input_dir, catalog, self.__catalogs)
+
+        async with self.__semaphore:
+            slot = self.__free_slots.pop()
+            self.__flags[slot] = 0
+            future = asyncio.get_running_loop().run_in_executor(self.__executor, _plan_cancellable, slot,
+                                                                self.__input_dir, request)
+            try:
+                # the shield keeps the slot taken until the search actually stops
+                result = await asyncio.shield(future)
+            except asyncio.CancelledError:
+                self.__flags[slot] = 1
+                while not future.done():
+                    try:
+                        await asyncio.wait([future])
+                    except asyncio.CancelledError:
+                        pass
+                raise
+            finally:
+                self.__free_slots.append(slot)
+        encoded, expanded, _, _ = result
+        return decode_solution(encoded, degree_courses), expanded
+
+    def close(self):
+        """
+        Stops the worker pool, after the running searches finish.
+        """
+        self.__executor.shutdown()
+
+
+_default_planner: Optional[AsyncPlanner] = None
+
+
+async def plan(catalog: str, algorithm: str, load: str, budget: Optional[dict] = None, **kwargs
+               ) -> tuple[Union[LocalDegreePlan, Optional[list[Course]]], int]:
+    """
+    Runs a search on a default AsyncPlanner of the 'input_files' directory, which is created on the first call.
+
+    :param catalog: The file name of the catalog, e.g. 'cs.json'.
+    :type catalog: str
+    :param algorithm: The algorithm name, as given to dpp.py.
+    :type algorithm: str
+    :param load: The semester load: 'low', 'medium' or 'high'.
+    :type load: str
+    :param budget: The budgets of a local search ('max_evaluations' and/or 'max_seconds').
+    :type budget: Optional[dict]
+    :param kwargs: The other arguments of `AsyncPlanner.plan`.
+    :return: The solution and the number of expanded nodes.
+    :rtype: tuple[Union[LocalDegreePlan, Optional[list[Course]]], int]
+    """
+    global _default_planner
+    if _default_planner is None:
+        _default_planner = AsyncPlanner()
+    return await _default_planner.plan(catalog, algorithm, load, budget, **kwargs)
@@ -0,0 +1,346 @@
+import argparse
+import contextlib
+import io
+import json
+import multiprocessing
+import os
+import platform
+import random
+import resource
+import statistics
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+from benchmarks.results_store import DEFAULT_STORE_PATH, ResultsStore, run_metadata
+from dpp import (LOCAL_SEARCH_ALGORITHMS, DegreeLoad, run_graph_search_main, run_local_search_main,
+                 to_local_degree_plan)
+from input_loader import load_degree_plan
+
+# dpp.py also lists bfs, which has no implementation
+ALGORITHMS = ["dfs", "ucs", "astar"] + LOCAL_SEARCH_ALGORITHMS
+INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "input_files")
+
+# the default regression thresholds: relative increases of the median times, the peak RSS and the mean expanded
+# nodes, and absolute decreases of the success ratio and the mean average grade
+DEFAULT_THRESHOLDS = {'wall_seconds': 0.25, 'cpu_seconds': 0.25, 'peak_rss_kib': 0.25, 'expanded': 0.25,
+                      'success_ratio': 0.1, 'avg_grade': 1.0}
+# time differences below this many seconds are noise, and never regressions
+MIN_SECONDS = 0.05
+
+
+# region Runs
+def _run(algorithm: str, input_file: str, load: str, seed: int, budget: dict, connection):
+    """
+    Runs a search in a fresh benchmark process, and sends its measurements through the connection.
+
+    :param algorithm: The algorithm name, as given to dpp.py.
+    :type algorithm: str
+    :param input_file: The path of the catalog.
+    :type input_file: str
+    :param load: The DegreeLoad name.
+    :type load: str
+    :param seed: The random seed of the run.
+    :type seed: int
+    :param budget: The budgets of a local search (see `run_local_search_main`).
+    :type budget: dict
+    :param connection: The sending end of a pipe.
+    """
+    try:
+        mandatory_points, target_points, degree_courses = load_degree_plan(input_file)
+        min_semester_points, max_semester_points = DegreeLoad[load].value
+        params = {'degree_courses': degree_courses, 'mandatory_points': mandatory_points,
+                  'target_points': target_points, 'min_semester_points': min_semester_points,
+                  'max_semester_points': max_semester_points}
+        random.seed(seed)
+        np.random.seed(seed)
+        start_wall, start_cpu = time.perf_counter(), _cpu_seconds()
+        with contextlib.redirect_stdout(io.StringIO()):
+            if algorithm in LOCAL_SEARCH_ALGORITHMS:
+                solution, expanded = run_local_search_main(algorithm, params, budget=budget)
+            else:
+                solution, expanded = run_graph_search_main(algorithm, params)
+        wall_seconds, cpu_seconds = time.perf_counter() - start_wall, _cpu_seconds() - start_cpu
+        plan = to_local_degree_plan(solution) if solution else None
+        valid = (plan is not None and plan.total_points == target_points and
+                 plan.mandatory_points == mandatory_points)
+        connection.send({'status': 'ok', 'wall_seconds': wall_seconds, 'cpu_seconds': cpu_seconds,
+                         'peak_rss_kib': _peak_rss_kib(), 'expanded': expanded, 'valid': valid,
+                         'avg_grade': plan.avg_grade if valid else None})
+    except Exception as e:
+        connection.send({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+
+
+def _cpu_seconds() -> float:
+    """
+    Returns the CPU time of the current process and of its finished child processes (e.g. the pools of the
+    parallel local searches).
+
+    :return: The user and system CPU time in seconds.
+    :rtype: float
+    """
+    own, children = resource.getrusage(resource.RUSAGE_SELF), resource.getrusage(resource.RUSAGE_CHILDREN)
+    return own.ru_utime + own.ru_stime + children.ru_utime + children.ru_stime
+
+
+def _peak_rss_kib() -> int:
+    """
+    Returns the peak resident set size of the current process, or of its largest finished child process.
+
+    :return: The peak RSS in KiB.
+    :rtype: int
+    """
+    scale = 1024 if sys.platform == 'darwin' else 1  # macOS reports bytes, Linux KiB
+    return max(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss,
+               resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) // scale
+
+
+def run_benchmarks(algorithms: list[str], input_files: list[str], loads: list[str], runs: int, seed: int = 0,
+                   budget: Optional[dict] = None, timeout: float = 300.0, jobs: int = 1) -> list[dict]:
+    """
+    Runs every combination of algorithm, input file and load several times, every run in a freshly spawned
+    process, so that its peak RSS and CPU time are its own. Run i of every combination uses the seed seed + i.
+
+    :param algorithms: The algorithm names, as given to dpp.py.
+    :type algorithms: list[str]
+    :param input_files: The paths of the catalogs.
+    :type input_files: list[str]
+    :param loads: The DegreeLoad names.
+    :type loads: list[str]
+    :param runs: Number of runs of every combination.
+    :type runs: int
+    :param seed: The seed of the first run.
+    :type seed: int
+    :param budget: The budgets of the local searches ('max_evaluations' and/or 'max_seconds').
+    :type budget: Optional[dict]
+    :param timeout: Seconds after which a run is killed, and recorded with the status 'timeout'.
+    :type timeout: float
+    :param jobs: Number of runs at once. Runs that share CPUs measure longer times, so compare only results of
+        the same number of jobs.
+    :type jobs: int
+    :return: The measurements of the runs, each with its algorithm, file, load and seed.
+    :rtype: list[dict]
+    """
+    context = multiprocessing.get_context('spawn')
+    pending = [{'algorithm': algorithm, 'file': os.path.basename(input_file), 'load': load, 'seed': seed + i,
+                'path': input_file}
+               for algorithm in algorithms for input_file in input_files for load in loads for i in range(runs)]
+    pending.reverse()
+    running, results = [], []
+    while pending or running:
+        while pending and len(running) < jobs:
+            run = pending.pop()
+            receiver, sender = context.Pipe(duplex=False)
+            process = context.Process(target=_run, args=(run['algorithm'], run['path'], run['load'], run['seed'],
+                                                         budget or {}, sender), daemon=True)
+            process.start()
+            sender.close()
+            running.append((run, process, receiver, time.monotonic()))
+        for entry in list(running):
+            run, process, receiver, start = entry
+            if receiver.poll(0.05):
+                try:
+                    measurement = receiver.recv()
+                except EOFError:
+                    measurement = {'status': 'error', 'error': f"exit code {process.exitcode}"}
+            elif time.monotonic() - start > timeout:
+                measurement = {'status': 'timeout'}
+                process.kill()
+            else:
+                continue
+            process.join()
+            running.remove(entry)
+            result = {key: value for key, value in run.items() if key != 'path'}
+            results.append(dict(result, **measurement))
+            _print_run(results[-1])
+    return results
+
+
+def _print_run(result: dict):
+    """
+    Prints a one line summary of a run.
+
+    :param result: The measurements of the run.
+    :type result: dict
+    """
+    name = f"{result['algorithm']:>8} {result['file']:>18} {result['load']:>6} seed {result['seed']:<4}"
+    if result['status'] != 'ok':
+        print(f"{name} {result['status']} {result.get('error', '')}", file=sys.stderr)
+    else:
+        print(f"{name} {result['wall_seconds']:8.3f}s wall {result['cpu_seconds']:8.3f}s cpu "
+              f"{result['peak_rss_kib'] / 1024:7.1f} MiB {result['expanded']:>9} expanded "
+              f"{'valid' if result['valid'] else 'invalid'}", file=sys.stderr)
+
+
+# endregion
+
+# region Summaries and Baselines
+def summarize(results: list[dict]) -> dict[str, dict]:
+    """
+    Aggregates the runs of every combination of algorithm, file and load: the median wall and CPU times, the
+    maximal peak RSS, the mean expanded nodes, the success ratio and the mean average grade of the valid plans.
+    Runs that timed out or failed count as unsuccessful and are left out of the other statistics.
+
+    :param results: The measurements of the runs (see `run_benchmarks`).
+    :type results: list[dict]
+    :return: The statistics, by a key of the form 'algorithm/file/load'.
+    :rtype: dict[str, dict]
+    """
+    groups: dict[str, list[dict]] = {}
+    for result in results:
+        groups.setdefault(f"{result['algorithm']}/{result['file']}/{result['load']}", []).append(result)
+    summaries = {}
+    for key, group in groups.items():
+        finished = [result for result in group if result['status'] == 'ok']
+        grades = [result['avg_grade'] for result in finished if result['valid']]
+        summaries[key] = {
+            'runs': len(group),
+            'finished': len(finished),
+            'wall_seconds': statistics.median(r['wall_seconds'] for r in finished) if finished else None,
+            'cpu_seconds': statistics.median(r['cpu_seconds'] for r in finished) if finished else None,
+            'peak_rss_kib': max(r['peak_rss_kib'] for r in finished) if finished else None,
+            'expanded': statistics.mean(r['expanded'] for r in finished) if finished else None,
+            'success_ratio': len(grades) / len(group),
+            'avg_grade': statistics.mean(grades) if grades else None,
+        }
+    return summaries
+
+
+def compare(summaries: dict[str, dict], baseline: dict[str, dict],
+            thresholds: Optional[dict[str, float]] = None) -> list[str]:
+    """
+    Compares the statistics of a benchmark against a baseline, for the combinations both of them ran.
+
+    :param summaries: The statistics of the benchmark (see `summarize`).
+    :type summaries: dict[str, dict]
+    :param baseline: The statistics of the baseline.
+    :type baseline: dict[str, dict]
+    :param thresholds: The regression thresholds by statistic, which override `DEFAULT_THRESHOLDS`: the largest
+        allowed relative increase of the times, the peak RSS and the expanded nodes, and the largest allowed
+        absolute decrease of the success ratio and the average grade.
+    :type thresholds: Optional[dict[str, float]]
+    :return: A description of every regression.
+    :rtype: list[str]
+    """
+    thresholds = dict(DEFAULT_THRESHOLDS, **(thresholds or {}))
+    regressions = []
+    for key in sorted(summaries.keys() & baseline.keys()):
+        current, previous = summaries[key], baseline[key]
+        if previous['finished'] and not current['finished']:
+            regressions.append(f"{key}: no run finished (the baseline finished {previous['finished']})")
+            continue
+        for name, threshold in thresholds.items():
+            new, old = current.get(name), previous.get(name)
+            if new is None or old is None:
+                continue
+            if name in ('success_ratio', 'avg_grade'):
+                regressed = old - new > threshold
+            else:
+                regressed = new > old * (1 + threshold)
+                if name.endswith('_seconds'):
+                    regressed = regressed and new - old > MIN_SECONDS
+            if regressed:
+                regressions.append(f"{key}: {name} {old:.4g} -> {new:.4g} (threshold {threshold:g})")
+    return regressions
+
+
+def _format(value: Optional[float], pattern: str) -> str:
+    """
+    Formats a statistic for the summary table.
+
+    :param value: The statistic, or None if no run measured it.
+    :type value: Optional[float]
+    :param pattern: The format specification.
+    :type pattern: str
+    :return: The formatted statistic, or "-" for None, right-aligned to the same width.
+    :rtype: str
+    """
+    return format(value, pattern) if value is not None else format("-", f">{pattern.split('.')[0]}")
+
+
+# endregion
+
+def main(argv: Optional[list[str]] = None) -> int:
+    """
+    Runs the benchmarks, writes their results, and compares them against a baseline.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    :return: The exit code: 1 if there are regressions, 0 otherwise.
+    :rtype: int
+    """
+    parser = argparse.ArgumentParser(description="End-to-end benchmarks of the degree planning algorithms.")
+    parser.add_argument('--algorithms', nargs='+', default=ALGORITHMS, choices=ALGORITHMS, metavar='ALGORITHM')
+    parser.add_argument('--files', nargs='+', default=None, metavar='FILE',
+                        help="catalogs of the input_files directory, or paths (default: all of input_files)")
+    parser.add_argument('--loads', nargs='+', type=str.upper, default=[load.name for load in DegreeLoad],
+                        choices=[load.name for load in DegreeLoad])
+    parser.add_argument('--runs', type=int, default=3, help="runs of every combination")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the first run")
+    parser.add_argument('--max-evaluations', type=int, default=None, help="budget of the local searches")
+    parser.add_argument('--max-seconds', type=float, default=None, help="budget of the local searches")
+    parser.add_argument('--timeout', type=float, default=300.0, help="seconds after which a run is killed")
+    parser.add_argument('--jobs', type=int, default=1, help="runs at once")
+    parser.add_argument('--output', default="benchmark_results.json", help="JSON file of the results")
+    parser.add_argument('--baseline', default=None, help="JSON results to compare against")
+    parser.add_argument('--save-baseline', default=None, help="also write the results as a baseline to this path")
+    parser.add_argument('--threshold', action='append', default=[], metavar='STATISTIC=VALUE',
+                        help=f"override a regression threshold, e.g. wall_seconds=0.1 (defaults: "
+                             f"{', '.join(f'{k}={v:g}' for k, v in DEFAULT_THRESHOLDS.items())})")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="results store to append the runs to")
+    parser.add_argument('--no-store', action='store_true', help="do not append the runs to the results store")
+    parser.add_argument('--plots', default=None, metavar='DIRECTORY',
+                        help="regenerate the dashboards of the results store in this directory")
+    args = parser.parse_args(argv)
+    thresholds = {}
+    for threshold in args.threshold:
+        name, _, value = threshold.partition('=')
+        if name not in DEFAULT_THRESHOLDS:
+            parser.error(f"unknown threshold statistic: {name}")
+        thresholds[name] = float(value)
+
+    files = args.files or sorted(name for name in os.listdir(INPUT_DIR) if name.endswith(".json"))
+    paths = [file if os.path.exists(file) else os.path.join(INPUT_DIR, file) for file in files]
+    budget = {name: value for name, value in (('max_evaluations', args.max_evaluations),
+                                              ('max_seconds', args.max_seconds)) if value is not None}
+    results = run_benchmarks(args.algorithms, paths, args.loads, args.runs, args.seed, budget, args.timeout,
+                             args.jobs)
+    summaries = summarize(results)
+    report = {'metadata': {'python': platform.python_version(), 'machine': platform.machine(),
+                           'processor': platform.processor(), 'cpus': os.cpu_count(), 'jobs': args.jobs,
+                           'budget': budget, 'created': time.time()},
+              'summaries': summaries, 'runs': results}
+    for path in filter(None, (args.output, args.save_baseline)):
+        with open(path, 'w') as file:
+            json.dump(report, file, indent=2)
+    if not args.no_store:
+        store = ResultsStore(args.store)
+        store.add_runs(results, run_metadata('end_to_end', {'runs': args.runs, 'seed': args.seed, 'jobs': args.jobs,
+                                                            'budget': budget, 'timeout': args.timeout}))
+        if args.plots:
+            from plots.dashboard import generate_dashboards
+            for path in generate_dashboards(store, args.plots):
+                print(f"Wrote {path}")
+
+    print(f"{'benchmark':<40} {'wall':>9} {'cpu':>9} {'rss MiB':>8} {'expanded':>10} {'success':>8} {'grade':>7}")
+    for key, summary in summaries.items():
+        rss = summary['peak_rss_kib'] / 1024 if summary['peak_rss_kib'] is not None else None
+        print(f"{key:<40} {_format(summary['wall_seconds'], '9.3f')} {_format(summary['cpu_seconds'], '9.3f')} "
+              f"{_format(rss, '8.1f')} {_format(summary['expanded'], '10.0f')} {summary['success_ratio']:8.2f} "
+              f"{_format(summary['avg_grade'], '7.2f')}")
+
+    if args.baseline:
+        with open(args.baseline) as file:
+            regressions = compare(summaries, json.load(file)['summaries'], thresholds)
+        for regression in regressions:
+            print(f"REGRESSION {regression}")
+        if regressions:
+            return 1
+        print("No regressions against the baseline")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,327 @@
+import argparse
+import gc
+import json
+import math
+import os
+import platform
+import random
+import statistics
+import time
+from typing import Any, Callable, Optional
+
+import numpy as np
+
+from benchmarks.results_store import DEFAULT_STORE_PATH, ResultsStore, run_metadata
+from dpp import DegreeLoad
+from graph_search.degree_plan import DegreePlan
+from graph_search.degree_planning_problem import DegreePlanningProblem, get_upper_bound_avg
+from input_loader import load_degree_plan
+from local_search.local_degree_plan import LocalDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from prerequisites import Prerequisites
+
+INPUT_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "input_files")
+
+
+# region Fixtures
+class Fixtures:
+    """
+    Realistic states of a catalog for the micro-benchmarks: graph search states from seeded random walks of the
+    search graph, from the start state to a goal or a dead end, and local search states from the initial states
+    of the local searches.
+    """
+
+    def __init__(self, input_file: str, load: str = 'MEDIUM', states_num: int = 50, seed: int = 0):
+        """
+        Builds the fixtures of a catalog.
+
+        :param input_file: The path of the catalog.
+        :type input_file: str
+        :param load: The DegreeLoad name.
+        :type load: str
+        :param states_num: Number of graph search states and of local search states.
+        :type states_num: int
+        :param seed: The random seed of the walks and the initial states.
+        :type seed: int
+        """
+        mandatory_points, target_points, degree_courses = load_degree_plan(input_file)
+        min_semester_points, max_semester_points = DegreeLoad[load].value
+        self.degree_courses = degree_courses
+        self.min_semester_points, self.max_semester_points = min_semester_points, max_semester_points
+        self.target_points = target_points
+        self.graph_problem = DegreePlanningProblem(degree_courses, mandatory_points, target_points,
+                                                   min_semester_points, max_semester_points)
+        self.local_problem = LocalDegreePlanningProblem(degree_courses, mandatory_points, target_points,
+                                                        min_semester_points, max_semester_points,
+                                                        initializer='mixed')
+        rng = random.Random(seed)
+        self.graph_states = self.__random_walks(rng, states_num)
+        random.seed(seed)
+        np.random.seed(seed)
+        self.local_states = [self.local_problem.get_initial_state() for _ in range(states_num)]
+
+    def __random_walks(self, rng: random.Random, states_num: int) -> list[DegreePlan]:
+        """
+        Collects the states of random walks of the search graph.
+
+        :param rng: The random generator.
+        :type rng: random.Random
+        :param states_num: Number of states to collect.
+        :type states_num: int
+        :return: The states.
+        :rtype: list[DegreePlan]
+        """
+        states = []
+        state = self.graph_problem.get_start_state()
+        while len(states) < states_num:
+            states.append(state)
+            successors = self.graph_problem.get_successors(state)
+            if not successors or self.graph_problem.is_goal_state(state):
+                state = self.graph_problem.get_start_state()
+            else:
+                state = rng.choice(successors)[0]
+        return states
+
+    def taken_numbers(self, state: DegreePlan) -> set[int]:
+        """
+        Returns the course numbers a graph search state took.
+
+        :param state: The state.
+        :type state: DegreePlan
+        :return: The course numbers.
+        :rtype: set[int]
+        """
+        return {c.number for c in self.degree_courses} - {c.number for c in state.get_optional_courses()}
+
+
+def _meets_prerequisites(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    Every prerequisite CNF of the catalog, checked against the courses of every graph search state.
+    """
+    prerequisites = [c.prerequisites for c in fixtures.degree_courses if c.prerequisites.cnf_course_numbers]
+    return (Prerequisites.meets_prerequisites,
+            [(p, fixtures.taken_numbers(state)) for state in fixtures.graph_states for p in prerequisites])
+
+
+def _get_legal_courses(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    The legal courses of every graph search state.
+    """
+    return (DegreePlan.get_legal_courses,
+            [(state, fixtures.min_semester_points, fixtures.max_semester_points) for state in fixtures.graph_states])
+
+
+def _add_course(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    Adds up to five legal courses to every graph search state.
+    """
+    arguments = []
+    for state in fixtures.graph_states:
+        for course in state.get_legal_courses(fixtures.min_semester_points, fixtures.max_semester_points)[:5]:
+            arguments.append((state, course, fixtures.min_semester_points, fixtures.max_semester_points))
+    return DegreePlan.add_course, arguments
+
+
+def _degree_plan_hash(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    Hashes every graph search state.
+    """
+    return DegreePlan.__hash__, [(state,) for state in fixtures.graph_states]
+
+
+def _get_upper_bound_avg(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    The heuristic bound of every graph search state.
+    """
+    return get_upper_bound_avg, [(state.get_optional_courses(), fixtures.target_points - state.total_points)
+                                 for state in fixtures.graph_states]
+
+
+def _possible_courses_to_remove(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    The removable courses of every local search state.
+    """
+    return LocalDegreePlan.possible_courses_to_remove, [(state,) for state in fixtures.local_states]
+
+
+def _get_neighbors(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    The full neighborhood of every local search state.
+    """
+    return fixtures.local_problem.get_neighbors, [(state,) for state in fixtures.local_states]
+
+
+def _local_degree_plan_hash(fixtures: Fixtures) -> tuple[Callable, list[tuple]]:
+    """
+    Hashes every local search state.
+    """
+    return LocalDegreePlan.__hash__, [(state,) for state in fixtures.local_states]
+
+
+# the benchmarked primitives: every builder returns the function and the arguments of its calls
+BENCHMARKS: dict[str, Callable[[Fixtures], tuple[Callable, list[tuple]]]] = {
+    'Prerequisites.meets_prerequisites': _meets_prerequisites,
+    'DegreePlan.get_legal_courses': _get_legal_courses,
+    'DegreePlan.add_course': _add_course,
+    'DegreePlan.__hash__': _degree_plan_hash,
+    'get_upper_bound_avg': _get_upper_bound_avg,
+    'LocalDegreePlan.possible_courses_to_remove': _possible_courses_to_remove,
+    'LocalDegreePlanningProblem.get_neighbors': _get_neighbors,
+    'LocalDegreePlan.__hash__': _local_degree_plan_hash,
+}
+
+
+# endregion
+
+# region Timing
+def _time_passes(function: Callable, arguments: list[tuple], passes: int) -> float:
+    """
+    Times calls of a function with every argument tuple, with the garbage collector disabled (as timeit does).
+
+    :param function: The function.
+    :type function: Callable
+    :param arguments: The arguments of the calls.
+    :type arguments: list[tuple]
+    :param passes: Number of passes over the arguments.
+    :type passes: int
+    :return: The duration of all the calls in seconds.
+    :rtype: float
+    """
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        start = time.perf_counter()
+        for _ in range(passes):
+            for args in arguments:
+                function(*args)
+        return time.perf_counter() - start
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def measure(function: Callable, arguments: list[tuple], repeat: int = 20, min_time: float = 0.05) -> dict[str, Any]:
+    """
+    Measures the duration of a call of a function.
+
+    After a warm-up pass, the number of passes over the arguments is calibrated so that a sample takes at least
+    min_time seconds, and repeat samples are taken. The statistics are of the duration per call: the minimum
+    (the least noisy estimate), the median with its interquartile range, and the mean with the half width of
+    its 95% confidence interval.
+
+    :param function: The function.
+    :type function: Callable
+    :param arguments: The arguments of the calls, which cycle through realistic inputs.
+    :type arguments: list[tuple]
+    :param repeat: Number of samples.
+    :type repeat: int
+    :param min_time: Minimum duration of a sample in seconds.
+    :type min_time: float
+    :return: The statistics, in nanoseconds per call, and the number of calls per sample.
+    :rtype: dict[str, Any]
+    """
+    _time_passes(function, arguments, 1)
+    passes = 1
+    while (duration := _time_passes(function, arguments, passes)) < min_time:
+        passes = max(passes * 2, math.ceil(passes * min_time / max(duration, 1e-9)))
+    calls = passes * len(arguments)
+    samples = [_time_passes(function, arguments, passes) / calls * 1e9 for _ in range(repeat)]
+    quartiles = statistics.quantiles(samples, n=4) if repeat > 1 else [samples[0]] * 3
+    return {
+        'calls_per_sample': calls,
+        'samples': repeat,
+        'min_ns': min(samples),
+        'median_ns': statistics.median(samples),
+        'iqr_ns': quartiles[2] - quartiles[0],
+        'mean_ns': statistics.mean(samples),
+        'ci95_ns': 1.96 * statistics.stdev(samples) / math.sqrt(repeat) if repeat > 1 else None,
+    }
+
+
+# endregion
+
+def run_micro_benchmarks(input_files: list[str], names: Optional[list[str]] = None, load: str = 'MEDIUM',
+                         states_num: int = 50, seed: int = 0, repeat: int = 20,
+                         min_time: float = 0.05) -> dict[str, dict[str, dict]]:
+    """
+    Runs the micro-benchmarks on the fixtures of every catalog.
+
+    :param input_files: The paths of the catalogs.
+    :type input_files: list[str]
+    :param names: The benchmarks to run (default: all of `BENCHMARKS`).
+    :type names: Optional[list[str]]
+    :param load: The DegreeLoad name of the fixtures.
+    :type load: str
+    :param states_num: Number of states of the fixtures (see `Fixtures`).
+    :type states_num: int
+    :param seed: The random seed of the fixtures.
+    :type seed: int
+    :param repeat: Number of samples of every benchmark.
+    :type repeat: int
+    :param min_time: Minimum duration of a sample in seconds.
+    :type min_time: float
+    :return: The statistics (see `measure`), by benchmark name and catalog file name.
+    :rtype: dict[str, dict[str, dict]]
+    """
+    results: dict[str, dict[str, dict]] = {name: {} for name in names or BENCHMARKS}
+    for input_file in input_files:
+        fixtures = Fixtures(input_file, load, states_num, seed)
+        for name in results:
+            function, arguments = BENCHMARKS[name](fixtures)
+            if arguments:
+                results[name][os.path.basename(input_file)] = measure(function, arguments, repeat, min_time)
+    return results
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Runs the micro-benchmarks, prints their statistics and writes them to a JSON file.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    """
+    parser = argparse.ArgumentParser(description="Micro-benchmarks of the hot primitives of the searches.")
+    parser.add_argument('--benchmarks', nargs='+', default=list(BENCHMARKS), choices=list(BENCHMARKS),
+                        metavar='NAME')
+    parser.add_argument('--files', nargs='+', default=None, metavar='FILE',
+                        help="catalogs of the input_files directory, or paths (default: all of input_files)")
+    parser.add_argument('--load', type=str.upper, default='MEDIUM', choices=[load.name for load in DegreeLoad])
+    parser.add_argument('--states', type=int, default=50, help="states of the fixtures of every catalog")
+    parser.add_argument('--seed', type=int, default=0, help="seed of the fixtures")
+    parser.add_argument('--repeat', type=int, default=20, help="samples of every benchmark")
+    parser.add_argument('--min-time', type=float, default=0.05, help="minimum seconds of a sample")
+    parser.add_argument('--output', default="micro_results.json", help="JSON file of the results")
+    parser.add_argument('--compare', default=None, help="JSON results to compare against")
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="results store to append the statistics to")
+    parser.add_argument('--no-store', action='store_true', help="do not append the statistics to the results store")
+    args = parser.parse_args(argv)
+
+    files = args.files or sorted(name for name in os.listdir(INPUT_DIR) if name.endswith(".json"))
+    paths = [file if os.path.exists(file) else os.path.join(INPUT_DIR, file) for file in files]
+    results = run_micro_benchmarks(paths, args.benchmarks, args.load, args.states, args.seed, args.repeat,
+                                   args.min_time)
+    with open(args.output, 'w') as file:
+        json.dump({'metadata': {'python': platform.python_version(), 'implementation': platform.python_implementation(),
+                                'machine': platform.machine(), 'load': args.load, 'states': args.states,
+                                'seed': args.seed, 'created': time.time()},
+                   'benchmarks': results}, file, indent=2)
+    if not args.no_store:
+        ResultsStore(args.store).add_micro(results, run_metadata('micro', {
+            'load': args.load, 'states': args.states, 'seed': args.seed, 'repeat': args.repeat,
+            'min_time': args.min_time}))
+
+    previous = {}
+    if args.compare:
+        with open(args.compare) as file:
+            previous = json.load(file)['benchmarks']
+    print(f"{'benchmark':<44} {'catalog':<18} {'min':>11} {'median':>11} {'IQR':>10} {'speedup':>8}")
+    for name, by_file in results.items():
+        for file_name, stats in by_file.items():
+            old = previous.get(name, {}).get(file_name)
+            speedup = f"{old['median_ns'] / stats['median_ns']:7.2f}x" if old else ""
+            print(f"{name:<44} {file_name:<18} {stats['min_ns'] / 1e3:9.2f}us {stats['median_ns'] / 1e3:9.2f}us "
+                  f"{stats['iqr_ns'] / 1e3:8.2f}us {speedup:>8}")
+
+
+if __name__ == '__main__':
+    main()
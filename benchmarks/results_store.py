@@ -0,0 +1,299 @@
+import contextlib
+import csv
+import json
+import os
+import platform
+import sqlite3
+import subprocess
+import time
+from typing import Any, Iterator, Optional
+
+REPOSITORY_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_STORE_PATH = os.path.join(REPOSITORY_DIR, "benchmarks", "results.sqlite")
+
+_RUN_COLUMNS = ('algorithm', 'file', 'load', 'seed', 'status', 'wall_seconds', 'cpu_seconds', 'peak_rss_kib',
+                'expanded', 'valid', 'avg_grade')
+_MICRO_COLUMNS = ('benchmark', 'file', 'calls_per_sample', 'samples', 'min_ns', 'median_ns', 'iqr_ns', 'mean_ns',
+                  'ci95_ns')
+_SESSION_COLUMNS = ('suite', 'created', 'git_commit', 'git_dirty', 'commit_time', 'hostname', 'machine',
+                    'processor', 'cpus', 'python', 'parameters')
+
+
+def _git(*args: str) -> Optional[str]:
+    """
+    Runs a git command in the repository.
+
+    :param args: The arguments of the command.
+    :type args: str
+    :return: The output of the command, or None if it failed (e.g. outside a git checkout).
+    :rtype: Optional[str]
+    """
+    try:
+        return subprocess.run(["git", *args], cwd=REPOSITORY_DIR, capture_output=True, text=True, check=True,
+                              timeout=30).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_metadata(suite: str, parameters: Optional[dict] = None) -> dict[str, Any]:
+    """
+    Describes a benchmark session: the code it measured, the machine it ran on, and its parameters.
+
+    :param suite: The benchmark suite, e.g. 'end_to_end' or 'micro'.
+    :type suite: str
+    :param parameters: The parameters of the session.
+    :type parameters: Optional[dict]
+    :return: The metadata of the session.
+    :rtype: dict[str, Any]
+    """
+    commit_time = _git("show", "-s", "--format=%ct", "HEAD")
+    status = _git("status", "--porcelain", "--untracked-files=no")
+    return {
+        'suite': suite,
+        'created': time.time(),
+        'git_commit': _git("rev-parse", "HEAD"),
+        'git_dirty': bool(status) if status is not None else None,
+        'commit_time': float(commit_time) if commit_time else None,
+        'hostname': platform.node(),
+        'machine': platform.machine(),
+        'processor': platform.processor(),
+        'cpus': os.cpu_count(),
+        'python': f"{platform.python_implementation()} {platform.python_version()}",
+        'parameters': parameters or {},
+    }
+
+
+class ResultsStore:
+    """
+    A local store of benchmark results in a SQLite database, which the plotting scripts read.
+
+    Every benchmark session is a row of the sessions table, with its metadata (see `run_metadata`), and its
+    measurements are rows of the runs table (end-to-end runs) or of the micro table (micro-benchmarks), so the
+    results of many commits and machines can be compared and plotted.
+    """
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        """
+        Opens the store, creating it if it does not exist.
+
+        :param path: The path of the SQLite database.
+        :type path: str
+        """
+        self.__path = path
+        with self.__connect() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS sessions (
+                                      id INTEGER PRIMARY KEY AUTOINCREMENT,
+                                      suite TEXT NOT NULL,
+                                      created REAL NOT NULL,
+                                      git_commit TEXT,
+                                      git_dirty INTEGER,
+                                      commit_time REAL,
+                                      hostname TEXT,
+                                      machine TEXT,
+                                      processor TEXT,
+                                      cpus INTEGER,
+                                      python TEXT,
+                                      parameters TEXT NOT NULL)""")
+            connection.execute("""CREATE TABLE IF NOT EXISTS runs (
+                                      session_id INTEGER NOT NULL REFERENCES sessions (id),
+                                      algorithm TEXT NOT NULL,
+                                      file TEXT NOT NULL,
+                                      load TEXT NOT NULL,
+                                      seed INTEGER,
+                                      status TEXT NOT NULL,
+                                      wall_seconds REAL,
+                                      cpu_seconds REAL,
+                                      peak_rss_kib INTEGER,
+                                      expanded INTEGER,
+                                      valid INTEGER,
+                                      avg_grade REAL)""")
+            connection.execute("""CREATE TABLE IF NOT EXISTS micro (
+                                      session_id INTEGER NOT NULL REFERENCES sessions (id),
+                                      benchmark TEXT NOT NULL,
+                                      file TEXT NOT NULL,
+                                      calls_per_sample INTEGER,
+                                      samples INTEGER,
+                                      min_ns REAL,
+                                      median_ns REAL,
+                                      iqr_ns REAL,
+                                      mean_ns REAL,
+                                      ci95_ns REAL)""")
+            connection.execute("CREATE INDEX IF NOT EXISTS runs_session ON runs (session_id)")
+            connection.execute("CREATE INDEX IF NOT EXISTS micro_session ON micro (session_id)")
+
+    def add_runs(self, results: list[dict], metadata: dict[str, Any]) -> int:
+        """
+        Appends the runs of an end-to-end benchmark session (see `end_to_end.run_benchmarks`).
+
+        :param results: The measurements of the runs.
+        :type results: list[dict]
+        :param metadata: The metadata of the session (see `run_metadata`).
+        :type metadata: dict[str, Any]
+        :return: The id of the session.
+        :rtype: int
+        """
+        with self.__connect() as connection:
+            session = self.__add_session(connection, metadata)
+            connection.executemany(
+                f"INSERT INTO runs VALUES (?, {', '.join('?' * len(_RUN_COLUMNS))})",
+                [(session, *(result.get(column) for column in _RUN_COLUMNS)) for result in results])
+        return session
+
+    def add_micro(self, results: dict[str, dict[str, dict]], metadata: dict[str, Any]) -> int:
+        """
+        Appends the statistics of a micro-benchmark session (see `micro.run_micro_benchmarks`).
+
+        :param results: The statistics, by benchmark name and catalog file name.
+        :type results: dict[str, dict[str, dict]]
+        :param metadata: The metadata of the session (see `run_metadata`).
+        :type metadata: dict[str, Any]
+        :return: The id of the session.
+        :rtype: int
+        """
+        rows = [(name, file_name, *(stats.get(column) for column in _MICRO_COLUMNS[2:]))
+                for name, by_file in results.items() for file_name, stats in by_file.items()]
+        with self.__connect() as connection:
+            session = self.__add_session(connection, metadata)
+            connection.executemany(f"INSERT INTO micro VALUES (?, {', '.join('?' * len(_MICRO_COLUMNS))})",
+                                   [(session, *row) for row in rows])
+        return session
+
+    def runs(self, hostname: Optional[str] = None, **filters: Any) -> list[dict[str, Any]]:
+        """
+        Returns the stored end-to-end runs with the metadata of their sessions, oldest first.
+
+        :param hostname: Only return the runs of this machine (default: of all machines).
+        :type hostname: Optional[str]
+        :param filters: Only return the runs with these values, e.g. algorithm='astar' or file='cs.json'.
+        :return: The runs, as dictionaries of the run and session columns.
+        :rtype: list[dict[str, Any]]
+        """
+        return self.__select('runs', _RUN_COLUMNS, hostname, filters)
+
+    def micro(self, hostname: Optional[str] = None, **filters: Any) -> list[dict[str, Any]]:
+        """
+        Returns the stored micro-benchmark statistics with the metadata of their sessions, oldest first.
+
+        :param hostname: Only return the statistics of this machine (default: of all machines).
+        :type hostname: Optional[str]
+        :param filters: Only return the statistics with these values, e.g. benchmark='DegreePlan.__hash__'.
+        :return: The statistics, as dictionaries of the statistics and session columns.
+        :rtype: list[dict[str, Any]]
+        """
+        return self.__select('micro', _MICRO_COLUMNS, hostname, filters)
+
+    def latest_runs(self, hostname: Optional[str] = None) -> list[dict[str, Any]]:
+        """
+        Returns, for every combination of algorithm, file and load, the runs of the latest session that ran it, so
+        the current results of every combination can be plotted even if the sessions ran different subsets.
+
+        :param hostname: Only consider the runs of this machine (default: of all machines).
+        :type hostname: Optional[str]
+        :return: The runs, as dictionaries of the run and session columns.
+        :rtype: list[dict[str, Any]]
+        """
+        runs = self.runs(hostname)
+        latest: dict[tuple, int] = {}
+        for run in runs:
+            latest[run['algorithm'], run['file'], run['load']] = run['session_id']
+        return [run for run in runs if latest[run['algorithm'], run['file'], run['load']] == run['session_id']]
+
+    def export_csv(self, path: str, table: str = 'runs'):
+        """
+        Writes a table, joined with the metadata of its sessions, to a CSV file (e.g. for a spreadsheet).
+
+        :param path: The path of the CSV file.
+        :type path: str
+        :param table: 'runs' or 'micro'.
+        :type table: str
+        """
+        rows = self.runs() if table == 'runs' else self.micro()
+        columns = ['session_id', *(_RUN_COLUMNS if table == 'runs' else _MICRO_COLUMNS), *_SESSION_COLUMNS]
+        with open(path, 'w', newline='') as file:
+            writer = csv.DictWriter(file, columns)
+            writer.writeheader()
+            writer.writerows(rows)
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the path of the store's database.
+
+        :return: The path of the SQLite database.
+        :rtype: str
+        """
+        return self.__path
+
+    @staticmethod
+    def __add_session(connection: sqlite3.Connection, metadata: dict[str, Any]) -> int:
+        """
+        Inserts a session.
+
+        :param connection: An open connection to the database.
+        :type connection: sqlite3.Connection
+        :param metadata: The metadata of the session (see `run_metadata`).
+        :type metadata: dict[str, Any]
+        :return: The id of the session.
+        :rtype: int
+        """
+        values = [json.dumps(metadata.get(column) or {}) if column == 'parameters' else metadata.get(column)
+                  for column in _SESSION_COLUMNS]
+        cursor = connection.execute(f"INSERT INTO sessions ({', '.join(_SESSION_COLUMNS)}) "
+                                    f"VALUES ({', '.join('?' * len(_SESSION_COLUMNS))})", values)
+        return cursor.lastrowid
+
+    def __select(self, table: str, columns: tuple[str, ...], hostname: Optional[str],
+                 filters: dict[str, Any]) -> list[dict[str, Any]]:
+        """
+        Selects the rows of a table joined with the metadata of their sessions.
+
+        :param table: The table name.
+        :type table: str
+        :param columns: The columns of the table.
+        :type columns: tuple[str, ...]
+        :param hostname: Only select the rows of this machine (default: of all machines).
+        :type hostname: Optional[str]
+        :param filters: Only select the rows with these values of the table's columns.
+        :type filters: dict[str, Any]
+        :return: The rows, by the order of their sessions.
+        :rtype: list[dict[str, Any]]
+        """
+        unknown = set(filters) - set(columns)
+        if unknown:
+            raise ValueError(f"Unknown columns: {', '.join(sorted(unknown))}")
+        conditions = [f"t.{column} = ?" for column in filters]
+        values = list(filters.values())
+        if hostname is not None:
+            conditions.append("s.hostname = ?")
+            values.append(hostname)
+        names = ['session_id', *columns, *_SESSION_COLUMNS]
+        query = (f"SELECT t.session_id, {', '.join('t.' + c for c in columns)}, "
+                 f"{', '.join('s.' + c for c in _SESSION_COLUMNS)} FROM {table} t JOIN sessions s "
+                 f"ON t.session_id = s.id {'WHERE ' + ' AND '.join(conditions) if conditions else ''} "
+                 f"ORDER BY s.id, t.rowid")
+        with self.__connect() as connection:
+            rows = [dict(zip(names, row)) for row in connection.execute(query, values)]
+        for row in rows:
+            row['parameters'] = json.loads(row['parameters'])
+            for column in ('valid', 'git_dirty'):
+                if row.get(column) is not None:
+                    row[column] = bool(row[column])
+        return rows
+
+    @contextlib.contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a connection to the database, which commits and closes when the context exits.
+
+        :return: A context manager of the connection.
+        :rtype: Iterator[sqlite3.Connection]
+        """
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.__path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
@@ -0,0 +1,61 @@
+import contextlib
+from typing import Iterator, Optional
+
+# the cancellation flags shared by the worker processes of a planner, and the flag of the running search
+_flags = None
+_slot: Optional[int] = None
+
+
+class SearchCancelled(Exception):
+    """
+    Raised by a search that was cancelled before it found a solution.
+    """
+
+
+def init_worker(flags):
+    """
+    Initializes a worker process with the shared cancellation flags of its pool.
+
+    :param flags: A shared array (multiprocessing.RawArray) with a flag for every search that may run at once.
+    """
+    global _flags
+    _flags = flags
+
+
+@contextlib.contextmanager
+def cancellation_scope(slot: int) -> Iterator[None]:
+    """
+    Makes the searches of the current process check a flag of the shared array while the context is active.
+
+    :param slot: The index of the flag.
+    :type slot: int
+    :return: A context manager.
+    :rtype: Iterator[None]
+    """
+    global _slot
+    _slot = slot
+    try:
+        yield
+    finally:
+        _slot = None
+
+
+def is_cancelled() -> bool:
+    """
+    Checks whether the running search was cancelled. This is a single read of shared memory, so the searches
+    can call it on every expansion.
+
+    :return: True if the search was cancelled, False otherwise (or if it runs outside a cancellation scope).
+    :rtype: bool
+    """
+    return _slot is not None and _flags[_slot] != 0
+
+
+def check_cancelled():
+    """
+    Stops the running search if it was cancelled.
+
+    :raises SearchCancelled: If the search was cancelled.
+    """
+    if _slot is not None and _flags[_slot] != 0:
+        raise SearchCancelled()
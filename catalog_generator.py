@@ -0,0 +1,201 @@
+import argparse
+import bisect
+import json
+import math
+import random
+from typing import Optional
+
+# the distribution of course points in the bundled catalogs
+DEFAULT_POINTS_WEIGHTS = {1: 2, 2: 41, 3: 54, 4: 73, 5: 44, 6: 44, 7: 35}
+
+
+def generate_catalog(courses: int = 50, depth: int = 4, fan_in: int = 2, clause_width: int = 3,
+                     mandatory_ratio: float = 0.5, points_weights: Optional[dict[int, float]] = None,
+                     both_offerings_ratio: float = 0.3, elective_ratio: float = 0.5,
+                     target_points: Optional[int] = None, departments: int = 1, seed: Optional[int] = None) -> dict:
+    """
+    Generates a synthetic degree catalog in the JSON schema of `input_loader.load_json_degree_plan`.
+
+    The courses are spread over depth levels of a prerequisite DAG. A course of level L > 0 has 1 to fan_in
+    prerequisite clauses (a CNF: every clause needs one of its courses), each of 1 to clause_width courses of
+    lower levels, and its first clause always has a course of level L - 1, so the longest prerequisite chains
+    have depth courses. The clauses of mandatory courses always include a mandatory course (a mandatory course
+    without mandatory courses in the lower levels has no prerequisites), so the mandatory courses can be
+    completed on their own, and the mandatory courses that are offered once are offered in the
+    semester type of their level's parity, so they can be taken level by level in consecutive semesters.
+
+    By default the target points are the mandatory points plus the points of a set of electives whose
+    prerequisites are met by the mandatory courses and the set itself, so the degree can be completed with
+    exactly the target points (whether it fits a semester load also depends on depth). The same seed always
+    generates the same catalog.
+
+    :param courses: Number of courses (each with one or two offerings).
+    :type courses: int
+    :param depth: Number of levels of the prerequisite DAG.
+    :type depth: int
+    :param fan_in: Maximum number of prerequisite clauses of a course.
+    :type fan_in: int
+    :param clause_width: Maximum number of courses in a prerequisite clause.
+    :type clause_width: int
+    :param mandatory_ratio: The fraction of mandatory courses.
+    :type mandatory_ratio: float
+    :param points_weights: The relative frequency of every number of course points (default: as in the bundled
+        catalogs).
+    :type points_weights: Optional[dict[int, float]]
+    :param both_offerings_ratio: The fraction of courses offered in both semester types (A and B).
+    :type both_offerings_ratio: float
+    :param elective_ratio: The elective points of the default target, as a fraction of the mandatory points.
+    :type elective_ratio: float
+    :param target_points: The target points of the degree (default: chosen as described above).
+    :type target_points: Optional[int]
+    :param departments: Number of departments, i.e. distinct two-digit prefixes of the course numbers. More are
+        used if needed, since a department has at most 1000 courses.
+    :type departments: int
+    :param seed: The random seed.
+    :type seed: Optional[int]
+    :return: The catalog, as a JSON serializable dictionary.
+    :rtype: dict
+    :raises ValueError: If a parameter is out of range.
+    """
+    if courses < 1 or depth < 1 or fan_in < 1 or clause_width < 1 or departments < 1:
+        raise ValueError("courses, depth, fan_in, clause_width and departments must be positive")
+    if not 0 <= mandatory_ratio <= 1 or not 0 <= both_offerings_ratio <= 1 or elective_ratio < 0:
+        raise ValueError("mandatory_ratio and both_offerings_ratio must be in [0, 1], elective_ratio non-negative")
+    departments = max(departments, math.ceil(courses / 1000))
+    if departments > 90:
+        raise ValueError(f"Too many courses: {courses}")
+    rng = random.Random(seed)
+    points_weights = points_weights or DEFAULT_POINTS_WEIGHTS
+
+    numbers = [(10 + i % departments) * 1000 + i // departments for i in range(courses)]
+    levels = [i * depth // courses for i in range(courses)]
+    is_mandatory = [rng.random() < mandatory_ratio for _ in range(courses)]
+    points = rng.choices(list(points_weights), weights=list(points_weights.values()), k=courses)
+
+    # the courses of a level are consecutive, so the courses of the lower levels are a prefix of the courses
+    level_starts = [bisect.bisect_left(levels, level) for level in range(depth + 1)]
+    mandatory_indices = [i for i in range(courses) if is_mandatory[i]]
+    prerequisites: list[Optional[list[list[int]]]] = []
+    for i in range(courses):
+        lower = level_starts[levels[i]]
+        # the mandatory courses of the lower levels
+        mandatory_lower = mandatory_indices[:bisect.bisect_left(mandatory_indices, lower)]
+        if lower == 0 or is_mandatory[i] and not mandatory_lower:
+            prerequisites.append(None)
+            continue
+        previous = level_starts[levels[i] - 1]
+        mandatory_previous = mandatory_lower[bisect.bisect_left(mandatory_lower, previous):]
+        clauses = []
+        for c in range(rng.randint(1, fan_in)):
+            width = rng.randint(1, min(clause_width, lower))
+            if is_mandatory[i]:
+                clause = {rng.choice(mandatory_previous if c == 0 and mandatory_previous else mandatory_lower)}
+            else:
+                clause = {rng.randrange(previous if c == 0 and previous < lower else 0, lower)}
+            while len(clause) < width:
+                clause.add(rng.randrange(lower))
+            clauses.append(sorted(numbers[j] for j in clause))
+        prerequisites.append(sorted(clauses))
+
+    degree_courses = []
+    for i in range(courses):
+        if rng.random() < both_offerings_ratio:
+            semester_types = ["A", "B"]
+        elif is_mandatory[i]:
+            semester_types = ["AB"[levels[i] % 2]]
+        else:
+            semester_types = [rng.choice("AB")]
+        grade = min(100, max(50, round(rng.gauss(80, 7))))
+        for semester_type in semester_types:
+            degree_courses.append({
+                'course_number': numbers[i],
+                'semester_type': semester_type,
+                'name': f"Synthetic Course {numbers[i]}",
+                'points': points[i],
+                'avg_grade': min(100, max(50, grade + rng.randint(-3, 3))),
+                'is_mandatory': is_mandatory[i],
+                'prerequisites': prerequisites[i],
+            })
+
+    if target_points is None:
+        target_points = sum(p for p, mandatory in zip(points, is_mandatory) if mandatory)
+        target_points += _elective_points(rng, numbers, points, is_mandatory, prerequisites,
+                                          round(elective_ratio * target_points))
+    degree_courses.sort(key=lambda course: (course['course_number'], course['semester_type']))
+    return {'target_points': target_points, 'degree_courses': degree_courses}
+
+
+def _elective_points(rng: random.Random, numbers: list[int], points: list[int], is_mandatory: list[bool],
+                     prerequisites: list[Optional[list[list[int]]]], goal: int) -> int:
+    """
+    Picks electives in a random order, level by level, whose prerequisites are met by the mandatory courses and
+    the electives picked before them, until their points reach the goal or no other elective fits.
+
+    :param rng: The random generator.
+    :type rng: random.Random
+    :param numbers: The course numbers.
+    :type numbers: list[int]
+    :param points: The points of every course.
+    :type points: list[int]
+    :param is_mandatory: Whether every course is mandatory.
+    :type is_mandatory: list[bool]
+    :param prerequisites: The prerequisite clauses of every course.
+    :type prerequisites: list[Optional[list[list[int]]]]
+    :param goal: The elective points to reach.
+    :type goal: int
+    :return: The points of the picked electives, at most goal.
+    :rtype: int
+    """
+    taken = {number for number, mandatory in zip(numbers, is_mandatory) if mandatory}
+    electives = [i for i in range(len(numbers)) if not is_mandatory[i]]
+    rng.shuffle(electives)
+    total = 0
+    changed = True
+    while changed and total < goal:
+        changed = False
+        for i in electives:
+            if (numbers[i] not in taken and total + points[i] <= goal and
+                    all(taken.intersection(clause) for clause in prerequisites[i] or ())):
+                taken.add(numbers[i])
+                total += points[i]
+                changed = True
+    return total
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Writes a synthetic catalog to a JSON file.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    """
+    parser = argparse.ArgumentParser(description="Generates a synthetic degree catalog.")
+    parser.add_argument('output', help="path of the JSON catalog to write")
+    parser.add_argument('--courses', type=int, default=50, help="number of courses")
+    parser.add_argument('--depth', type=int, default=4, help="levels of the prerequisite DAG")
+    parser.add_argument('--fan-in', type=int, default=2, help="maximum prerequisite clauses of a course")
+    parser.add_argument('--clause-width', type=int, default=3, help="maximum courses in a prerequisite clause")
+    parser.add_argument('--mandatory-ratio', type=float, default=0.5, help="fraction of mandatory courses")
+    parser.add_argument('--points', type=json.loads, default=None, metavar='JSON',
+                        help='relative frequency of every number of points, e.g. \'{"2": 1, "4": 2}\'')
+    parser.add_argument('--both-offerings-ratio', type=float, default=0.3,
+                        help="fraction of courses offered in both semester types")
+    parser.add_argument('--elective-ratio', type=float, default=0.5,
+                        help="elective points of the default target, as a fraction of the mandatory points")
+    parser.add_argument('--target-points', type=int, default=None, help="target points of the degree")
+    parser.add_argument('--departments', type=int, default=1, help="number of departments")
+    parser.add_argument('--seed', type=int, default=None, help="random seed")
+    args = parser.parse_args(argv)
+
+    catalog = generate_catalog(args.courses, args.depth, args.fan_in, args.clause_width, args.mandatory_ratio,
+                               {int(p): w for p, w in args.points.items()} if args.points else None,
+                               args.both_offerings_ratio, args.elective_ratio, args.target_points,
+                               args.departments, args.seed)
+    with open(args.output, 'w') as file:
+        json.dump(catalog, file, indent=2)
+    print(f"Wrote {len(catalog['degree_courses'])} offerings, target points {catalog['target_points']}, "
+          f"to {args.output}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,275 @@
+import hashlib
+import json
+import mmap
+import os
+import struct
+
+import numpy as np
+
+from course import Course
+from prerequisites import Prerequisites
+
+MAGIC = b"DPCATLOG"
+FORMAT_VERSION = 1
+_ALIGNMENT = 64
+_PREAMBLE = struct.Struct("<8sII")  # magic, format version, header length
+
+
+class CompiledCatalog:
+    """
+    A degree catalog loaded from a compiled binary file (see `write_compiled_catalog`).
+
+    The course attributes are NumPy arrays with a row for every course offering, in the order of the source
+    catalog, that are views into a memory map of the file. The prerequisites are kept in two level CSR form:
+    the clauses of offering i are clause_starts[i]:clause_starts[i + 1], and clause j is satisfied by any of the
+    course numbers prerequisite_courses[literal_starts[j]:literal_starts[j + 1]]. The names are kept in a string
+    table: the UTF-8 bytes name_bytes[name_starts[i]:name_starts[i + 1]].
+    """
+
+    def __init__(self, header: dict, arrays: dict[str, np.ndarray]):
+        """
+        Initializes the catalog from the header and the arrays of a compiled file.
+
+        :param header: The header of the file.
+        :type header: dict
+        :param arrays: The arrays of the file, by name.
+        :type arrays: dict[str, np.ndarray]
+        """
+        self.__mandatory_points: int = header['mandatory_points']
+        self.__target_points: int = header['target_points']
+        self.__content_hash: str = header['content_hash']
+        self.__arrays = arrays
+
+    @property
+    def mandatory_points(self) -> int:
+        """
+        Returns the total mandatory points required for the degree.
+
+        :return: The mandatory points.
+        :rtype: int
+        """
+        return self.__mandatory_points
+
+    @property
+    def target_points(self) -> int:
+        """
+        Returns the total points required to complete the degree.
+
+        :return: The target points.
+        :rtype: int
+        """
+        return self.__target_points
+
+    @property
+    def content_hash(self) -> str:
+        """
+        Returns the SHA-256 hash of the catalog's contents, which does not depend on the formatting of the
+        source file.
+
+        :return: The hexadecimal hash.
+        :rtype: str
+        """
+        return self.__content_hash
+
+    @property
+    def arrays(self) -> dict[str, np.ndarray]:
+        """
+        Returns the read-only arrays of the catalog, by name.
+
+        :return: The arrays of the catalog.
+        :rtype: dict[str, np.ndarray]
+        """
+        return self.__arrays.copy()
+
+    def courses(self) -> list[Course]:
+        """
+        Builds the Course objects of the catalog's offerings, as `input_loader.load_degree_plan` returns them.
+
+        :return: The list of courses.
+        :rtype: list[Course]
+        """
+        a = {name: array.tolist() for name, array in self.__arrays.items()}
+        names = bytes(self.__arrays['name_bytes'])
+        clauses = [frozenset(a['prerequisite_courses'][start:end])
+                   for start, end in zip(a['literal_starts'], a['literal_starts'][1:])]
+        return [
+            Course(
+                course_number=number,
+                semester_type="B" if semester_parity else "A",
+                name=names[a['name_starts'][i]:a['name_starts'][i + 1]].decode('utf-8'),
+                points=points,
+                avg_grade=int(avg_grade) if integral_grade else avg_grade,
+                is_mandatory=is_mandatory,
+                prerequisites=Prerequisites(set(clauses[a['clause_starts'][i]:a['clause_starts'][i + 1]]))
+                if has_prerequisites else None
+            )
+            for i, (number, semester_parity, points, avg_grade, integral_grade, is_mandatory, has_prerequisites)
+            in enumerate(zip(a['course_numbers'], a['semester_parities'], a['points'], a['avg_grades'],
+                             a['integral_grades'], a['is_mandatory'], a['has_prerequisites']))
+        ]
+
+    def __len__(self) -> int:
+        """
+        Returns the number of course offerings in the catalog.
+
+        :return: The number of offerings.
+        :rtype: int
+        """
+        return len(self.__arrays['course_numbers'])
+
+
+def catalog_arrays(degree_courses: list[Course]) -> dict[str, np.ndarray]:
+    """
+    Encodes the courses of a catalog as the arrays of a compiled catalog (see CompiledCatalog).
+
+    :param degree_courses: List of available courses (offerings) for the degree.
+    :type degree_courses: list[Course]
+    :return: The arrays, by name.
+    :rtype: dict[str, np.ndarray]
+    """
+    names = [course.name.encode('utf-8') for course in degree_courses]
+    clause_starts, literal_starts, prerequisite_courses = [0], [0], []
+    for course in degree_courses:
+        # sort the clauses so that the encoding, and the content hash, do not depend on set ordering
+        for clause in sorted(sorted(clause) for clause in course.prerequisites.cnf_course_numbers or ()):
+            prerequisite_courses.extend(clause)
+            literal_starts.append(len(prerequisite_courses))
+        clause_starts.append(len(literal_starts) - 1)
+    return {
+        'course_numbers': np.array([c.number for c in degree_courses], dtype=np.int64),
+        'semester_parities': np.array([c.semester_type == "B" for c in degree_courses], dtype=np.uint8),
+        'points': np.array([c.points for c in degree_courses], dtype=np.int64),
+        'avg_grades': np.array([c.avg_grade for c in degree_courses], dtype=np.float64),
+        'integral_grades': np.array([isinstance(c.avg_grade, int) for c in degree_courses], dtype=bool),
+        'is_mandatory': np.array([c.is_mandatory for c in degree_courses], dtype=bool),
+        'has_prerequisites': np.array([c.prerequisites.cnf_course_numbers is not None for c in degree_courses],
+                                      dtype=bool),
+        'clause_starts': np.array(clause_starts, dtype=np.int64),
+        'literal_starts': np.array(literal_starts, dtype=np.int64),
+        'prerequisite_courses': np.array(prerequisite_courses, dtype=np.int64),
+        'name_starts': np.cumsum([0] + [len(name) for name in names], dtype=np.int64),
+        'name_bytes': np.frombuffer(b"".join(names), dtype=np.uint8),
+    }
+
+
+def content_hash(mandatory_points: int, target_points: int, arrays: dict[str, np.ndarray]) -> str:
+    """
+    Computes the content hash of a catalog from its points requirements and its arrays (see `catalog_arrays`).
+
+    :param mandatory_points: Total mandatory points required for the degree.
+    :type mandatory_points: int
+    :param target_points: Total points required to complete the degree.
+    :type target_points: int
+    :param arrays: The arrays of the catalog, by name.
+    :type arrays: dict[str, np.ndarray]
+    :return: The hexadecimal SHA-256 hash.
+    :rtype: str
+    """
+    digest = hashlib.sha256(f"{FORMAT_VERSION}:{mandatory_points}:{target_points}".encode())
+    for name in sorted(arrays):
+        digest.update(f"{name}:{arrays[name].dtype.str}:{arrays[name].shape}".encode())
+        digest.update(np.ascontiguousarray(arrays[name]).tobytes())
+    return digest.hexdigest()
+
+
+def write_compiled_catalog(path: str, mandatory_points: int, target_points: int,
+                           degree_courses: list[Course]) -> str:
+    """
+    Writes a catalog to a compiled binary file.
+
+    The file starts with the magic bytes, the format version and the length of a JSON header, which holds the
+    points requirements, the content hash and the dtype, shape and offset of every array. The raw arrays follow,
+    each aligned to 64 bytes, so that they can be memory-mapped without copying. The file is written to a
+    temporary file that then replaces it, so that processes that memory-mapped the previous file keep reading it
+    intact, and no process ever reads a partly written file.
+
+    :param path: The path of the compiled file.
+    :type path: str
+    :param mandatory_points: Total mandatory points required for the degree.
+    :type mandatory_points: int
+    :param target_points: Total points required to complete the degree.
+    :type target_points: int
+    :param degree_courses: List of available courses (offerings) for the degree.
+    :type degree_courses: list[Course]
+    :return: The content hash of the catalog.
+    :rtype: str
+    """
+    arrays = catalog_arrays(degree_courses)
+    header = {'version': FORMAT_VERSION, 'mandatory_points': mandatory_points, 'target_points': target_points,
+              'content_hash': content_hash(mandatory_points, target_points, arrays), 'arrays': {}}
+    offset = 0
+    for name, array in arrays.items():
+        header['arrays'][name] = {'dtype': array.dtype.str, 'shape': list(array.shape), 'offset': offset}
+        offset += -(-array.nbytes // _ALIGNMENT) * _ALIGNMENT
+    header_bytes = json.dumps(header).encode('utf-8')
+    data_start = -(-(_PREAMBLE.size + len(header_bytes)) // _ALIGNMENT) * _ALIGNMENT
+
+    temporary_path = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(temporary_path, 'wb') as file:
+            file.write(_PREAMBLE.pack(MAGIC, FORMAT_VERSION, len(header_bytes)))
+            file.write(header_bytes)
+            for name, array in arrays.items():
+                file.seek(data_start + header['arrays'][name]['offset'])
+                file.write(np.ascontiguousarray(array).tobytes())
+            file.truncate(data_start + offset)
+        os.replace(temporary_path, path)
+    except BaseException:
+        if os.path.exists(temporary_path):
+            os.remove(temporary_path)
+        raise
+    return header['content_hash']
+
+
+def load_compiled_catalog(path: str, verify: bool = False) -> CompiledCatalog:
+    """
+    Loads a compiled catalog file by memory-mapping it: the arrays of the catalog are read-only views into the
+    file's pages, and are only read from the disk when they are used.
+
+    :param path: The path of the compiled file.
+    :type path: str
+    :param verify: Whether to check the arrays against the content hash of the header, which reads all of them.
+    :type verify: bool
+    :return: The compiled catalog.
+    :rtype: CompiledCatalog
+    :raises ValueError: If the file is not a compiled catalog, was compiled with another format version, or is
+        corrupt.
+    """
+    with open(path, 'rb') as file:
+        buffer = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+    if len(buffer) < _PREAMBLE.size:
+        raise ValueError(f"Not a compiled catalog: {path}")
+    magic, version, header_length = _PREAMBLE.unpack_from(buffer)
+    if magic != MAGIC:
+        raise ValueError(f"Not a compiled catalog: {path}")
+    if version != FORMAT_VERSION:
+        raise ValueError(f"Unsupported compiled catalog version {version}: {path}")
+    try:
+        header = json.loads(buffer[_PREAMBLE.size:_PREAMBLE.size + header_length].decode('utf-8'))
+        data_start = -(-(_PREAMBLE.size + header_length) // _ALIGNMENT) * _ALIGNMENT
+        arrays = {}
+        for name, spec in header['arrays'].items():
+            count = int(np.prod(spec['shape'], dtype=np.int64))
+            arrays[name] = np.frombuffer(buffer, dtype=spec['dtype'], count=count,
+                                         offset=data_start + spec['offset']).reshape(spec['shape'])
+        catalog = CompiledCatalog(header, arrays)
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Corrupt compiled catalog: {path}") from e
+    if verify and content_hash(catalog.mandatory_points, catalog.target_points, arrays) != catalog.content_hash:
+        raise ValueError(f"Corrupt compiled catalog: {path}")
+    return catalog
+
+
+def compiled_path(json_file: str, suffix: str = ".dpc") -> str:
+    """
+    Returns the path of the compiled file of a JSON catalog: the same path with the extension replaced.
+
+    :param json_file: The path of the JSON catalog.
+    :type json_file: str
+    :param suffix: The extension of compiled files.
+    :type suffix: str
+    :return: The path of the compiled file.
+    :rtype: str
+    """
+    stem = json_file[:-len(".json")] if json_file.endswith(".json") else json_file
+    return stem + suffix
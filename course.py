@@ -141,7 +141,10 @@ class Course:
         """
         Returns a hash value for the course based on its number and semester type.
 
+        The hash only combines integers, so unlike the hash of a string it does not depend on PYTHONHASHSEED:
+        sets of courses iterate in the same order in every process, which keeps seeded searches reproducible.
+
         :return: The hash value.
         :rtype: int
         """
-        return hash((self.number, self.semester_type))
+        return hash((self.number, self.semester_type == "B"))
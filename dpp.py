@@ -1,14 +1,28 @@
+import argparse
+import contextlib
+import io
+import random
 import sys
+from concurrent.futures import ProcessPoolExecutor
 from enum import Enum
 from typing import Optional, Union
+
+import numpy as np
+
 from course import Course
 from graph_search.degree_planning_problem import DegreePlanningProblem, max_avg_heuristic
 from graph_search.search import dfs, ucs, astar
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.batched_annealing import bsa
+from local_search.genetic_algorithm import genetic
 from local_search.local_degree_plan import LocalDegreePlan, Semester
+from local_search.plan_repair import repair_plan
+from local_search.tabu_search import tabu
 from html_generator import generate_html
 from input_loader import load_degree_plan
 from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
 from local_search.local_search_ import *
+from solution_cache import SolutionCache, catalog_hash, decode_solution, encode_solution
 import time
 
 
@@ -22,19 +36,58 @@ class DegreeLoad(Enum):
     HIGH = 20, 30
 
 
-def show_results(solution: Union[LocalDegreePlan, Optional[list[Course]]], expanded: int) -> None:
+GRAPH_SEARCH_ALGORITHMS = ["dfs", "bfs", "ucs", "astar"]
+LOCAL_SEARCH_ALGORITHMS = ["hill", "fhill", "rhill", "sa", "asa", "beam", "pbeam", "bsa", "pt", "genetic", "tabu"]
+# local searches whose results depend on the timing of their worker processes even with a seed
+TIMING_DEPENDENT_ALGORITHMS = ["rhill"]
+
+# the initial states each local search starts from by default (see `LocalDegreePlanningProblem.INITIALIZERS`):
+# single trajectory searches start from greedy plans, multi-start searches mix greedy and random plans to keep
+# their diversity, and tabu search finds better plans from random plans
+DEFAULT_INITIALIZERS = {
+    'hill': 'greedy',
+    'fhill': 'greedy',
+    'sa': 'greedy',
+    'asa': 'greedy',
+    'rhill': 'mixed',
+    'beam': 'mixed',
+    'pbeam': 'mixed',
+    'bsa': 'mixed',
+    'pt': 'mixed',
+}
+
+
+def show_results(solution: Union[LocalDegreePlan, ArrayDegreePlan, Optional[list[Course]]], expanded: int) -> None:
     """
     Displays the solution for the degree plan and runs a GUI to visualize it.
 
-    :param solution: The solution for the degree plan, either as a `LocalDegreePlan` or a list of `Course`
-    objects.
-    :type solution: Union[LocalDegreePlan, Optional[list[Course]]]
+    :param solution: The solution for the degree plan, either as a `LocalDegreePlan`, an `ArrayDegreePlan` or a
+    list of `Course` objects.
+    :type solution: Union[LocalDegreePlan, ArrayDegreePlan, Optional[list[Course]]]
     :param expanded: The number of nodes expanded during the search process.
     :type expanded: int
     """
     if not solution:
         print("Sorry...\nThere is no solution for this input.")
         return
+    solution = to_local_degree_plan(solution)
+
+    dec = "###############################"
+    print(f"{dec}DEGREE PLAN:{dec}")
+    print(f"Expanded: {expanded}\n{solution}")
+    generate_html(solution)
+
+
+def to_local_degree_plan(solution: Union[LocalDegreePlan, ArrayDegreePlan, list[Course]]) -> LocalDegreePlan:
+    """
+    Converts a solution of any of the search algorithms to a LocalDegreePlan.
+
+    :param solution: The solution for the degree plan, either as a `LocalDegreePlan`, an `ArrayDegreePlan` or a
+        list of `Course` objects (in the order a graph search takes them).
+    :type solution: Union[LocalDegreePlan, ArrayDegreePlan, list[Course]]
+    :return: The equivalent LocalDegreePlan.
+    :rtype: LocalDegreePlan
+    """
     if type(solution) is list:
         sol = solution
         solution = LocalDegreePlan()
@@ -44,11 +97,9 @@ def show_results(solution: Union[LocalDegreePlan, Optional[list[Course]]], expan
                     sem_num % 2 == 0):
                 sem_num += 1
             solution = solution.add_course(c, sem_num)
-
-    dec = "###############################"
-    print(f"{dec}DEGREE PLAN:{dec}")
-    print(f"Expanded: {expanded}\n{solution}")
-    generate_html(solution)
+    elif isinstance(solution, ArrayDegreePlan):
+        solution = solution.to_local_degree_plan()
+    return solution
 
 
 def timer(func):
@@ -95,7 +146,9 @@ def run_graph_search_main(algorithm: str, degree_planning_search_params: dict) -
     return solution, dpp.expanded
 
 
-def run_local_search_main(algorithm: str, degree_planning_search_params: dict) -> tuple[LocalDegreePlan, int]:
+def run_local_search_main(algorithm: str, degree_planning_search_params: dict,
+                          initializer: Optional[str] = None, repair: bool = False,
+                          budget: Optional[dict] = None) -> tuple[LocalDegreePlan, int]:
     """
     Runs a local search algorithm to solve the degree planning problem.
 
@@ -103,32 +156,190 @@ def run_local_search_main(algorithm: str, degree_planning_search_params: dict) -
     :type algorithm: str
     :param degree_planning_search_params: A dictionary of parameters required for the degree planning problem.
     :type degree_planning_search_params: dict
+    :param initializer: How the initial states are generated ('random', 'greedy' or 'mixed'), or None for the
+        algorithm's default (see `DEFAULT_INITIALIZERS`).
+    :type initializer: Optional[str]
+    :param repair: Whether to repair the solution if it misses the mandatory or the elective points (see
+        `repair_plan`).
+    :type repair: bool
+    :param budget: The budgets of the search, passed to the algorithm as keyword arguments ('max_evaluations'
+        and/or 'max_seconds').
+    :type budget: Optional[dict]
     :return: A tuple containing the solution (`LocalDegreePlan`) and the number of expanded nodes.
     :rtype: tuple[LocalDegreePlan, int]
     """
-    dpp = LocalDegreePlanningProblem(**degree_planning_search_params)
+    budget = budget or {}
+    if initializer is None:
+        initializer = DEFAULT_INITIALIZERS.get(algorithm, 'random')
+    dpp = LocalDegreePlanningProblem(**degree_planning_search_params, initializer=initializer)
     if algorithm == 'hill':
-        solution: LocalDegreePlan = hill(dpp)
+        result: LocalSearchResult = hill(dpp, **budget)
+    elif algorithm == 'fhill':
+        result: LocalSearchResult = fhill(dpp, **budget)
+    elif algorithm == 'rhill':
+        result, statistics = rhill(dpp, **budget)
+        print(statistics)
     elif algorithm == 'sa':
-        solution: LocalDegreePlan = sa(dpp, exp_cool_schedule)
+        result: LocalSearchResult = sa(dpp, exp_cool_schedule, **budget)
+    elif algorithm == 'asa':
+        result: LocalSearchResult = sa(dpp, AdaptiveSchedule(), **budget)
     elif algorithm == 'beam':
-        solution: LocalDegreePlan = beam(dpp)
+        result: LocalSearchResult = beam(dpp, **budget)
+    elif algorithm == 'pbeam':
+        result: LocalSearchResult = pbeam(dpp, **budget)
+    elif algorithm == 'bsa':
+        result: LocalSearchResult = bsa(dpp, exp_cool_schedule, **budget)
+    elif algorithm == 'pt':
+        result: LocalSearchResult = pt(dpp, **budget)
+    elif algorithm == 'genetic':
+        result: LocalSearchResult = genetic(dpp, **budget)
+    elif algorithm == 'tabu':
+        result: LocalSearchResult = tabu(dpp, **budget)
     else:
         raise ValueError('Invalid algorithm type')
+    print(result)
+    solution: LocalDegreePlan = result.state
+    if repair and not dpp.is_valid(solution):
+        solution = repair_plan(dpp, solution)
+        print(f"Repaired the solution: {'valid' if dpp.is_valid(solution) else 'still not valid'}")
     return solution, dpp.expanded
 
 
+def is_reproducible(algorithm: str, seed: Optional[int], budget: Optional[dict] = None) -> bool:
+    """
+    Checks whether a run gives the same plan and the same number of expanded nodes every time it runs with the
+    same inputs, so its result can be cached: graph searches always do, and local searches do when they have a
+    seed, do not depend on the timing of their workers, and have no time budget.
+
+    :param algorithm: The algorithm name.
+    :type algorithm: str
+    :param seed: The random seed of the run, or None.
+    :type seed: Optional[int]
+    :param budget: The budget of a local search (see `run_local_search_main`).
+    :type budget: Optional[dict]
+    :return: True if the run is reproducible, False otherwise.
+    :rtype: bool
+    """
+    if algorithm in GRAPH_SEARCH_ALGORITHMS:
+        return True
+    return seed is not None and algorithm not in TIMING_DEPENDENT_ALGORITHMS and 'max_seconds' not in (budget or {})
+
+
+def _run_seeded(algorithm: str, degree_planning_search_params: dict, initializer: Optional[str], repair: bool,
+                seed: int) -> dict:
+    """
+    Runs a search with its own random seed, silencing its output, and measures it.
+
+    :param algorithm: The algorithm name.
+    :type algorithm: str
+    :param degree_planning_search_params: A dictionary of parameters required for the degree planning problem.
+    :type degree_planning_search_params: dict
+    :param initializer: The initial states of a local search, or None for the algorithm's default.
+    :type initializer: Optional[str]
+    :param repair: Whether to repair the solution of a local search.
+    :type repair: bool
+    :param seed: The random seed of the run.
+    :type seed: int
+    :return: The run: its seed, encoded solution (see `encode_solution`), expanded nodes, seconds, whether its
+        plan is valid, and the average grade of its plan.
+    :rtype: dict
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        if algorithm in GRAPH_SEARCH_ALGORITHMS:
+            solution, expanded = run_graph_search_main(algorithm, degree_planning_search_params)
+        else:
+            solution, expanded = run_local_search_main(algorithm, degree_planning_search_params, initializer, repair)
+    seconds = time.perf_counter() - start
+    plan = to_local_degree_plan(solution) if solution else None
+    valid = (plan is not None and plan.total_points == degree_planning_search_params['target_points'] and
+             plan.mandatory_points == degree_planning_search_params['mandatory_points'])
+    return {'seed': seed, 'solution': encode_solution(solution), 'expanded': expanded, 'seconds': seconds,
+            'valid': valid, 'avg_grade': plan.avg_grade if plan is not None else None}
+
+
+def run_many(algorithm: str, degree_planning_search_params: dict, runs: int, jobs: int = 1,
+             seed: Optional[int] = None, initializer: Optional[str] = None, repair: bool = False) -> list[dict]:
+    """
+    Runs a search several times independently, on a pool of jobs processes.
+
+    Every run has its own random seed, spawned from the seed by a numpy SeedSequence, so the seeds are
+    statistically independent streams and the same seed always gives the same runs, whatever the number of jobs.
+
+    :param algorithm: The algorithm name.
+    :type algorithm: str
+    :param degree_planning_search_params: A dictionary of parameters required for the degree planning problem.
+    :type degree_planning_search_params: dict
+    :param runs: Number of runs.
+    :type runs: int
+    :param jobs: Number of runs at once. 1 runs them in the current process.
+    :type jobs: int
+    :param seed: The seed of the runs' seeds, or None for fresh entropy.
+    :type seed: Optional[int]
+    :param initializer: The initial states of a local search, or None for the algorithm's default.
+    :type initializer: Optional[str]
+    :param repair: Whether to repair the solutions of a local search.
+    :type repair: bool
+    :return: The runs (see `_run_seeded`), in the order of their seeds.
+    :rtype: list[dict]
+    """
+    seeds = [int(child.generate_state(1)[0]) for child in np.random.SeedSequence(seed).spawn(runs)]
+    arguments = ([algorithm] * runs, [degree_planning_search_params] * runs, [initializer] * runs, [repair] * runs,
+                 seeds)
+    if jobs <= 1:
+        return list(map(_run_seeded, *arguments))
+    with ProcessPoolExecutor(min(jobs, runs)) as executor:
+        return list(executor.map(_run_seeded, *arguments))
+
+
+def print_run_statistics(results: list[dict]) -> Optional[dict]:
+    """
+    Prints the aggregated statistics of several runs: the success ratio (runs with a valid plan), the best and
+    the mean average grade of the valid plans, and the median and 95th percentile of the run times.
+
+    :param results: The runs (see `run_many`).
+    :type results: list[dict]
+    :return: The best run: the valid run with the highest average grade, or the run with the highest average grade
+        if no plan is valid, or None if no run found a plan.
+    :rtype: Optional[dict]
+    """
+    valid_grades = [result['avg_grade'] for result in results if result['valid']]
+    p50, p95 = np.percentile([result['seconds'] for result in results], [50, 95])
+    print(f"Runs: {len(results)}, success ratio: {len(valid_grades) / len(results):.2f}")
+    if valid_grades:
+        print(f"Average grade: best {max(valid_grades):.2f}, mean {np.mean(valid_grades):.2f}")
+    print(f"Time: p50 {p50:.3f} seconds, p95 {p95:.3f} seconds")
+    with_plans = [result for result in results if result['avg_grade'] is not None]
+    if not with_plans:
+        return None
+    best = max(with_plans, key=lambda result: (result['valid'], result['avg_grade']))
+    print(f"Best run: seed {best['seed']}")
+    return best
+
+
 @timer
 def main():
     """
     The main entry point of the program. Loads the input degree plan, determines the algorithm,
     and runs the appropriate search method (graph search or local search) to generate the degree plan.
 
+    Reproducible runs (see `is_reproducible`) are looked up in the solution cache first, and stored in it after
+    they finish (see `SolutionCache`). With --runs N, the search runs N times with
+    independent seeds on --jobs processes, the statistics of the runs are printed, and only the best plan is shown.
+
     :raises ValueError: If the algorithm specified is not valid.
     """
-    algorithm = sys.argv[1]
-    input_file_path = "input_files/" + sys.argv[2]
-    min_semester_points, max_semester_points = DegreeLoad[(sys.argv[3]).upper()].value
+    args = parse_args(sys.argv[1:])
+    algorithm = args.algorithm
+    input_file_path = "input_files/" + args.input_file
+    min_semester_points, max_semester_points = DegreeLoad[args.load].value
+    repair = 'repair' in args.options
+    initializer = next((option for option in args.options if option != 'repair'), None)
+    if args.seed is not None and args.runs == 1:
+        random.seed(args.seed)
+        np.random.seed(args.seed)
 
     mandatory_points, target_points, degree_courses = load_degree_plan(input_file_path)
 
@@ -140,14 +351,71 @@ def main():
         'max_semester_points': max_semester_points
     }
 
-    if algorithm in ["dfs", "bfs", "ucs", "astar"]:
-        run_search = run_graph_search_main
+    if args.runs > 1:
+        results = run_many(algorithm, degree_planning_search_params, args.runs, args.jobs, args.seed, initializer,
+                           repair)
+        best = print_run_statistics(results)
+        show_results(decode_solution(best['solution'], degree_courses) if best else None,
+                     best['expanded'] if best else 0)
+        return
+
+    is_graph_search = algorithm in GRAPH_SEARCH_ALGORITHMS
+    if is_graph_search:
+        params = SolutionCache.search_params()
     else:
-        run_search = run_local_search_main
+        params = SolutionCache.search_params(initializer or DEFAULT_INITIALIZERS.get(algorithm, 'random'), repair)
+    cache, key = None, None
+    if not args.no_cache and is_reproducible(algorithm, args.seed):
+        cache = SolutionCache()
+        key = cache.key(catalog_hash(mandatory_points, target_points, degree_courses), algorithm,
+                        (min_semester_points, max_semester_points), params, args.seed)
+        cached = cache.get(key)
+        if cached is not None:
+            encoded_solution, expanded, seconds = cached
+            print(f"Cached result (the search took {seconds:.3f} seconds)")
+            show_results(decode_solution(encoded_solution, degree_courses), expanded)
+            return
 
-    solution, expanded = run_search(algorithm, degree_planning_search_params)
+    start = time.time()
+    if is_graph_search:
+        solution, expanded = run_graph_search_main(algorithm, degree_planning_search_params)
+    else:
+        solution, expanded = run_local_search_main(algorithm, degree_planning_search_params, initializer, repair)
+    if cache is not None:
+        cache.put(key, encode_solution(solution), expanded, time.time() - start,
+                  {'algorithm': algorithm, 'input_file': args.input_file, 'load': args.load, **params,
+                   'seed': args.seed})
     show_results(solution, expanded)
 
 
+def parse_args(argv: list[str]) -> argparse.Namespace:
+    """
+    Parses the command line arguments of the program.
+
+    :param argv: The command line arguments, without the program name.
+    :type argv: list[str]
+    :return: The parsed arguments.
+    :rtype: argparse.Namespace
+    """
+    parser = argparse.ArgumentParser(description="Plans a degree with a graph search or a local search algorithm.")
+    parser.add_argument('algorithm', help="the search algorithm, e.g. astar, hill or sa")
+    parser.add_argument('input_file', help="the name of a JSON catalog in the input_files directory")
+    parser.add_argument('load', type=str.upper, choices=[load.name for load in DegreeLoad],
+                        help="the semester load: low, medium or high")
+    parser.add_argument('options', nargs='*',
+                        help="local search options: the initial states (random, greedy or mixed) and repair")
+    parser.add_argument('--seed', type=int, help="the random seed, which also makes local searches cacheable")
+    parser.add_argument('--no-cache', action='store_true', help="do not read or write the solution cache")
+    parser.add_argument('--runs', type=int, default=1, help="independent runs, of which the best plan is shown")
+    parser.add_argument('--jobs', type=int, default=1, help="runs at once, on a process pool")
+    args = parser.parse_args(argv)
+    if args.runs < 1 or args.jobs < 1:
+        parser.error("--runs and --jobs must be positive")
+    for option in args.options:
+        if option not in (*LocalDegreePlanningProblem.INITIALIZERS, 'repair'):
+            parser.error(f"invalid option: {option} (choose from random, greedy, mixed, repair)")
+    return args
+
+
 if __name__ == '__main__':
     main()
@@ -1,3 +1,4 @@
+from cancellation import check_cancelled
 from graph_search import util
 
 
@@ -56,6 +57,7 @@ def depth_first_search(problem):
     :type problem: SearchProblem
     :return: List of actions to reach the goal state, or None if no solution exists.
     :rtype: list[object] | None
+    :raises SearchCancelled: If the search is cancelled (see `cancellation`).
     """
     fringe = util.Stack()
     visited = set()  # set of all the visited states
@@ -64,6 +66,7 @@ def depth_first_search(problem):
     fringe.push((start_state, []))
 
     while not fringe.isEmpty():
+        check_cancelled()
         current_state, actions = fringe.pop()
 
         if problem.is_goal_state(current_state):
@@ -97,6 +100,7 @@ def uniform_cost_search(problem):
     :type problem: SearchProblem
     :return: List of actions to reach the goal state, or None if no solution exists.
     :rtype: list[object] | None
+    :raises SearchCancelled: If the search is cancelled (see `cancellation`).
     """
     fringe = util.PriorityQueue()
     visited = set()  # set of all the visited states
@@ -105,6 +109,7 @@ def uniform_cost_search(problem):
     fringe.push(Stage(start_state, None, 0, None), 0)
 
     while not fringe.isEmpty():
+        check_cancelled()
         stage = fringe.pop()
         current_state, action, total_cost = stage.state, stage.action, stage.total_cost
 
@@ -156,6 +161,7 @@ def a_star_search(problem, heuristic=null_heuristic):
     :type heuristic: callable | null_heuristic
     :return: List of actions to reach the goal state, or None if no solution exists.
     :rtype: list[object] | None
+    :raises SearchCancelled: If the search is cancelled (see `cancellation`).
     """
     fringe = util.PriorityQueue()
     visited = set()  # set of all the visited states
@@ -165,6 +171,7 @@ def a_star_search(problem, heuristic=null_heuristic):
     fringe.push(Stage(start_state, None, 0, None), start_cost)
 
     while not fringe.isEmpty():
+        check_cancelled()
         stage = fringe.pop()
         current_state, action, total_cost = stage.state, stage.action, stage.total_cost
 
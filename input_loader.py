@@ -1,10 +1,44 @@
 import json
+import os
+import re
+import sys
+from typing import Any, Collection, Iterator, Optional, TextIO
 
+from compiled_catalog import compiled_path, load_compiled_catalog, write_compiled_catalog
 from course import Course
 from prerequisites import Prerequisites
 
 
 def load_degree_plan(json_file: str) -> tuple[int, int, list[Course]]:
+    """
+    Loads a degree plan and returns the total points of mandatory courses, the target points for the degree,
+    and a list of courses.
+
+    If the JSON file has a compiled catalog (see `compile_degree_plan`) that is newer than it, the compiled
+    catalog is memory-mapped instead of parsing the JSON file. Otherwise, or if the compiled catalog has another
+    format version or is corrupt (its arrays do not match its content hash), the JSON file is parsed (see
+    `load_json_degree_plan`).
+
+    :param json_file: The path to the JSON file containing the degree plan.
+    :type json_file: str
+    :return: A tuple containing:
+        - the total points for mandatory courses,
+        - the target points for the degree,
+        - a list of Course objects.
+    :rtype: tuple[int, int, list[Course]]
+    """
+    compiled_file = compiled_path(json_file)
+    if os.path.exists(compiled_file) and os.path.getmtime(compiled_file) >= os.path.getmtime(json_file):
+        try:
+            catalog = load_compiled_catalog(compiled_file, verify=True)
+        except ValueError:
+            pass
+        else:
+            return catalog.mandatory_points, catalog.target_points, catalog.courses()
+    return load_json_degree_plan(json_file)
+
+
+def load_json_degree_plan(json_file: str) -> tuple[int, int, list[Course]]:
     """
     Loads a degree plan from a JSON file and returns the total points of mandatory courses,
     the target points for the degree, and a list of courses.
@@ -61,3 +95,271 @@ def load_degree_plan(json_file: str) -> tuple[int, int, list[Course]]:
     mandatory_points = sum(c[1] for c in mandatory_courses)
 
     return mandatory_points, data['target_points'], degree_courses
+
+
+def stream_degree_plan(json_file: str, departments: Optional[Collection[int]] = None,
+                       programs: Optional[Collection[str]] = None,
+                       chunk_size: int = 2 ** 16) -> tuple[int, int, list[Course]]:
+    """
+    Loads a degree plan like `load_json_degree_plan`, but parses the 'degree_courses' array of the JSON file
+    incrementally, one course record at a time, so that very large catalogs (e.g. a whole university's) never
+    have to be held in memory as a whole: only the current chunk of the file and the kept courses are.
+
+    Every kept record is validated as it is parsed, and the mandatory points are summed on the fly. The records can
+    be filtered by department, i.e. the first two digits of the course number whatever its length (e.g. 67 for
+    67101, see `_department`), and by program, i.e. the optional 'programs' list of a record. The target points are
+    the file's, so a filter must keep enough courses to complete the degree.
+
+    :param json_file: The path to the JSON file containing the degree plan (see `load_json_degree_plan`).
+    :type json_file: str
+    :param departments: The departments of the courses to keep (default: all of them).
+    :type departments: Optional[Collection[int]]
+    :param programs: The programs of the courses to keep (default: all of them).
+    :type programs: Optional[Collection[str]]
+    :param chunk_size: The number of characters read from the file at a time.
+    :type chunk_size: int
+    :return: The total points for mandatory courses, the target points for the degree and a list of the kept
+        Course objects, in the order of the file.
+    :rtype: tuple[int, int, list[Course]]
+    :raises ValueError: If the file is not valid JSON, a record is not a valid course, or a department is not a
+        number from 0 to 99.
+    """
+    if departments is not None:
+        if any(not isinstance(d, int) or isinstance(d, bool) or not 0 <= d <= 99 for d in departments):
+            raise ValueError(f"Departments must be numbers from 0 to 99: {departments}")
+        departments = set(departments)
+    if programs is not None:
+        programs = set(programs)
+    target_points = None
+    degree_courses = []
+    mandatory_courses = set()
+    with open(json_file, 'r') as file:
+        for key, value in _stream_top_level(_JsonStream(file, chunk_size), 'degree_courses'):
+            if key == 'target_points':
+                target_points = value
+            elif key == 'degree_courses':
+                for i, course_data in enumerate(value):
+                    # filter before validating, so the dropped records cost little more than their parsing
+                    if isinstance(course_data, dict):
+                        number = course_data.get('course_number')
+                        if (departments is not None and isinstance(number, int) and not isinstance(number, bool)
+                                and _department(number) not in departments):
+                            continue
+                        if programs is not None and programs.isdisjoint(course_data.get('programs') or ()):
+                            continue
+                    course = _course_from_record(course_data, i)
+                    degree_courses.append(course)
+                    if course.is_mandatory:
+                        mandatory_courses.add((course.number, course.points))
+    if not isinstance(target_points, int) or isinstance(target_points, bool):
+        raise ValueError(f"Missing or invalid target_points in {json_file}")
+    return sum(points for _, points in mandatory_courses), target_points, degree_courses
+
+
+def _department(course_number: int) -> int:
+    """
+    Returns the department of a course: the first two digits of its number, whatever its length (e.g. 67 for
+    67101 and for 671010), or the number itself if it has a single digit.
+
+    :param course_number: The course number.
+    :type course_number: int
+    :return: The department.
+    :rtype: int
+    """
+    return int(str(abs(course_number))[:2])
+
+
+def _course_from_record(course_data: Any, index: int) -> Course:
+    """
+    Validates a course record of a JSON degree plan and builds its Course object.
+
+    :param course_data: The decoded record.
+    :type course_data: Any
+    :param index: The index of the record in the 'degree_courses' array, for the error messages.
+    :type index: int
+    :return: The course.
+    :rtype: Course
+    :raises ValueError: If the record is not a valid course.
+    """
+    def invalid(reason: str) -> ValueError:
+        return ValueError(f"Invalid course record {index}: {reason}")
+
+    if not isinstance(course_data, dict):
+        raise invalid("not an object")
+    for field, kind in (('course_number', int), ('points', int), ('avg_grade', (int, float)),
+                        ('is_mandatory', bool), ('name', str), ('semester_type', str)):
+        value = course_data.get(field)
+        if not isinstance(value, kind) or (kind is not bool and isinstance(value, bool)):
+            raise invalid(f"missing or invalid {field}")
+    if course_data['semester_type'] not in ("A", "B"):
+        raise invalid(f"semester_type must be A or B, not {course_data['semester_type']}")
+    if course_data['points'] <= 0:
+        raise invalid("points must be positive")
+    prerequisites = course_data.get('prerequisites')
+    if prerequisites is not None and not (
+            isinstance(prerequisites, list) and
+            all(isinstance(clause, list) and clause and
+                all(isinstance(number, int) and not isinstance(number, bool) for number in clause)
+                for clause in prerequisites)):
+        raise invalid("prerequisites must be a list of non-empty lists of course numbers")
+    return Course(
+        course_number=course_data['course_number'],
+        semester_type=course_data['semester_type'],
+        name=course_data['name'],
+        points=course_data['points'],
+        avg_grade=course_data['avg_grade'],
+        is_mandatory=course_data['is_mandatory'],
+        prerequisites=Prerequisites(set(map(frozenset, prerequisites))) if prerequisites is not None else None
+    )
+
+
+class _JsonStream:
+    """
+    A buffered reader of a JSON text, which decodes its values one at a time with `json.JSONDecoder.raw_decode`.
+    """
+    _NON_WHITESPACE = re.compile(r"[^ \t\n\r]")
+
+    def __init__(self, file: TextIO, chunk_size: int):
+        """
+        :param file: The open JSON file.
+        :type file: TextIO
+        :param chunk_size: The number of characters read from the file at a time.
+        :type chunk_size: int
+        """
+        self.__file = file
+        self.__chunk_size = chunk_size
+        self.__buffer = ""
+        self.__position = 0
+        self.__eof = False
+        self.__decoder = json.JSONDecoder()
+
+    def peek(self) -> str:
+        """
+        Skips whitespace and returns the next character, without consuming it.
+
+        :return: The next character, or "" at the end of the file.
+        :rtype: str
+        """
+        while True:
+            match = self._NON_WHITESPACE.search(self.__buffer, self.__position)
+            self.__position = match.start() if match else len(self.__buffer)
+            if match or not self.__read():
+                return self.__buffer[self.__position:self.__position + 1]
+
+    def expect(self, characters: str) -> str:
+        """
+        Consumes the next character, which must be one of the given characters.
+
+        :param characters: The allowed characters.
+        :type characters: str
+        :return: The consumed character.
+        :rtype: str
+        :raises ValueError: If the next character is not allowed.
+        """
+        character = self.peek()
+        if not character or character not in characters:
+            raise ValueError(f"Expected one of {characters!r} but found {character or 'the end of the file'!r}")
+        self.__position += 1
+        return character
+
+    def value(self) -> Any:
+        """
+        Decodes the next JSON value, reading more of the file until the value is complete.
+
+        :return: The decoded value.
+        :rtype: Any
+        :raises ValueError: If the next value is not valid JSON.
+        """
+        self.peek()
+        while True:
+            try:
+                value, end = self.__decoder.raw_decode(self.__buffer, self.__position)
+            except json.JSONDecodeError:
+                if not self.__read():
+                    raise
+                continue
+            # a number at the end of the buffer may continue in the next chunk
+            if end < len(self.__buffer) or self.__eof or not self.__read():
+                self.__position = end
+                return value
+
+    def __read(self) -> bool:
+        """
+        Reads the next chunk of the file into the buffer, dropping the consumed part of the buffer.
+
+        :return: False if the end of the file was reached, True otherwise.
+        :rtype: bool
+        """
+        chunk = self.__file.read(self.__chunk_size)
+        if not chunk:
+            self.__eof = True
+            return False
+        self.__buffer = self.__buffer[self.__position:] + chunk
+        self.__position = 0
+        return True
+
+
+def _stream_top_level(stream: _JsonStream, array_key: str) -> Iterator[tuple[str, Any]]:
+    """
+    Yields the members of the top level object of a JSON stream. The value of array_key, which must be an array,
+    is yielded as an iterator over its items, which must be consumed before the next member.
+
+    :param stream: The JSON stream.
+    :type stream: _JsonStream
+    :param array_key: The key of the array to stream.
+    :type array_key: str
+    :return: An iterator of (key, value) pairs.
+    :rtype: Iterator[tuple[str, Any]]
+    """
+    stream.expect("{")
+    if stream.peek() == "}":
+        return
+    while True:
+        key = stream.value()
+        stream.expect(":")
+        if key == array_key:
+            yield key, _stream_array(stream)
+        else:
+            yield key, stream.value()
+        if stream.expect(",}") == "}":
+            return
+
+
+def _stream_array(stream: _JsonStream) -> Iterator[Any]:
+    """
+    Yields the items of the next JSON array of a stream one at a time.
+
+    :param stream: The JSON stream.
+    :type stream: _JsonStream
+    :return: An iterator of the decoded items.
+    :rtype: Iterator[Any]
+    """
+    stream.expect("[")
+    if stream.peek() == "]":
+        stream.expect("]")
+        return
+    while True:
+        yield stream.value()
+        if stream.expect(",]") == "]":
+            return
+
+
+def compile_degree_plan(json_file: str) -> str:
+    """
+    Compiles a JSON degree plan to a binary catalog next to it (see `compiled_catalog.write_compiled_catalog`),
+    which `load_degree_plan` loads instead of the JSON file from then on, as long as it is newer.
+
+    :param json_file: The path to the JSON file containing the degree plan.
+    :type json_file: str
+    :return: The path of the compiled file.
+    :rtype: str
+    """
+    compiled_file = compiled_path(json_file)
+    write_compiled_catalog(compiled_file, *load_json_degree_plan(json_file))
+    return compiled_file
+
+
+if __name__ == '__main__':
+    # compile the JSON degree plans given as arguments, e.g. python input_loader.py input_files/*.json
+    for path in sys.argv[1:]:
+        print(f"Compiled {path} to {compile_degree_plan(path)}")
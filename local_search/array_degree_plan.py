@@ -0,0 +1,271 @@
+from typing import Optional
+
+import numpy as np
+
+from course import Course
+from local_search.course_catalog import CourseCatalog
+from local_search.local_degree_plan import LocalDegreePlan
+
+
+class ArrayDegreePlan:
+    """
+    Represents a Degree Plan for a student as a compact vector.
+
+    The plan is an int8 vector indexed by the dense course ids of a CourseCatalog, holding the semester index
+    each course is taken in, or -1 if the course is not taken. The offering of a taken course (A or B) is
+    implied by the parity of its semester index. Like LocalDegreePlan, this class is immutable; use
+    `to_local_degree_plan` to get a LocalDegreePlan (e.g. for printing or for `generate_html`).
+    """
+
+    NOT_TAKEN = -1
+
+    def __init__(self, catalog: CourseCatalog, semester_of: Optional[np.ndarray] = None):
+        """
+        Initializes a new ArrayDegreePlan instance.
+
+        :param catalog: The catalog of the degree courses.
+        :type catalog: CourseCatalog
+        :param semester_of: The semester index of every course by dense id, or -1 for courses that are not taken
+            (default: an empty plan).
+        :type semester_of: Optional[np.ndarray]
+        """
+        self.__catalog = catalog
+        if semester_of is None:
+            semester_of = np.full(len(catalog), ArrayDegreePlan.NOT_TAKEN, dtype=np.int8)
+        self.__semester_of = np.array(semester_of, dtype=np.int8)
+        self.__semester_of.flags.writeable = False
+
+    @classmethod
+    def from_local_degree_plan(cls, catalog: CourseCatalog, plan: LocalDegreePlan) -> "ArrayDegreePlan":
+        """
+        Encodes a LocalDegreePlan as an ArrayDegreePlan.
+
+        :param catalog: The catalog of the degree courses.
+        :type catalog: CourseCatalog
+        :param plan: The plan to encode.
+        :type plan: LocalDegreePlan
+        :return: The encoded plan.
+        :rtype: ArrayDegreePlan
+        """
+        semester_of = np.full(len(catalog), ArrayDegreePlan.NOT_TAKEN, dtype=np.int8)
+        for number, semester in plan.course_semesters.items():
+            semester_of[catalog.course_id(number)] = semester
+        return cls(catalog, semester_of)
+
+    @classmethod
+    def from_bytes(cls, catalog: CourseCatalog, encoding: bytes) -> "ArrayDegreePlan":
+        """
+        Rebuilds a plan from the bytes returned by `to_bytes`.
+
+        :param catalog: The catalog of the degree courses.
+        :type catalog: CourseCatalog
+        :param encoding: The bytes of the plan's vector.
+        :type encoding: bytes
+        :return: The decoded plan.
+        :rtype: ArrayDegreePlan
+        """
+        return cls(catalog, np.frombuffer(encoding, dtype=np.int8))
+
+    def to_bytes(self) -> bytes:
+        """
+        Returns the bytes of the plan's vector (one byte per course in the catalog).
+
+        :return: The bytes of the plan's vector.
+        :rtype: bytes
+        """
+        return self.__semester_of.tobytes()
+
+    def to_local_degree_plan(self) -> LocalDegreePlan:
+        """
+        Converts the plan to a LocalDegreePlan.
+
+        :return: The equivalent LocalDegreePlan instance.
+        :rtype: LocalDegreePlan
+        """
+        semesters: list[set[Course]] = [set() for _ in range(self.semesters_num)]
+        for course_id in np.flatnonzero(self.__semester_of >= 0):
+            semester = int(self.__semester_of[course_id])
+            semesters[semester].add(self.__catalog.offering(course_id, semester % 2))
+        return LocalDegreePlan.from_semesters(semesters)
+
+    def add_course(self, course: Course, semester: int) -> "ArrayDegreePlan":
+        """
+        Adds a course to a specified semester.
+
+        :param course: The course to be added.
+        :type course: Course
+        :param semester: The semester index where the course will be added.
+        :type semester: int
+        :return: A new ArrayDegreePlan instance with the course added.
+        :rtype: ArrayDegreePlan
+        :raises ValueError: If the semester is invalid, the course is already taken, or the course semester
+                            type does not match the semester.
+        """
+        course_id = self.__catalog.course_id(course.number)
+        if (self.semesters_num < semester or semester < 0 or self.__semester_of[course_id] >= 0 or
+                semester % 2 != CourseCatalog.semester_parity(course.semester_type)):
+            raise ValueError("Invalid semester number/ course already taken.")
+        semester_of = self.__semester_of.copy()
+        semester_of[course_id] = semester
+        return ArrayDegreePlan(self.__catalog, semester_of)
+
+    def remove_course(self, course: Course) -> "ArrayDegreePlan":
+        """
+        Removes a course from the degree plan.
+
+        :param course: The course to be removed.
+        :type course: Course
+        :return: A new ArrayDegreePlan instance with the course removed.
+        :rtype: ArrayDegreePlan
+        :raises ValueError: If the course has not been taken yet.
+        """
+        if not self.took_course(course):
+            raise ValueError("Course not taken yet.")
+        semester_of = self.__semester_of.copy()
+        semester_of[self.__catalog.course_id(course.number)] = ArrayDegreePlan.NOT_TAKEN
+        return ArrayDegreePlan(self.__catalog, semester_of)
+
+    def took_course_number(self, course_number: int) -> bool:
+        """
+        Checks if a course with a given number has been taken.
+
+        :param course_number: The course number to check.
+        :type course_number: int
+        :return: True if the course number has been taken, False otherwise.
+        :rtype: bool
+        """
+        return bool(self.__semester_of[self.__catalog.course_id(course_number)] >= 0)
+
+    def took_course(self, course: Course) -> bool:
+        """
+        Checks if a specific course (offering) has been taken.
+
+        :param course: The course to check.
+        :type course: Course
+        :return: True if the course has been taken, False otherwise.
+        :rtype: bool
+        """
+        semester = self.__semester_of[self.__catalog.course_id(course.number)]
+        return bool(semester >= 0 and semester % 2 == CourseCatalog.semester_parity(course.semester_type))
+
+    @property
+    def semester_of(self) -> np.ndarray:
+        """
+        Returns the (read only) vector of the plan: the semester index of every course by dense id, or -1 for
+        courses that are not taken.
+
+        :return: The plan's vector.
+        :rtype: np.ndarray
+        """
+        return self.__semester_of
+
+    @property
+    def semesters_num(self) -> int:
+        """
+        Returns the number of semesters in the degree plan.
+
+        :return: The number of semesters.
+        :rtype: int
+        """
+        return int(self.__semester_of.max(initial=ArrayDegreePlan.NOT_TAKEN)) + 1
+
+    @property
+    def semester_points(self) -> np.ndarray:
+        """
+        Returns the points taken in each semester.
+
+        :return: An array with the points of every semester, by semester index.
+        :rtype: np.ndarray
+        """
+        course_ids, semesters = self.__taken()
+        return np.bincount(semesters, weights=self.__catalog.points[course_ids, semesters % 2],
+                           minlength=self.semesters_num).astype(np.int64)
+
+    @property
+    def mandatory_points(self) -> int:
+        """
+        Returns the total mandatory points accumulated.
+
+        :return: The total mandatory points.
+        :rtype: int
+        """
+        course_ids, semesters = self.__taken()
+        parities = semesters % 2
+        return int(np.sum(self.__catalog.points[course_ids, parities] *
+                          self.__catalog.is_mandatory[course_ids, parities]))
+
+    @property
+    def total_points(self) -> int:
+        """
+        Returns the total points accumulated.
+
+        :return: The total points.
+        :rtype: int
+        """
+        course_ids, semesters = self.__taken()
+        return int(np.sum(self.__catalog.points[course_ids, semesters % 2]))
+
+    @property
+    def avg_grade(self) -> float:
+        """
+        Returns the average grade across all courses.
+
+        :return: The average grade.
+        :rtype: float
+        """
+        course_ids, semesters = self.__taken()
+        parities = semesters % 2
+        points = self.__catalog.points[course_ids, parities]
+        if points.sum() == 0:
+            return 0
+        return float(np.sum(self.__catalog.avg_grades[course_ids, parities] * points) / points.sum())
+
+    def __taken(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the dense ids of the courses taken and their semester indices.
+
+        :return: The ids of the courses taken and the semester index of each of them.
+        :rtype: tuple[np.ndarray, np.ndarray]
+        """
+        course_ids = np.flatnonzero(self.__semester_of >= 0)
+        return course_ids, self.__semester_of[course_ids].astype(np.int64)
+
+    def __copy__(self) -> "ArrayDegreePlan":
+        """
+        Creates a copy of the current ArrayDegreePlan instance.
+
+        :return: A new ArrayDegreePlan instance that is a copy of the current instance.
+        :rtype: ArrayDegreePlan
+        """
+        return ArrayDegreePlan(self.__catalog, self.__semester_of)
+
+    def __str__(self):
+        """
+        Returns a string representation of the ArrayDegreePlan instance (see `LocalDegreePlan.__str__`).
+
+        :return: A string representation of the degree plan.
+        :rtype: str
+        """
+        return str(self.to_local_degree_plan())
+
+    def __eq__(self, other):
+        """
+        Checks if two ArrayDegreePlan instances are equal.
+
+        :param other: The other ArrayDegreePlan instance to compare.
+        :type other: ArrayDegreePlan
+        :return: True if both plans take the same courses in the same semesters, False otherwise.
+        :rtype: bool
+        """
+        if not isinstance(other, ArrayDegreePlan):
+            return False
+        return np.array_equal(self.__semester_of, other.__semester_of)
+
+    def __hash__(self):
+        """
+        Returns a hash of the ArrayDegreePlan instance.
+
+        :return: The hash of the instance.
+        :rtype: int
+        """
+        return hash(self.__semester_of.tobytes())
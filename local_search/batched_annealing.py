@@ -0,0 +1,104 @@
+import random
+from typing import Callable, Optional
+
+import numpy as np
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import LocalSearchResult, SearchTracker
+
+
+# region Batched Simulated Annealing - specific to DegreePlanningProblem
+def batched_simulated_annealing(problem: LocalDegreePlanningProblem, schedule: Callable[[int], float],
+                                chains: int = 256, max_iter=10 ** 5, eps=1e-25, max_evaluations: Optional[int] = None,
+                                max_seconds: Optional[float] = None) -> LocalSearchResult:
+    """
+    Implements Simulated Annealing over many independent chains that advance in lockstep.
+
+    The current plans of all chains are the rows of a 2-D int8 array of ArrayDegreePlan vectors. On every
+    iteration one random move is drawn for every chain as arrays (see `random_moves`), the constraints and the
+    fitness of all the resulting plans are checked at once, and the moves are accepted with the Metropolis
+    criterion, e^(delta / T), as vector operations.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param schedule: A function that computes the temperature based on the current iteration.
+    :type schedule: Callable[[int], float]
+    :param chains: Number of chains.
+    :type chains: int
+    :param max_iter: Maximum number of iterations.
+    :type max_iter: int
+    :param eps: A small value to determine when to stop the algorithm.
+    :type eps: float
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is the best valid plan visited by any chain (or the best plan
+        visited, if no valid plan was visited), and whose final state is the best final plan of all chains.
+    :rtype: LocalSearchResult
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    plans = np.stack([ArrayDegreePlan.from_local_degree_plan(problem.catalog, problem.get_initial_state())
+                      .semester_of for _ in range(chains)])
+    features = problem.array_features(plans)
+    scores = problem.fitness_from_features(features)
+    tracker.observe_batch(plans, scores, problem.array_is_valid(features))
+    while not tracker.exhausted():
+        T = schedule(tracker.iterations)
+        if T < eps:
+            tracker.stop('temperature')
+            break
+        tracker.next_iteration(chains)
+        problem.expanded += chains
+        candidates = random_moves(problem, plans, rng)
+        features = problem.array_features(candidates)
+        candidate_scores = problem.fitness_from_features(features)
+        with np.errstate(over='ignore'):
+            accepted = problem.array_is_feasible(candidates) & (
+                    (candidate_scores > scores) | (rng.random(chains) < np.exp((candidate_scores - scores) / T)))
+        plans[accepted], scores[accepted] = candidates[accepted], candidate_scores[accepted]
+        tracker.observe_batch(plans[accepted], scores[accepted], problem.array_is_valid(features[accepted]))
+
+    return tracker.result(plans[np.argmax(scores)].copy(),
+                          lambda plan: ArrayDegreePlan(problem.catalog, plan).to_local_degree_plan())
+
+
+def random_moves(problem: LocalDegreePlanningProblem, plans: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """
+    Draws one random move for every plan: a random course is removed (with probability 1/4) or placed in a
+    random semester of a type it is offered in, and with probability 1/2 another random course is removed, so
+    that courses can also be swapped.
+
+    The moves are not checked against the constraints (see `LocalDegreePlanningProblem.array_is_feasible`).
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param plans: The current plan vectors, one per row.
+    :type plans: np.ndarray
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The plan vectors after the moves.
+    :rtype: np.ndarray
+    """
+    chains, courses_num = plans.shape
+    rows = np.arange(chains)
+    courses = rng.integers(0, courses_num, size=chains)
+    semesters = rng.integers(0, problem.max_semester_num, size=chains)
+    not_offered = ~problem.catalog.offered[courses, semesters % 2]
+    semesters[not_offered] = np.where(semesters[not_offered] + 1 < problem.max_semester_num,
+                                      semesters[not_offered] + 1, semesters[not_offered] - 1)
+    semesters[rng.random(chains) < 0.25] = ArrayDegreePlan.NOT_TAKEN
+
+    candidates = plans.copy()
+    candidates[rows, courses] = semesters
+    removals = rng.random(chains) < 0.5
+    candidates[rows[removals], rng.integers(0, courses_num, size=chains)[removals]] = ArrayDegreePlan.NOT_TAKEN
+    return candidates
+
+
+# endregion
+
+# Abbreviations
+bsa = batched_simulated_annealing
@@ -0,0 +1,238 @@
+from typing import Optional
+
+import numpy as np
+
+from course import Course
+
+
+class CourseCatalog:
+    """
+    A dense, array based index of the courses available for a degree.
+
+    Every course number gets a dense id in [0, len(catalog)), in ascending order of course numbers.
+    The course attributes are kept in NumPy arrays of shape (len(catalog), 2), where column 0 describes the
+    offering of the course in semester A and column 1 its offering in semester B. Entries of offerings that
+    do not exist are zero (see `offered`).
+
+    The prerequisites of all offerings are kept in CSR form: clause i of the catalog belongs to the offering
+    (prerequisite_owners[i], prerequisite_parities[i]) and is satisfied by any of the courses
+    prerequisite_courses[prerequisite_starts[i]:prerequisite_starts[i + 1]]. Course numbers that are not in the
+    catalog are replaced by the id len(catalog), which is never taken.
+    """
+
+    def __init__(self, degree_courses: list[Course]):
+        """
+        Initializes the catalog from the list of courses available for the degree.
+
+        :param degree_courses: List of available courses (offerings) for the degree.
+        :type degree_courses: list[Course]
+        """
+        self.__course_numbers = np.array(sorted({c.number for c in degree_courses}), dtype=np.int64)
+        self.__course_ids: dict[int, int] = {int(number): i for i, number in enumerate(self.__course_numbers)}
+        courses_num = len(self.__course_numbers)
+        self.__offerings: list[list[Optional[Course]]] = [[None, None] for _ in range(courses_num)]
+        self.__offered = np.zeros((courses_num, 2), dtype=bool)
+        self.__points = np.zeros((courses_num, 2), dtype=np.int64)
+        self.__avg_grades = np.zeros((courses_num, 2), dtype=float)
+        self.__is_mandatory = np.zeros((courses_num, 2), dtype=bool)
+        for course in degree_courses:
+            course_id, parity = self.__course_ids[course.number], self.semester_parity(course.semester_type)
+            self.__offerings[course_id][parity] = course
+            self.__offered[course_id, parity] = True
+            self.__points[course_id, parity] = course.points
+            self.__avg_grades[course_id, parity] = course.avg_grade
+            self.__is_mandatory[course_id, parity] = course.is_mandatory
+        self.__build_prerequisites(degree_courses)
+        for array in (self.__course_numbers, self.__offered, self.__points, self.__avg_grades,
+                      self.__is_mandatory, self.__prerequisite_courses, self.__prerequisite_starts,
+                      self.__prerequisite_owners, self.__prerequisite_parities):
+            array.flags.writeable = False
+
+    def __build_prerequisites(self, degree_courses: list[Course]):
+        """
+        Builds the CSR arrays of the prerequisite clauses of all offerings.
+
+        :param degree_courses: List of available courses (offerings) for the degree.
+        :type degree_courses: list[Course]
+        """
+        never_taken = len(self.__course_numbers)
+        courses, starts, owners, parities = [], [0], [], []
+        for course in degree_courses:
+            for clause in course.prerequisites.cnf_course_numbers or ():
+                clause_ids = sorted({self.__course_ids.get(number, never_taken) for number in clause})
+                courses.extend(clause_ids or [never_taken])
+                starts.append(len(courses))
+                owners.append(self.__course_ids[course.number])
+                parities.append(self.semester_parity(course.semester_type))
+        self.__prerequisite_courses = np.array(courses, dtype=np.intp)
+        self.__prerequisite_starts = np.array(starts, dtype=np.intp)
+        self.__prerequisite_owners = np.array(owners, dtype=np.intp)
+        self.__prerequisite_parities = np.array(parities, dtype=np.int8)
+
+    @staticmethod
+    def semester_parity(semester_type: str) -> int:
+        """
+        Returns the parity of the semester indices of a semester type (0 for 'A' and 1 for 'B').
+
+        :param semester_type: The semester type ('A' or 'B').
+        :type semester_type: str
+        :return: The parity of the semester indices of this type.
+        :rtype: int
+        """
+        return 0 if semester_type == "A" else 1
+
+    def course_id(self, course_number: int) -> int:
+        """
+        Returns the dense id of a course number.
+
+        :param course_number: The course number.
+        :type course_number: int
+        :return: The dense id of the course.
+        :rtype: int
+        :raises KeyError: If the course number is not in the catalog.
+        """
+        return self.__course_ids[course_number]
+
+    def offering(self, course_id: int, parity: int) -> Optional[Course]:
+        """
+        Returns the offering of a course in the semesters of the given parity.
+
+        :param course_id: The dense id of the course.
+        :type course_id: int
+        :param parity: 0 for the offering in semester A, 1 for the offering in semester B.
+        :type parity: int
+        :return: The Course offering, or None if the course is not offered in these semesters.
+        :rtype: Optional[Course]
+        """
+        return self.__offerings[course_id][parity]
+
+    def offering_values(self, values: np.ndarray, semester_of: np.ndarray) -> np.ndarray:
+        """
+        Picks, for every course of one or more plans, the value of the offering the course is taken in.
+
+        :param values: An offering attribute of shape (len(catalog), 2), such as `points` or `avg_grades`.
+        :type values: np.ndarray
+        :param semester_of: Plan vectors (see ArrayDegreePlan), of shape (len(catalog),) or (plans, len(catalog)).
+        :type semester_of: np.ndarray
+        :return: An array shaped like semester_of with the values of the taken offerings, and zeros for courses
+            that are not taken.
+        :rtype: np.ndarray
+        """
+        taken = semester_of >= 0
+        picked = values.T[semester_of % 2, np.arange(len(self))]
+        return np.where(taken, picked, np.zeros((), dtype=values.dtype))
+
+    def unmet_prerequisites(self, semester_of: np.ndarray) -> np.ndarray:
+        """
+        Finds the taken courses whose prerequisites are not completed in earlier semesters, for one or more
+        plans at once.
+
+        :param semester_of: Plan vectors (see ArrayDegreePlan), of shape (len(catalog),) or (plans, len(catalog)).
+        :type semester_of: np.ndarray
+        :return: A boolean array shaped like semester_of, True for the courses with unmet prerequisites.
+        :rtype: np.ndarray
+        """
+        plans = np.atleast_2d(semester_of).astype(np.int16)
+        unmet = np.zeros(plans.shape, dtype=bool)
+        if len(self.__prerequisite_owners) == 0:
+            return unmet.reshape(np.shape(semester_of))
+        never = np.iinfo(np.int16).max
+        # the semester each course is completed in, with an extra never taken column
+        completed = np.concatenate([np.where(plans >= 0, plans, never),
+                                    np.full((len(plans), 1), never, dtype=np.int16)], axis=1)
+        earliest = np.minimum.reduceat(completed[:, self.__prerequisite_courses],
+                                       self.__prerequisite_starts[:-1], axis=1)
+        owner_semesters = plans[:, self.__prerequisite_owners]
+        violated = ((owner_semesters >= 0) & (owner_semesters % 2 == self.__prerequisite_parities) &
+                    (earliest >= owner_semesters))
+        rows, clauses = np.nonzero(violated)
+        unmet[rows, self.__prerequisite_owners[clauses]] = True
+        return unmet.reshape(np.shape(semester_of))
+
+    def earliest_semesters(self, semester_of: np.ndarray) -> np.ndarray:
+        """
+        Finds, for one or more plans, the earliest semester each offering can be taken in, given the semesters
+        the other courses of the plan are taken in. Semester loads are not considered.
+
+        :param semester_of: Plan vectors (see ArrayDegreePlan), of shape (len(catalog),) or (plans, len(catalog)).
+        :type semester_of: np.ndarray
+        :return: An array of shape semester_of.shape + (2,) with the earliest semester index of the A and B
+            offerings of every course, or the maximum int16 value for offerings that do not exist or whose
+            prerequisites are not completed in the plan.
+        :rtype: np.ndarray
+        """
+        plans = np.atleast_2d(semester_of).astype(np.int16)
+        never = np.iinfo(np.int16).max
+        # the first semester after all the prerequisites of each offering are completed
+        required = np.zeros(plans.shape + (2,), dtype=np.int16)
+        if len(self.__prerequisite_owners) > 0:
+            completed = np.concatenate([np.where(plans >= 0, plans, never - 1),
+                                        np.full((len(plans), 1), never - 1, dtype=np.int16)], axis=1)
+            after_clause = np.minimum.reduceat(completed[:, self.__prerequisite_courses],
+                                               self.__prerequisite_starts[:-1], axis=1) + 1
+            flat_required = required.reshape(len(plans), -1)
+            np.maximum.at(flat_required, (slice(None), self.__prerequisite_owners * 2 + self.__prerequisite_parities),
+                          after_clause)
+        # round up to a semester of the offering's type
+        earliest = required + (required % 2 != np.arange(2, dtype=np.int16))
+        earliest[(required >= never - 1) | ~np.broadcast_to(self.__offered, earliest.shape)] = never
+        return earliest.reshape(np.shape(semester_of) + (2,))
+
+    @property
+    def course_numbers(self) -> np.ndarray:
+        """
+        Returns the course number of every dense id.
+
+        :return: An array of course numbers, indexed by dense id.
+        :rtype: np.ndarray
+        """
+        return self.__course_numbers
+
+    @property
+    def offered(self) -> np.ndarray:
+        """
+        Returns whether each course is offered in semesters A and B.
+
+        :return: A boolean array of shape (len(catalog), 2).
+        :rtype: np.ndarray
+        """
+        return self.__offered
+
+    @property
+    def points(self) -> np.ndarray:
+        """
+        Returns the credit points of each offering.
+
+        :return: An integer array of shape (len(catalog), 2).
+        :rtype: np.ndarray
+        """
+        return self.__points
+
+    @property
+    def avg_grades(self) -> np.ndarray:
+        """
+        Returns the average grade of each offering.
+
+        :return: A float array of shape (len(catalog), 2).
+        :rtype: np.ndarray
+        """
+        return self.__avg_grades
+
+    @property
+    def is_mandatory(self) -> np.ndarray:
+        """
+        Returns whether each offering is mandatory.
+
+        :return: A boolean array of shape (len(catalog), 2).
+        :rtype: np.ndarray
+        """
+        return self.__is_mandatory
+
+    def __len__(self) -> int:
+        """
+        Returns the number of distinct course numbers in the catalog.
+
+        :return: The number of courses.
+        :rtype: int
+        """
+        return len(self.__course_numbers)
@@ -0,0 +1,269 @@
+import random
+from typing import Optional
+
+import numpy as np
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import LocalSearchResult, SearchTracker
+
+
+# region Genetic Algorithm - specific to DegreePlanningProblem
+def genetic_algorithm(problem: LocalDegreePlanningProblem, population_size: int = 2000, max_generations=500,
+                      mutation_rate: Optional[float] = None, elite_size: int = 20, patience: int = 50,
+                      max_evaluations: Optional[int] = None, max_seconds: Optional[float] = None) -> LocalSearchResult:
+    """
+    Implements a Genetic Algorithm over a whole population of degree plans at once.
+
+    The population is a 2-D int8 array with an ArrayDegreePlan vector in each row, so selection, crossover,
+    mutation, repair and fitness all run as array operations over the whole population. Every generation
+    counts as an iteration.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param population_size: Number of plans in the population.
+    :type population_size: int
+    :param max_generations: Maximum number of generations.
+    :type max_generations: int
+    :param mutation_rate: Probability to reassign each course of a child (default: 1 / number of courses).
+    :type mutation_rate: Optional[float]
+    :param elite_size: Number of best plans that survive to the next generation as they are (at most the
+        population size).
+    :type elite_size: int
+    :param patience: Number of generations without improvement of the best plan before stopping.
+    :type patience: int
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is the best valid plan of all generations (or the best plan, if
+        no valid plan was found), and whose final state is the best plan of the last generation.
+    :rtype: LocalSearchResult
+    """
+    rng = np.random.default_rng(random.getrandbits(64))
+    tracker = SearchTracker(problem, max_generations, max_evaluations, max_seconds)
+    courses_num = len(problem.catalog)
+    elite_size = min(elite_size, population_size)
+    if mutation_rate is None:
+        mutation_rate = 1 / max(courses_num, 1)
+
+    population = repair_population(problem, random_population(problem, population_size, rng), rng)
+    features = problem.array_features(population)
+    scores = problem.fitness_from_features(features)
+    tracker.observe_batch(population, scores, problem.array_is_valid(features))
+    generations_without_improvement = 0
+    while not tracker.exhausted():
+        tracker.next_iteration(population_size)
+        problem.expanded += 1
+        first_parents = tournament_selection(scores, population_size, rng)
+        second_parents = tournament_selection(scores, population_size, rng)
+        # uniform crossover
+        children = np.where(rng.random(population.shape) < 0.5, population[first_parents],
+                            population[second_parents])
+        # mutation: reassign random courses to random semesters, or drop them
+        mutated = rng.random(children.shape) < mutation_rate
+        children[mutated] = rng.integers(ArrayDegreePlan.NOT_TAKEN, problem.max_semester_num,
+                                         size=np.count_nonzero(mutated))
+        children = repair_population(problem, children, rng)
+        children_features = problem.array_features(children)
+        children_scores = problem.fitness_from_features(children_features)
+        best_score = tracker.best_fitness
+        tracker.observe_batch(children, children_scores, problem.array_is_valid(children_features))
+
+        # elitism: the best plans replace the worst children
+        if elite_size > 0:
+            elite = np.argpartition(scores, -elite_size)[-elite_size:]
+            worst_children = np.argpartition(children_scores, elite_size - 1)[:elite_size]
+            children[worst_children], children_scores[worst_children] = population[elite], scores[elite]
+        population, scores = children, children_scores
+
+        if tracker.best_fitness > best_score + 1e-9:
+            generations_without_improvement = 0
+        else:
+            generations_without_improvement += 1
+            if generations_without_improvement >= patience:
+                tracker.stop('converged')
+                break
+
+    return tracker.result(population[np.argmax(scores)].copy(),
+                          lambda plan: ArrayDegreePlan(problem.catalog, plan).to_local_degree_plan())
+
+
+def random_population(problem: LocalDegreePlanningProblem, population_size: int,
+                      rng: np.random.Generator) -> np.ndarray:
+    """
+    Creates a random population, where every course is taken with a probability that gives the target points
+    on average, in a random semester.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param population_size: Number of plans in the population.
+    :type population_size: int
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The population, one plan vector per row (not repaired).
+    :rtype: np.ndarray
+    """
+    catalog = problem.catalog
+    offered_points = np.where(catalog.offered, catalog.points, 0).max(axis=1)
+    take_probability = min(1.0, problem.target_points / max(offered_points.sum(), 1))
+    shape = (population_size, len(catalog))
+    semesters = rng.integers(0, problem.max_semester_num, size=shape)
+    return np.where(rng.random(shape) < take_probability, semesters, ArrayDegreePlan.NOT_TAKEN).astype(np.int8)
+
+
+def repair_population(problem: LocalDegreePlanningProblem, population: np.ndarray,
+                      rng: np.random.Generator) -> np.ndarray:
+    """
+    Repairs every plan of the population so that it satisfies the constraints kept by the local search
+    neighborhoods of the problem.
+
+    Courses are moved to the neighboring semester when they are not offered in the semester type they are
+    in, random electives are dropped until the elective points are within the degree's requirement, random
+    courses are dropped from semesters with more than the maximum points, courses with unmet prerequisites are
+    postponed by a year (or dropped) until all prerequisites are met, and finally the courses are moved as
+    early as possible (see `compact_population`).
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param population: The population, one plan vector per row.
+    :type population: np.ndarray
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The repaired population.
+    :rtype: np.ndarray
+    """
+    catalog = problem.catalog
+    population = population.copy()
+
+    # semester type: move to the next semester (or the previous one, in the last semester)
+    misplaced = (population >= 0) & ~catalog.offering_values(catalog.offered, population)
+    shifted = np.where(population + 1 < problem.max_semester_num, population + 1, population - 1)
+    population[misplaced] = shifted[misplaced]
+
+    # elective points
+    points = catalog.offering_values(catalog.points, population)
+    is_elective = (population >= 0) & ~catalog.offering_values(catalog.is_mandatory, population)
+    population[_random_overflow(np.where(is_elective, points, 0), np.zeros_like(population),
+                                problem.elective_points, rng) & is_elective] = ArrayDegreePlan.NOT_TAKEN
+
+    # semester load
+    points = catalog.offering_values(catalog.points, population)
+    population[_random_overflow(points, population, problem.max_semester_points, rng)] = \
+        ArrayDegreePlan.NOT_TAKEN
+
+    # prerequisites: postpone courses by a year, or drop them if they cannot be postponed (changing a course
+    # may break the prerequisites of later courses)
+    unmet = catalog.unmet_prerequisites(population)
+    while unmet.any():
+        postponed = np.where(population + 2 < problem.max_semester_num, population + 2, ArrayDegreePlan.NOT_TAKEN)
+        population[unmet] = postponed[unmet]
+        unmet = catalog.unmet_prerequisites(population)
+    points = catalog.offering_values(catalog.points, population)
+    population[_random_overflow(points, population, problem.max_semester_points, rng)] = \
+        ArrayDegreePlan.NOT_TAKEN
+    unmet = catalog.unmet_prerequisites(population)
+    while unmet.any():
+        population[unmet] = ArrayDegreePlan.NOT_TAKEN
+        unmet = catalog.unmet_prerequisites(population)
+    return compact_population(problem, population, rng)
+
+
+def compact_population(problem: LocalDegreePlanningProblem, population: np.ndarray,
+                       rng: np.random.Generator) -> np.ndarray:
+    """
+    Moves the courses of every plan as early as possible, semester by semester: a course is moved to an
+    earlier semester of the same type once its prerequisites are completed before it, in a random order, as
+    long as the semester does not exceed the maximum points.
+
+    Moving courses earlier keeps all prerequisites met and leaves room at the end of the plans for the
+    courses that depend on them.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param population: The population of repaired plans, one plan vector per row.
+    :type population: np.ndarray
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The compacted population.
+    :rtype: np.ndarray
+    """
+    catalog = problem.catalog
+    rows = np.arange(len(population))
+    for semester in range(problem.max_semester_num - 2):
+        parity = semester % 2
+        earliest = catalog.earliest_semesters(population)[:, :, parity]
+        movable = (population > semester) & (population % 2 == parity) & (earliest <= semester)
+        if not movable.any():
+            continue
+        points = catalog.offering_values(catalog.points, population)
+        room = problem.max_semester_points - np.where(population == semester, points, 0).sum(axis=1)
+        # visit the movable courses in a random order, and move them while there is room
+        order = np.argsort(np.where(movable, rng.random(population.shape), 2), axis=1)
+        cumulative = np.cumsum(np.take_along_axis(np.where(movable, points, 0), order, axis=1), axis=1)
+        moved = np.zeros(population.shape, dtype=bool)
+        np.put_along_axis(moved, order, cumulative <= room[rows, None], axis=1)
+        population[moved & movable] = semester
+    return population
+
+
+def tournament_selection(scores: np.ndarray, size: int, rng: np.random.Generator) -> np.ndarray:
+    """
+    Selects plans by binary tournaments: each selected plan is the fitter of two random plans.
+
+    :param scores: The fitness of every plan in the population.
+    :type scores: np.ndarray
+    :param size: Number of plans to select.
+    :type size: int
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: The indices of the selected plans.
+    :rtype: np.ndarray
+    """
+    contestants = rng.integers(0, len(scores), size=(size, 2))
+    first_wins = scores[contestants[:, 0]] >= scores[contestants[:, 1]]
+    return np.where(first_wins, contestants[:, 0], contestants[:, 1])
+
+
+def _random_overflow(points: np.ndarray, groups: np.ndarray, max_points: int,
+                     rng: np.random.Generator) -> np.ndarray:
+    """
+    Picks random courses to drop so that the points of every group (e.g. semester) of every plan are at most
+    max_points.
+
+    The courses of each group are visited in a random order, and the courses that bring the group's points
+    above max_points are picked.
+
+    :param points: The points of every course of every plan (zero for courses that do not count).
+    :type points: np.ndarray
+    :param groups: The group of every course of every plan.
+    :type groups: np.ndarray
+    :param max_points: The maximum points of a group.
+    :type max_points: int
+    :param rng: The random generator.
+    :type rng: np.random.Generator
+    :return: A boolean array shaped like points, True for the courses to drop.
+    :rtype: np.ndarray
+    """
+    # sort the courses of every plan by group, in a random order within the group
+    order = np.argsort(groups.astype(float) + rng.random(groups.shape), axis=1)
+    sorted_points = np.take_along_axis(points, order, axis=1)
+    sorted_groups = np.take_along_axis(groups, order, axis=1)
+    cumulative = np.cumsum(sorted_points, axis=1)
+
+    # subtract the points accumulated before the start of each group
+    positions = np.broadcast_to(np.arange(groups.shape[1]), groups.shape)
+    group_starts = np.ones(groups.shape, dtype=bool)
+    group_starts[:, 1:] = sorted_groups[:, 1:] != sorted_groups[:, :-1]
+    group_start_positions = np.maximum.accumulate(np.where(group_starts, positions, 0), axis=1)
+    before_group = np.take_along_axis(cumulative - sorted_points, group_start_positions, axis=1)
+
+    overflow = np.zeros(points.shape, dtype=bool)
+    np.put_along_axis(overflow, order, (cumulative - before_group > max_points) & (sorted_points > 0), axis=1)
+    return overflow
+
+
+# endregion
+
+# Abbreviations
+genetic = genetic_algorithm
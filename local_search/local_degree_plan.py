@@ -33,6 +33,33 @@ class LocalDegreePlan:
         self.__semesters: list[set[Course]] = []
         self.__avg_grade = 0
 
+    @classmethod
+    def from_semesters(cls, semesters: list[set[Course]]) -> "LocalDegreePlan":
+        """
+        Builds a degree plan directly from the courses placed in each semester.
+
+        Unlike `add_course`, no validity checks are done, so the given semesters are expected to describe a
+        plan that was built by the search (e.g. a decoded plan).
+
+        :param semesters: The courses taken in each semester, by semester index.
+        :type semesters: list[set[Course]]
+        :return: A new LocalDegreePlan instance with the given semesters.
+        :rtype: LocalDegreePlan
+        """
+        new_plan = cls()
+        weighted_grades = 0
+        for i, semester in enumerate(semesters):
+            for course in semester:
+                if course.is_mandatory:
+                    new_plan.__mandatory_points += course.points
+                new_plan.__total_points += course.points
+                new_plan.__courses_so_far[course.number] = i
+                weighted_grades += course.avg_grade * course.points
+        new_plan.__semesters = [set(semester) for semester in semesters]
+        if new_plan.__total_points > 0:
+            new_plan.__avg_grade = weighted_grades / new_plan.__total_points
+        return new_plan
+
     def add_course(self, course: Course, semester: int) -> "LocalDegreePlan":
         """
         Adds a course to a specified semester.
@@ -223,6 +250,26 @@ class LocalDegreePlan:
         """
         return self.__avg_grade
 
+    @property
+    def course_semesters(self) -> dict[int, int]:
+        """
+        Returns the semester index of every course number taken.
+
+        :return: A mapping from course number to the semester index it is taken in.
+        :rtype: dict[int, int]
+        """
+        return self.__courses_so_far.copy()
+
+    @property
+    def semesters_num(self) -> int:
+        """
+        Returns the number of semesters in the degree plan.
+
+        :return: The number of semesters.
+        :rtype: int
+        """
+        return len(self.__semesters)
+
     def __copy__(self) -> "LocalDegreePlan":
         """
         Creates a copy of the current LocalDegreePlan instance.
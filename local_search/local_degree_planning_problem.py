@@ -1,6 +1,11 @@
 import random
+from typing import Iterator, Optional
+
+import numpy as np
 
 from course import Course
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.course_catalog import CourseCatalog
 from local_search.local_degree_plan import LocalDegreePlan
 from local_search.local_search_ import LocalSearchProblem
 
@@ -13,8 +18,12 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
     criteria, such as achieving a target number of points and adhering to mandatory point requirements.
     """
 
+    INITIALIZERS = ('random', 'greedy', 'mixed')
+    OPERATORS = ('add', 'remove', 'swap_elective', 'move', 'swap_offering')
+
     def __init__(self, degree_courses: list[Course], mandatory_points: int,
-                 target_points: int, min_semester_points, max_semester_points):
+                 target_points: int, min_semester_points, max_semester_points, initializer: str = 'random',
+                 greedy_noise: float = 2.0, operator_weights: Optional[dict[str, float]] = None):
         """
         Initializes a new LocalDegreePlanningProblem instance.
 
@@ -28,7 +37,26 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
         :type min_semester_points: int
         :param max_semester_points: Maximum points allowed in a semester.
         :type max_semester_points: int
+        :param initializer: How `get_initial_state` builds initial states: 'random' for random plans, 'greedy'
+            for greedy plans (see `greedy_initial_state`), or 'mixed' for either of them with equal probability.
+        :type initializer: str
+        :param greedy_noise: The standard deviation of the random noise added to the average grades that the
+            greedy initial states are built by, which makes them diverse.
+        :type greedy_noise: float
+        :param operator_weights: The sampling weight of every move operator of `iter_neighbors` (see OPERATORS),
+            where operators that are left out get weight 1 and operators with weight 0 are not used.
+        :type operator_weights: Optional[dict[str, float]]
+        :raises ValueError: If the initializer is not one of INITIALIZERS, or an operator is not one of OPERATORS.
         """
+        if initializer not in self.INITIALIZERS:
+            raise ValueError(f"Invalid initializer: {initializer}")
+        self.__operator_weights = dict.fromkeys(self.OPERATORS, 1.0)
+        for operator, weight in (operator_weights or {}).items():
+            if operator not in self.__operator_weights or weight < 0:
+                raise ValueError(f"Invalid operator weight: {operator}={weight}")
+            self.__operator_weights[operator] = weight
+        self.__initializer = initializer
+        self.__greedy_noise = greedy_noise
         self.__degree_courses = degree_courses
         self.__target_points = target_points
         self.__mandatory_points = mandatory_points
@@ -38,6 +66,9 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
         self.__max_semester_num = target_points // min_semester_points
         self.expanded = 0
         self.__MINIMUM_INIT_POINTS = self.__target_points // 3
+        self.__catalog = CourseCatalog(degree_courses)
+        self.__weighted_grades = self.__catalog.points * self.__catalog.avg_grades
+        self.__fitness_upper_bound = self.__relaxed_best_fitness()
 
     @property
     def target_points(self) -> int:
@@ -59,11 +90,90 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
         """
         return self.__mandatory_points
 
+    @property
+    def elective_points(self) -> int:
+        """
+        Returns the total points of elective courses required for the degree.
+
+        :return: The elective points.
+        :rtype: int
+        """
+        return self.__elective_points
+
+    @property
+    def min_semester_points(self) -> int:
+        """
+        Returns the minimum points required in a semester.
+
+        :return: The minimum semester points.
+        :rtype: int
+        """
+        return self.__min_semester_points
+
+    @property
+    def max_semester_points(self) -> int:
+        """
+        Returns the maximum points allowed in a semester.
+
+        :return: The maximum semester points.
+        :rtype: int
+        """
+        return self.__max_semester_points
+
+    @property
+    def max_semester_num(self) -> int:
+        """
+        Returns the maximum number of semesters allowed.
+
+        :return: The maximum number of semesters.
+        :rtype: int
+        """
+        return self.__max_semester_num
+
+    @property
+    def catalog(self) -> CourseCatalog:
+        """
+        Returns the dense, array based index of the degree courses.
+
+        :return: The course catalog.
+        :rtype: CourseCatalog
+        """
+        return self.__catalog
+
+    @property
+    def initializer(self) -> str:
+        """
+        Returns how initial states are built ('random', 'greedy' or 'mixed').
+
+        :return: The initializer of the problem.
+        :rtype: str
+        """
+        return self.__initializer
+
+    @property
+    def operator_weights(self) -> dict[str, float]:
+        """
+        Returns the sampling weight of every move operator of `iter_neighbors`.
+
+        :return: A mapping from operator name (see OPERATORS) to its weight.
+        :rtype: dict[str, float]
+        """
+        return self.__operator_weights.copy()
+
     def get_initial_state(self) -> LocalDegreePlan:
         """
-        Generates an initial state for the degree planning problem.
+        Generates an initial state for the degree planning problem, with the problem's initializer.
+
+        :return: An initial LocalDegreePlan instance.
+        :rtype: LocalDegreePlan
+        """
+        if self.__initializer == 'greedy' or (self.__initializer == 'mixed' and random.random() < 0.5):
+            return self.greedy_initial_state()
+        return self.random_initial_state()
 
-        The initial state is randomly generated with a number of points between 0 and the target points.
+    def random_initial_state(self) -> LocalDegreePlan:
+        """
+        Generates a random initial state, with a random number of points between 0 and the target points.
 
         :return: An initial LocalDegreePlan instance.
         :rtype: LocalDegreePlan
@@ -88,6 +198,57 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
             max_iter -= 1
         return init_state
 
+    def greedy_initial_state(self) -> LocalDegreePlan:
+        """
+        Generates a greedy initial state, which is close to a complete degree plan.
+
+        The semesters are filled in order, up to the maximum semester points, with the courses whose
+        prerequisites are completed in earlier semesters: first the mandatory courses and then the electives,
+        each in descending order of average grade (the grade per point of the fitness) with random noise, as
+        long as the mandatory and the elective points stay within the degree's requirements.
+
+        As in `LocalDegreePlan.possible_semesters_to_course`, a semester is only opened if the semester two
+        before it has at least the minimum semester points. A semester that is left with fewer points takes
+        courses of the semester two before it, which keeps the minimum points, as long as no prerequisite is
+        broken (see `_move_courses_forward`), and if it still has fewer points, the plan ends after the next
+        semester.
+
+        :return: An initial LocalDegreePlan instance.
+        :rtype: LocalDegreePlan
+        """
+        catalog = self.__catalog
+        rng = np.random.default_rng(random.getrandbits(64))
+        priority = 1000 * catalog.is_mandatory + catalog.avg_grades + self.__greedy_noise * rng.standard_normal(
+            catalog.avg_grades.shape)
+        plan = np.full(len(catalog), ArrayDegreePlan.NOT_TAKEN, dtype=np.int8)
+        semester_points = np.zeros(self.__max_semester_num, dtype=np.int64)
+        mandatory_points, elective_points = 0, 0
+        for semester in range(self.__max_semester_num):
+            if semester >= 2 and semester_points[semester - 2] < self.__min_semester_points:
+                break
+            parity = semester % 2
+            available = np.flatnonzero((plan < 0) & catalog.offered[:, parity] &
+                                       (catalog.earliest_semesters(plan)[:, parity] <= semester))
+            for course_id in available[np.argsort(-priority[available, parity], kind='stable')]:
+                points = int(catalog.points[course_id, parity])
+                if semester_points[semester] + points > self.__max_semester_points:
+                    continue
+                if catalog.is_mandatory[course_id, parity]:
+                    if mandatory_points + points > self.__mandatory_points:
+                        continue
+                    mandatory_points += points
+                else:
+                    if elective_points + points > self.__elective_points:
+                        continue
+                    elective_points += points
+                plan[course_id] = semester
+                semester_points[semester] += points
+            if mandatory_points + elective_points == self.__target_points:
+                break
+            if semester >= 2 and semester_points[semester] < self.__min_semester_points:
+                self._move_courses_forward(plan, semester_points, semester, priority[:, parity])
+        return ArrayDegreePlan(catalog, plan).to_local_degree_plan()
+
     def get_neighbors(self, state: LocalDegreePlan) -> list[LocalDegreePlan]:
         """
         Generates the neighboring states for the given degree plan.
@@ -102,8 +263,100 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
         self.expanded += 1
         neighbors = self._single_step_neighbors(state)
         neighbors.extend(self._double_step_neighbors(state))
-        neighbors = list(set(neighbors))
-        return neighbors
+        # the plans hash their strings, so a set would order them by PYTHONHASHSEED: keep the first occurrences
+        return list(dict.fromkeys(neighbors))
+
+    def get_random_neighbor(self, state: LocalDegreePlan) -> LocalDegreePlan:
+        """
+        Draws a single random neighbor of the given degree plan without generating the whole neighborhood.
+
+        A move type is drawn first: a single step with probability 1 / (1 + r) and a double step otherwise,
+        where r is the number of removable courses. This roughly follows the relative sizes of the two parts
+        of the neighborhood built by `get_neighbors`. The courses and the semester of the move are then drawn
+        at random, and invalid draws are rejected and redrawn. If no valid move is found, the neighbor is
+        picked from the full neighborhood.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: A random neighboring LocalDegreePlan instance, or the state itself if it has no neighbors.
+        :rtype: LocalDegreePlan
+        """
+        self.expanded += 1
+        removable_courses = state.possible_courses_to_remove()
+        max_iter = 1000
+        while max_iter > 0:
+            if random.randrange(len(removable_courses) + 1) == 0:
+                neighbor = self._random_single_step_neighbor(state, removable_courses)
+            else:
+                neighbor = self._random_double_step_neighbor(state, removable_courses)
+            if neighbor is not None:
+                return neighbor
+            max_iter -= 1
+
+        neighbors = self._single_step_neighbors(state)
+        neighbors.extend(self._double_step_neighbors(state))
+        return random.choice(neighbors) if neighbors else state
+
+    def iter_neighbors(self, state: LocalDegreePlan) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the neighbors of the given degree plan, one move at a time.
+
+        Every move operator (see OPERATORS) lazily yields its moves in a random order:
+        - add: takes a course that is not taken, in a semester it can be taken in.
+        - remove: removes a course that no other course depends on.
+        - swap_elective: removes an elective that no other course depends on and takes another elective.
+        - move: moves a course to another semester of the same type.
+        - swap_offering: moves a course to a semester of the other type, in its offering there.
+        Before each move an operator is drawn with probability proportional to its weight (see
+        `operator_weights`), among the operators that still have moves, so operators with small weights are
+        mostly reached only when the neighborhood is scanned to its end. Only the moves that are drawn are
+        built, unlike `get_neighbors`.
+
+        The neighborhood is not the one of `get_neighbors`, whose double steps remove a course and then add
+        another course or move another removable course, while here only swap_elective removes and adds in one
+        move, and only between electives. E.g. a random initial plan of cs.json at the MEDIUM load (random seed
+        1) has 14 distinct neighbors here and 30 in `get_neighbors`, so `first_improvement_hill_climbing` and
+        `hill_climbing` do not stop at the same local maxima.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: An iterator over neighboring LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        self.expanded += 1
+        operators = {'add': self._add_moves, 'remove': self._remove_moves,
+                     'swap_elective': self._swap_elective_moves, 'move': self._move_moves,
+                     'swap_offering': self._swap_offering_moves}
+        moves = {name: operators[name](state) for name, weight in self.__operator_weights.items() if weight > 0}
+        while moves:
+            name = random.choices(list(moves), weights=[self.__operator_weights[name] for name in moves])[0]
+            neighbor = next(moves[name], None)
+            if neighbor is None:
+                del moves[name]
+            else:
+                yield neighbor
+
+    def encode(self, state: LocalDegreePlan) -> bytes:
+        """
+        Encodes a degree plan as the bytes of its ArrayDegreePlan vector.
+
+        :param state: The LocalDegreePlan instance to encode.
+        :type state: LocalDegreePlan
+        :return: The compact encoding of the state.
+        :rtype: bytes
+        """
+        return ArrayDegreePlan.from_local_degree_plan(self.__catalog, state).to_bytes()
+
+    def decode(self, encoding: bytes) -> LocalDegreePlan:
+        """
+        Rebuilds a degree plan from its compact encoding (see `encode`).
+
+        :param encoding: The compact encoding of the state.
+        :type encoding: bytes
+        :return: The decoded LocalDegreePlan instance.
+        :rtype: LocalDegreePlan
+        """
+        return ArrayDegreePlan.from_bytes(self.__catalog, encoding).to_local_degree_plan()
 
     def fitness(self, state: LocalDegreePlan) -> float:
         """
@@ -122,8 +375,199 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
                        self.mandatory_points) else 0
         return avg
 
+    def fitness_upper_bound(self, state: LocalDegreePlan) -> float:
+        """
+        Returns an upper bound on the fitness of the completions of a degree plan: the plans that keep its
+        courses and add courses it did not take. The bound is the fitness of the plan's weighted grades plus the
+        best choice of the remaining mandatory and elective points from the courses it did not take, ignoring the
+        prerequisites and the semesters, and it never exceeds the bound of all plans.
+
+        The moves of the neighborhoods can also remove courses, so a search may still reach a better plan than the
+        bound of its current state, but only by dropping courses that a completion would keep.
+
+        :param state: The LocalDegreePlan instance to bound.
+        :type state: LocalDegreePlan
+        :return: An upper bound on the fitness of the completions of the state.
+        :rtype: float
+        """
+        catalog = self.__catalog
+        not_taken = np.ones(len(catalog), dtype=bool)
+        not_taken[[catalog.course_id(number) for number in state.course_semesters]] = False
+        options = catalog.offered & not_taken[:, None]
+        missing_mandatory = self.__mandatory_points - state.mandatory_points
+        missing_electives = self.__elective_points - (state.total_points - state.mandatory_points)
+        mandatory = _weighted_points_table(catalog.points, self.__weighted_grades, options & catalog.is_mandatory,
+                                           max(missing_mandatory, 0))
+        electives = _weighted_points_table(catalog.points, self.__weighted_grades, options & ~catalog.is_mandatory,
+                                           max(missing_electives, 0))
+        weighted_grades = state.avg_grade * state.total_points
+        if missing_mandatory >= 0 and missing_electives >= 0 and mandatory[-1] > -np.inf and electives[-1] > -np.inf:
+            bound = (weighted_grades + mandatory[-1] + electives[-1]) / self.__target_points + 100
+        else:
+            # no completion is valid: bound the weighted grades of completions with any points
+            bound = (weighted_grades + mandatory.max() + electives.max()) / self.__target_points
+        return min(bound, self.__fitness_upper_bound)
+
+    def is_valid(self, state: LocalDegreePlan) -> bool:
+        """
+        Checks whether a degree plan completes the degree: it has exactly the target points and all the
+        mandatory points.
+
+        :param state: The LocalDegreePlan instance to check.
+        :type state: LocalDegreePlan
+        :return: True if the plan completes the degree, False otherwise.
+        :rtype: bool
+        """
+        return state.total_points == self.__target_points and state.mandatory_points == self.__mandatory_points
+
+    def fitness_features(self, states: list[LocalDegreePlan]) -> np.ndarray:
+        """
+        Returns the features the fitness is computed from: the weighted grade sum, the total points and the
+        mandatory points of each state.
+
+        :param states: The LocalDegreePlan instances to evaluate.
+        :type states: list[LocalDegreePlan]
+        :return: An array of shape (len(states), 3) with the features of each state.
+        :rtype: np.ndarray
+        """
+        return np.array([(s.avg_grade * s.total_points, s.total_points, s.mandatory_points) for s in states],
+                        dtype=float).reshape(-1, 3)
+
+    def fitness_from_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Calculates the fitness of a batch of degree plans from their features (see `fitness_features`),
+        the same way as `fitness`.
+
+        :param features: An array of shape (n, 3) with the features of each state.
+        :type features: np.ndarray
+        :return: The fitness value of each state.
+        :rtype: np.ndarray
+        """
+        weighted_grades, total_points, mandatory_points = features.T
+        is_complete = (total_points == self.__target_points) & (mandatory_points == self.__mandatory_points)
+        return weighted_grades / self.__target_points + 100 * is_complete
+
+    def array_features(self, plans: np.ndarray) -> np.ndarray:
+        """
+        Returns the fitness features (see `fitness_features`) of a batch of plans given as ArrayDegreePlan
+        vectors.
+
+        :param plans: The plan vectors, one per row.
+        :type plans: np.ndarray
+        :return: An array of shape (len(plans), 3) with the features of each plan.
+        :rtype: np.ndarray
+        """
+        points = self.__catalog.offering_values(self.__catalog.points, plans)
+        weighted_grades = (self.__catalog.offering_values(self.__catalog.avg_grades, plans) * points).sum(axis=1)
+        mandatory_points = (self.__catalog.offering_values(self.__catalog.is_mandatory, plans) * points).sum(axis=1)
+        return np.stack([weighted_grades, points.sum(axis=1), mandatory_points], axis=1).astype(float)
+
+    def array_fitness(self, plans: np.ndarray) -> np.ndarray:
+        """
+        Calculates the fitness of a batch of plans given as ArrayDegreePlan vectors, the same way as `fitness`.
+
+        :param plans: The plan vectors, one per row.
+        :type plans: np.ndarray
+        :return: The fitness value of each plan.
+        :rtype: np.ndarray
+        """
+        return self.fitness_from_features(self.array_features(plans))
+
+    def array_is_valid(self, features: np.ndarray) -> np.ndarray:
+        """
+        Checks, for a batch of plans, whether they are valid solutions (see `is_valid`), from their fitness
+        features (see `array_features`).
+
+        :param features: An array of shape (n, 3) with the features of each plan.
+        :type features: np.ndarray
+        :return: A boolean array, True for the plans with exactly the target and the mandatory points.
+        :rtype: np.ndarray
+        """
+        return (features[:, 1] == self.__target_points) & (features[:, 2] == self.__mandatory_points)
+
+    def array_is_feasible(self, plans: np.ndarray) -> np.ndarray:
+        """
+        Checks, for a batch of plans given as ArrayDegreePlan vectors, the constraints kept by the neighborhoods
+        of the problem: every course is taken in a semester of a type it is offered in, within the allowed
+        number of semesters, the elective points do not exceed the degree's requirement, no semester has more
+        than the maximum points, and all prerequisites are met.
+
+        :param plans: The plan vectors, one per row.
+        :type plans: np.ndarray
+        :return: A boolean array, True for the plans that satisfy all the constraints.
+        :rtype: np.ndarray
+        """
+        catalog = self.__catalog
+        taken = plans >= 0
+        feasible = ~(taken & ~catalog.offering_values(catalog.offered, plans)).any(axis=1)
+        feasible &= (plans < self.__max_semester_num).all(axis=1)
+
+        points = catalog.offering_values(catalog.points, plans)
+        elective_points = np.where(catalog.offering_values(catalog.is_mandatory, plans), 0, points).sum(axis=1)
+        feasible &= elective_points <= self.__elective_points
+
+        semesters = np.clip(plans.astype(np.int64), 0, self.__max_semester_num - 1)
+        rows = np.broadcast_to(np.arange(len(plans))[:, None], plans.shape)
+        semester_points = np.bincount((rows * self.__max_semester_num + semesters).ravel(), weights=points.ravel(),
+                                      minlength=len(plans) * self.__max_semester_num)
+        feasible &= (semester_points.reshape(len(plans), -1) <= self.__max_semester_points).all(axis=1)
+
+        feasible &= ~catalog.unmet_prerequisites(plans).any(axis=1)
+        return feasible
+
     # region ########### HELPERS ###########
 
+    def __relaxed_best_fitness(self) -> float:
+        """
+        Computes the fitness bound of all plans, which caps `fitness_upper_bound`, by solving a knapsack problem for the
+        mandatory courses and another for the electives, where every course is taken in its best offering.
+
+        :return: The fitness bound.
+        :rtype: float
+        """
+        catalog = self.__catalog
+        mandatory = _weighted_points_table(catalog.points, self.__weighted_grades,
+                                           catalog.offered & catalog.is_mandatory, self.__mandatory_points)[-1]
+        electives = _weighted_points_table(catalog.points, self.__weighted_grades,
+                                           catalog.offered & ~catalog.is_mandatory, self.__elective_points)[-1]
+        if mandatory == -np.inf or electives == -np.inf:
+            # no plan is complete, and incomplete plans have fewer points than the target
+            return float(catalog.avg_grades.max(initial=0))
+        return (mandatory + electives) / self.__target_points + 100
+
+    def _move_courses_forward(self, plan: np.ndarray, semester_points: np.ndarray, semester: int,
+                              priority: np.ndarray):
+        """
+        Moves courses of the semester two before a semester (of the same type) into it, in ascending order of
+        priority, until it has the minimum semester points, as long as the earlier semester keeps the minimum
+        points, the semester does not exceed the maximum points, and no prerequisite is broken.
+
+        :param plan: The plan vector (see ArrayDegreePlan), which is changed in place.
+        :type plan: np.ndarray
+        :param semester_points: The points of every semester of the plan, which are changed in place.
+        :type semester_points: np.ndarray
+        :param semester: The semester to move courses into, at least 2.
+        :type semester: int
+        :param priority: The priority of every course in the semester's type.
+        :type priority: np.ndarray
+        """
+        catalog = self.__catalog
+        earlier = semester - 2
+        candidates = np.flatnonzero(plan == earlier)
+        for course_id in candidates[np.argsort(priority[candidates], kind='stable')]:
+            if semester_points[semester] >= self.__min_semester_points:
+                break
+            points = int(catalog.points[course_id, semester % 2])
+            if (semester_points[earlier] - points < self.__min_semester_points or
+                    semester_points[semester] + points > self.__max_semester_points):
+                continue
+            plan[course_id] = semester
+            if catalog.unmet_prerequisites(plan).any():
+                plan[course_id] = earlier
+                continue
+            semester_points[earlier] -= points
+            semester_points[semester] += points
+
     def _single_step_neighbors(self, state: LocalDegreePlan) -> list[LocalDegreePlan]:
         """
         Generates neighboring states by performing single step changes to the current state.
@@ -176,4 +620,215 @@ class LocalDegreePlanningProblem(LocalSearchProblem):
                     neighbors.extend([new_state.add_course(c2, sem) for sem in available_semesters])
         return neighbors
 
+    def _random_single_step_neighbor(self, state: LocalDegreePlan,
+                                     removable_courses: list[Course]) -> Optional[LocalDegreePlan]:
+        """
+        Draws one random single step change (adding or removing one course) of the current state.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :param removable_courses: The courses that can be removed from the state.
+        :type removable_courses: list[Course]
+        :return: The resulting LocalDegreePlan instance, or None if the drawn move is not valid.
+        :rtype: Optional[LocalDegreePlan]
+        """
+        c = random.choice(self.__degree_courses)
+        if c in removable_courses:
+            return state.remove_course(c)
+        return self._random_addition(state, c)
+
+    def _random_double_step_neighbor(self, state: LocalDegreePlan,
+                                     removable_courses: list[Course]) -> Optional[LocalDegreePlan]:
+        """
+        Draws one random double step change (removing two courses and adding one) of the current state.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :param removable_courses: The courses that can be removed from the state.
+        :type removable_courses: list[Course]
+        :return: The resulting LocalDegreePlan instance, or None if the drawn move is not valid.
+        :rtype: Optional[LocalDegreePlan]
+        """
+        c1 = random.choice(removable_courses)
+        c2 = random.choice(self.__degree_courses)
+        new_state: LocalDegreePlan = state.remove_course(c1)
+        if c2 in removable_courses and c1 != c2:
+            new_state = new_state.remove_course(c2)
+        return self._random_addition(new_state, c2)
+
+    def _random_addition(self, state: LocalDegreePlan, course: Course) -> Optional[LocalDegreePlan]:
+        """
+        Adds the given course to a random semester it can be placed in.
+
+        :param state: The LocalDegreePlan instance to add the course to.
+        :type state: LocalDegreePlan
+        :param course: The course to add.
+        :type course: Course
+        :return: The resulting LocalDegreePlan instance, or None if the course cannot be added.
+        :rtype: Optional[LocalDegreePlan]
+        """
+        if state.took_course_number(course.number):
+            return None
+        if (state.total_points - state.mandatory_points) + course.points * (
+                not course.is_mandatory) > self.__elective_points:
+            return None
+        available_semesters = state.possible_semesters_to_course(course, self.__min_semester_points,
+                                                                 self.__max_semester_points,
+                                                                 self.__max_semester_num)
+        if not available_semesters:
+            return None
+        return state.add_course(course, random.choice(available_semesters))
+
+    def _add_moves(self, state: LocalDegreePlan) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the plans with one more course, in a random order.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: An iterator over the resulting LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        for course in random.sample(self.__degree_courses, len(self.__degree_courses)):
+            if not self._fits_elective_points(state, course):
+                continue
+            semesters = state.possible_semesters_to_course(course, self.__min_semester_points,
+                                                           self.__max_semester_points, self.__max_semester_num)
+            for semester in random.sample(semesters, len(semesters)):
+                yield state.add_course(course, semester)
+
+    def _remove_moves(self, state: LocalDegreePlan) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the plans with one course removed, in a random order.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: An iterator over the resulting LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        removable_courses = state.possible_courses_to_remove()
+        for course in random.sample(removable_courses, len(removable_courses)):
+            yield state.remove_course(course)
+
+    def _swap_elective_moves(self, state: LocalDegreePlan) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the plans with one elective replaced by another elective, in a random order of the
+        removed electives.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: An iterator over the resulting LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        removable_electives = [c for c in state.possible_courses_to_remove() if not c.is_mandatory]
+        electives = [c for c in self.__degree_courses if not c.is_mandatory]
+        for removed in random.sample(removable_electives, len(removable_electives)):
+            base = state.remove_course(removed)
+            for course in random.sample(electives, len(electives)):
+                if course.number == removed.number or not self._fits_elective_points(base, course):
+                    continue
+                semesters = base.possible_semesters_to_course(course, self.__min_semester_points,
+                                                              self.__max_semester_points, self.__max_semester_num)
+                for semester in random.sample(semesters, len(semesters)):
+                    yield base.add_course(course, semester)
+
+    def _move_moves(self, state: LocalDegreePlan) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the plans with one course moved to another semester of the same type, in a random order.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: An iterator over the resulting LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        return self._relocation_moves(state, other_offering=False)
+
+    def _swap_offering_moves(self, state: LocalDegreePlan) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the plans with one course moved to a semester of the other type, in its offering there,
+        in a random order.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :return: An iterator over the resulting LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        return self._relocation_moves(state, other_offering=True)
+
+    def _relocation_moves(self, state: LocalDegreePlan, other_offering: bool) -> Iterator[LocalDegreePlan]:
+        """
+        Lazily yields the plans with one taken course moved to another semester, in a random order.
+
+        A course can always be moved to an earlier semester its own prerequisites allow, but it is only moved
+        to a later semester if no other course depends on it.
+
+        :param state: The current LocalDegreePlan instance.
+        :type state: LocalDegreePlan
+        :param other_offering: False to move courses within semesters of the same type, True to move them to
+            semesters of the other type.
+        :type other_offering: bool
+        :return: An iterator over the resulting LocalDegreePlan instances.
+        :rtype: Iterator[LocalDegreePlan]
+        """
+        course_semesters = list(state.course_semesters.items())
+        for number, semester in random.sample(course_semesters, len(course_semesters)):
+            parity = semester % 2
+            taken = self.__catalog.offering(self.__catalog.course_id(number), parity)
+            course = self.__catalog.offering(self.__catalog.course_id(number), 1 - parity if other_offering else parity)
+            if course is None:
+                continue
+            base = state.remove_course(taken)
+            if not self._fits_elective_points(base, course):
+                continue
+            semesters = [s for s in base.possible_semesters_to_course(course, self.__min_semester_points,
+                                                                      self.__max_semester_points,
+                                                                      self.__max_semester_num)
+                         if s < semester or (s > semester and state.can_remove_course(taken))]
+            for new_semester in random.sample(semesters, len(semesters)):
+                yield base.add_course(course, new_semester)
+
+    def _fits_elective_points(self, state: LocalDegreePlan, course: Course) -> bool:
+        """
+        Checks whether a course can be added to a plan without exceeding the elective points of the degree.
+
+        :param state: The LocalDegreePlan instance to add the course to.
+        :type state: LocalDegreePlan
+        :param course: The course to add.
+        :type course: Course
+        :return: True if the elective points stay within the degree's requirement, False otherwise.
+        :rtype: bool
+        """
+        return (state.total_points - state.mandatory_points) + course.points * (
+            not course.is_mandatory) <= self.__elective_points
+
     # endregion
+
+
+def _weighted_points_table(points: np.ndarray, weighted_grades: np.ndarray, options: np.ndarray,
+                           max_points: int) -> np.ndarray:
+    """
+    Solves a knapsack problem for every total points up to a maximum: finds the maximal sum of weighted grades of
+    a set of courses with exactly the total points, taking at most one offering of every course.
+
+    :param points: The points of every offering, of shape (len(catalog), 2).
+    :type points: np.ndarray
+    :param weighted_grades: The points times the average grade of every offering, of shape (len(catalog), 2).
+    :type weighted_grades: np.ndarray
+    :param options: Whether every offering can be chosen, of shape (len(catalog), 2).
+    :type options: np.ndarray
+    :param max_points: The maximal total points.
+    :type max_points: int
+    :return: The maximal sum of weighted grades for every total points from 0 to max_points, which is -inf if no
+        set of courses has exactly the total points.
+    :rtype: np.ndarray
+    """
+    best = np.full(max_points + 1, -np.inf)
+    best[0] = 0
+    for course_points, course_weighted_grades, course_options in zip(points, weighted_grades, options):
+        if not course_options.any():
+            continue
+        with_course = best.copy()
+        for p, w in zip(course_points[course_options], course_weighted_grades[course_options]):
+            if 0 < p <= max_points:
+                with_course[p:] = np.maximum(with_course[p:], best[:-p] + w)
+        best = with_course
+    return best
@@ -1,12 +1,17 @@
 import collections
+import copy
+import functools
 import math
+import multiprocessing
 import random
-from threading import Thread
-from typing import Callable, Any
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Any, Hashable, Iterable, Iterator, Optional
 from abc import ABC
-from local_search.thread_safe_set import TSS
 import numpy as np
 
+from cancellation import is_cancelled
+
 
 class LocalSearchProblem(ABC):
     """
@@ -17,6 +22,9 @@ class LocalSearchProblem(ABC):
     - get_initial_state
     - get_neighbors
     - fitness
+
+    Subclasses may also override get_random_neighbor when a single random neighbor can be drawn more
+    cheaply than the whole neighborhood.
     """
 
     def get_initial_state(self) -> Any:
@@ -36,6 +44,58 @@ class LocalSearchProblem(ABC):
         """
         pass
 
+    def get_random_neighbor(self, state: Any) -> Any:
+        """
+        For a given state, returns a single random neighboring state.
+
+        The default implementation picks uniformly from `get_neighbors`.
+
+        :param state: The current state in the search problem.
+        :type state: Any
+        :return: A random neighboring state.
+        :rtype: Any
+        """
+        return random.choice(self.get_neighbors(state))
+
+    def iter_neighbors(self, state: Any) -> Iterator[Any]:
+        """
+        For a given state, lazily yields its neighboring states in a random order, so that a search can stop
+        as soon as it finds a good enough neighbor.
+
+        The default implementation shuffles `get_neighbors`.
+
+        :param state: The current state in the search problem.
+        :type state: Any
+        :return: An iterator over the neighboring states.
+        :rtype: Iterator[Any]
+        """
+        neighbors = list(self.get_neighbors(state))
+        random.shuffle(neighbors)
+        yield from neighbors
+
+    def encode(self, state: Any) -> Hashable:
+        """
+        Returns a compact, hashable and picklable encoding of a state, used to pass states between
+        processes. The default implementation returns the state itself.
+
+        :param state: The state to encode.
+        :type state: Any
+        :return: The encoding of the state.
+        :rtype: Hashable
+        """
+        return state
+
+    def decode(self, encoding: Hashable) -> Any:
+        """
+        Returns the state described by an encoding created by `encode`.
+
+        :param encoding: The encoding of a state.
+        :type encoding: Hashable
+        :return: The decoded state.
+        :rtype: Any
+        """
+        return encoding
+
     def fitness(self, state: Any) -> float:
         """
         Returns the fitness of a given state.
@@ -47,9 +107,456 @@ class LocalSearchProblem(ABC):
         """
         pass
 
+    def fitness_features(self, states: list[Any]) -> np.ndarray:
+        """
+        Returns the features the fitness of each of the given states is computed from, one row per state.
+
+        The features are cheap to compute and to send between processes, and `fitness_from_features` turns a
+        whole batch of them into fitness values at once. The default implementation has a single feature,
+        the fitness itself.
+
+        :param states: The states to evaluate.
+        :type states: list[Any]
+        :return: A 2-D array of features with a row for each state.
+        :rtype: np.ndarray
+        """
+        return np.array([self.fitness(state) for state in states], dtype=float).reshape(-1, 1)
+
+    def fitness_from_features(self, features: np.ndarray) -> np.ndarray:
+        """
+        Returns the fitness of a batch of states from their features (see `fitness_features`).
+
+        :param features: A 2-D array of features with a row for each state.
+        :type features: np.ndarray
+        :return: The fitness value of each state.
+        :rtype: np.ndarray
+        """
+        return features[:, 0]
+
+    def batch_fitness(self, states: list[Any]) -> np.ndarray:
+        """
+        Returns the fitness of each of the given states.
+
+        :param states: The states to evaluate.
+        :type states: list[Any]
+        :return: The fitness value of each state.
+        :rtype: np.ndarray
+        """
+        return self.fitness_from_features(self.fitness_features(states))
+
+    def fitness_upper_bound(self, state: Any) -> float:
+        """
+        Returns an upper bound on the fitness of the states a search from a given state is expected to reach, e.g.
+        of the completions of a partial solution. The default implementation returns infinity, which never allows
+        a search to stop early.
+
+        :param state: The state to bound.
+        :type state: Any
+        :return: An upper bound on the fitness of the states the state leads to.
+        :rtype: float
+        """
+        return math.inf
+
+    def is_valid(self, state: Any) -> bool:
+        """
+        Returns whether a state is a valid solution of the problem. The default implementation accepts every
+        state.
+
+        :param state: The state to check.
+        :type state: Any
+        :return: True if the state is a valid solution, False otherwise.
+        :rtype: bool
+        """
+        return True
+
+
+# region Search Results
+class LocalSearchResult:
+    """
+    The result of a local search run: the best valid and the best overall states it visited, its final state,
+    and a summary of the run's trajectory.
+    """
+
+    def __init__(self, best_valid: Any, best_valid_fitness: float, best: Any, best_fitness: float, final: Any,
+                 iterations: int, evaluations: int, seconds: float, stop_reason: str,
+                 trajectory: list[tuple[int, int, float, float, float]]):
+        """
+        Initializes a new LocalSearchResult instance.
+
+        :param best_valid: The best valid state visited, or None if no valid state was visited.
+        :type best_valid: Any
+        :param best_valid_fitness: The fitness of best_valid (-inf if no valid state was visited).
+        :type best_valid_fitness: float
+        :param best: The best state visited.
+        :type best: Any
+        :param best_fitness: The fitness of best.
+        :type best_fitness: float
+        :param final: The state the search ended in.
+        :type final: Any
+        :param iterations: Number of iterations run.
+        :type iterations: int
+        :param evaluations: Number of states whose fitness was evaluated.
+        :type evaluations: int
+        :param seconds: The wall-clock duration of the run.
+        :type seconds: float
+        :param stop_reason: Why the search stopped (e.g. 'max_iter', 'max_seconds', 'cancelled' or 'converged').
+        :type stop_reason: str
+        :param trajectory: The (iteration, evaluations, seconds, best fitness, best valid fitness) points where
+            the best fitness or the best valid fitness improved.
+        :type trajectory: list[tuple[int, int, float, float, float]]
+        """
+        self.__best_valid = best_valid
+        self.__best_valid_fitness = best_valid_fitness
+        self.__best = best
+        self.__best_fitness = best_fitness
+        self.__final = final
+        self.__iterations = iterations
+        self.__evaluations = evaluations
+        self.__seconds = seconds
+        self.__stop_reason = stop_reason
+        self.__trajectory = trajectory
+
+    @property
+    def state(self) -> Any:
+        """
+        Returns the solution of the search: the best valid state visited, or the best state visited if no
+        valid state was visited.
+
+        :return: The solution state.
+        :rtype: Any
+        """
+        return self.__best_valid if self.__best_valid is not None else self.__best
+
+    @property
+    def best_valid(self) -> Any:
+        """
+        Returns the best valid state visited.
+
+        :return: The best valid state, or None if no valid state was visited.
+        :rtype: Any
+        """
+        return self.__best_valid
+
+    @property
+    def best_valid_fitness(self) -> float:
+        """
+        Returns the fitness of the best valid state visited.
+
+        :return: The fitness of the best valid state, or -inf if no valid state was visited.
+        :rtype: float
+        """
+        return self.__best_valid_fitness
+
+    @property
+    def best(self) -> Any:
+        """
+        Returns the best state visited, valid or not.
+
+        :return: The best state.
+        :rtype: Any
+        """
+        return self.__best
+
+    @property
+    def best_fitness(self) -> float:
+        """
+        Returns the fitness of the best state visited.
+
+        :return: The best fitness.
+        :rtype: float
+        """
+        return self.__best_fitness
+
+    @property
+    def final(self) -> Any:
+        """
+        Returns the state the search ended in.
+
+        :return: The final state.
+        :rtype: Any
+        """
+        return self.__final
+
+    @property
+    def iterations(self) -> int:
+        """
+        Returns the number of iterations run.
+
+        :return: The number of iterations.
+        :rtype: int
+        """
+        return self.__iterations
+
+    @property
+    def evaluations(self) -> int:
+        """
+        Returns the number of states whose fitness was evaluated.
+
+        :return: The number of evaluations.
+        :rtype: int
+        """
+        return self.__evaluations
+
+    @property
+    def seconds(self) -> float:
+        """
+        Returns the wall-clock duration of the run.
+
+        :return: The duration in seconds.
+        :rtype: float
+        """
+        return self.__seconds
+
+    @property
+    def stop_reason(self) -> str:
+        """
+        Returns why the search stopped: a budget ('max_iter', 'max_evaluations' or 'max_seconds'), 'cancelled', or
+        a reason specific to the search (e.g. 'local_maximum', 'temperature' or 'converged').
+
+        :return: The stop reason.
+        :rtype: str
+        """
+        return self.__stop_reason
+
+    @property
+    def trajectory(self) -> list[tuple[int, int, float, float, float]]:
+        """
+        Returns the points of the run where the best fitness or the best valid fitness improved, as (iteration,
+        evaluations, seconds, best fitness, best valid fitness) tuples.
+
+        :return: The improvements of the run.
+        :rtype: list[tuple[int, int, float, float, float]]
+        """
+        return self.__trajectory.copy()
+
+    def __str__(self):
+        """
+        Returns a summary of the run.
+
+        :return: A string summary of the run.
+        :rtype: str
+        """
+        return (f"Stopped by {self.__stop_reason} after {self.__iterations} iterations, {self.__evaluations} "
+                f"evaluations and {self.__seconds:.3f} seconds, with {len(self.__trajectory)} improvements. "
+                f"Best fitness: {self.__best_fitness}, best valid fitness: {self.__best_valid_fitness}")
+
+
+class SearchTracker:
+    """
+    Tracks a local search run: counts its iterations and evaluations, checks its budgets, and keeps the best
+    valid and the best overall states it visits.
+
+    The searches call `exhausted` before every iteration, `next_iteration` when they start one, `observe` with
+    the states they visit, and finally `result`.
+    """
+
+    def __init__(self, problem: LocalSearchProblem, max_iter: Optional[int] = None,
+                 max_evaluations: Optional[int] = None, max_seconds: Optional[float] = None):
+        """
+        Initializes a tracker and starts its clock.
+
+        :param problem: A LocalSearchProblem object, used to check the validity of the observed states.
+        :type problem: LocalSearchProblem
+        :param max_iter: Maximum number of iterations (default: no limit).
+        :type max_iter: Optional[int]
+        :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+        :type max_evaluations: Optional[int]
+        :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+        :type max_seconds: Optional[float]
+        """
+        self.__problem = problem
+        self.__max_iter = max_iter
+        self.__max_evaluations = max_evaluations
+        self.__max_seconds = max_seconds
+        self.__start = time.perf_counter()
+        self.__iterations = 0
+        self.__evaluations = 0
+        self.__best, self.__best_fitness = None, -math.inf
+        self.__best_valid, self.__best_valid_fitness = None, -math.inf
+        self.__trajectory: list[tuple[int, int, float, float, float]] = []
+        self.__stop_reason: Optional[str] = None
+
+    def exhausted(self) -> bool:
+        """
+        Checks the budgets of the run, and whether it was cancelled (see `cancellation`). Once a budget is
+        exhausted, it becomes the stop reason of the run.
+
+        :return: True if any budget is exhausted or the run was cancelled, False otherwise.
+        :rtype: bool
+        """
+        if self.__max_iter is not None and self.__iterations >= self.__max_iter:
+            self.stop('max_iter')
+        elif self.__max_evaluations is not None and self.__evaluations >= self.__max_evaluations:
+            self.stop('max_evaluations')
+        elif self.__max_seconds is not None and self.seconds >= self.__max_seconds:
+            self.stop('max_seconds')
+        elif is_cancelled():
+            self.stop('cancelled')
+        else:
+            return False
+        print(f"******* Reached {self.__stop_reason} ! *******\n")
+        return True
+
+    def next_iteration(self, evaluations: int = 0):
+        """
+        Counts a new iteration and the fitness evaluations it makes.
+
+        :param evaluations: Number of states whose fitness the iteration evaluates.
+        :type evaluations: int
+        """
+        self.__iterations += 1
+        self.__evaluations += evaluations
+
+    def observe(self, state: Any, fitness: float, valid: Optional[bool] = None):
+        """
+        Observes a state visited by the search, keeping it if it is the best state or the best valid state so
+        far. The state is kept as it is, so mutable states must be copied by the caller.
+
+        :param state: The visited state.
+        :type state: Any
+        :param fitness: The fitness of the state.
+        :type fitness: float
+        :param valid: Whether the state is valid (default: checked with `LocalSearchProblem.is_valid` when
+            needed).
+        :type valid: Optional[bool]
+        """
+        improved = False
+        if fitness > self.__best_fitness:
+            self.__best, self.__best_fitness, improved = state, fitness, True
+        if fitness > self.__best_valid_fitness and (self.__problem.is_valid(state) if valid is None else valid):
+            self.__best_valid, self.__best_valid_fitness, improved = state, fitness, True
+        if improved:
+            self.__trajectory.append((self.__iterations, self.__evaluations, self.seconds, self.__best_fitness,
+                                      self.__best_valid_fitness))
+
+    def observe_batch(self, states: Any, fitnesses: np.ndarray, valid: np.ndarray):
+        """
+        Observes the best state and the best valid state of a batch of states. The rows of NumPy arrays are
+        copied.
+
+        :param states: The states, e.g. a list or a 2-D array with a state vector in each row.
+        :type states: Any
+        :param fitnesses: The fitness of every state.
+        :type fitnesses: np.ndarray
+        :param valid: Whether every state is valid.
+        :type valid: np.ndarray
+        """
+        if len(fitnesses) == 0:
+            return
+        copy = isinstance(states, np.ndarray)
+        best = int(np.argmax(fitnesses))
+        if fitnesses[best] > self.__best_fitness:
+            self.observe(states[best].copy() if copy else states[best], float(fitnesses[best]), bool(valid[best]))
+        if valid.any():
+            best_valid = int(np.flatnonzero(valid)[np.argmax(fitnesses[valid])])
+            if fitnesses[best_valid] > self.__best_valid_fitness:
+                self.observe(states[best_valid].copy() if copy else states[best_valid], float(fitnesses[best_valid]),
+                             True)
+
+    def stop(self, reason: str):
+        """
+        Sets the reason the search stopped, if it is not set yet.
+
+        :param reason: The stop reason (see `LocalSearchResult.stop_reason`).
+        :type reason: str
+        """
+        if self.__stop_reason is None:
+            self.__stop_reason = reason
+
+    def result(self, final: Any, decode: Optional[Callable[[Any], Any]] = None) -> LocalSearchResult:
+        """
+        Summarizes the run.
+
+        :param final: The state the search ended in.
+        :type final: Any
+        :param decode: A function that converts the observed states to the states of the result (default: keep
+            them as they are).
+        :type decode: Optional[Callable[[Any], Any]]
+        :return: The result of the run.
+        :rtype: LocalSearchResult
+        """
+
+        def convert(state: Any) -> Any:
+            return state if decode is None or state is None else decode(state)
+
+        return LocalSearchResult(convert(self.__best_valid), self.__best_valid_fitness, convert(self.__best),
+                                 self.__best_fitness, convert(final), self.__iterations, self.__evaluations,
+                                 self.seconds, self.__stop_reason or 'completed', self.__trajectory)
+
+    @property
+    def iterations(self) -> int:
+        """
+        Returns the number of iterations counted so far.
+
+        :return: The number of iterations.
+        :rtype: int
+        """
+        return self.__iterations
+
+    @property
+    def evaluations(self) -> int:
+        """
+        Returns the number of fitness evaluations counted so far.
+
+        :return: The number of evaluations.
+        :rtype: int
+        """
+        return self.__evaluations
+
+    @property
+    def seconds(self) -> float:
+        """
+        Returns the wall-clock time since the tracker was created.
+
+        :return: The elapsed time in seconds.
+        :rtype: float
+        """
+        return time.perf_counter() - self.__start
+
+    @property
+    def best_fitness(self) -> float:
+        """
+        Returns the fitness of the best state observed so far.
+
+        :return: The best fitness, or -inf if no state was observed.
+        :rtype: float
+        """
+        return self.__best_fitness
+
+    @property
+    def best_valid_fitness(self) -> float:
+        """
+        Returns the fitness of the best valid state observed so far.
+
+        :return: The best valid fitness, or -inf if no valid state was observed.
+        :rtype: float
+        """
+        return self.__best_valid_fitness
+
+
+# endregion
+
+# region Worker Processes
+_worker_problem: Optional[LocalSearchProblem] = None
+
+
+def _init_worker(problem: LocalSearchProblem):
+    """
+    Initializes a worker process of a process pool with its own copy of the problem (and of its course
+    catalog).
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    """
+    global _worker_problem
+    _worker_problem = problem
+
+
+# endregion
 
 # region Hill Climbing
-def hill_climbing(problem: LocalSearchProblem, max_iter=10 ** 5):
+def hill_climbing(problem: LocalSearchProblem, max_iter=10 ** 5, max_evaluations: Optional[int] = None,
+                  max_seconds: Optional[float] = None) -> LocalSearchResult:
     """
     Implements the Hill Climbing algorithm.
 
@@ -57,54 +564,353 @@ def hill_climbing(problem: LocalSearchProblem, max_iter=10 ** 5):
     :type problem: LocalSearchProblem
     :param max_iter: Maximum number of iterations.
     :type max_iter: int
-    :return: A state that is a local maximum.
-    :rtype: Any
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is a local maximum unless a budget ran out.
+    :rtype: LocalSearchResult
     """
-    current = problem.get_initial_state()
-    for _ in range(max_iter):
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    current, _ = _climb(problem, problem.get_initial_state(), tracker)
+    return tracker.result(current)
+
+
+def _climb(problem: LocalSearchProblem, current: Any, tracker: SearchTracker,
+           abandon: Optional[Callable[[Any], bool]] = None) -> tuple[Any, bool]:
+    """
+    Climbs from a state to a local maximum, moving to a random best neighbor on every iteration.
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param current: The state to start from.
+    :type current: Any
+    :param tracker: The tracker of the run, which also holds its budgets.
+    :type tracker: SearchTracker
+    :param abandon: A function that is called with the current state on every iteration, and returns True to
+        stop climbing (default: never stop).
+    :type abandon: Optional[Callable[[Any], bool]]
+    :return: The last state, and whether the climb was abandoned.
+    :rtype: tuple[Any, bool]
+    """
+    current_fitness = problem.fitness(current)
+    tracker.observe(current, current_fitness)
+    while not tracker.exhausted():
+        if abandon is not None and abandon(current):
+            tracker.stop('abandoned')
+            return current, True
         neighbors = problem.get_neighbors(current)
-        best_neighbor_val = problem.fitness(max(neighbors, key=problem.fitness))
-        best_neighbors = [n for n in neighbors if problem.fitness(n) == best_neighbor_val]
-        if best_neighbor_val <= problem.fitness(current):
-            return current
-        current = random.choice(best_neighbors)
+        tracker.next_iteration(len(neighbors))
+        fitnesses = [problem.fitness(n) for n in neighbors]
+        best_neighbor_val = max(fitnesses)
+        if best_neighbor_val <= current_fitness:
+            tracker.stop('local_maximum')
+            return current, False
+        current = random.choice([n for n, fitness in zip(neighbors, fitnesses) if fitness == best_neighbor_val])
+        current_fitness = best_neighbor_val
+        tracker.observe(current, current_fitness)
+    return current, False
+
+
+def first_improvement_hill_climbing(problem: LocalSearchProblem, max_iter=10 ** 5,
+                                    max_evaluations: Optional[int] = None,
+                                    max_seconds: Optional[float] = None) -> LocalSearchResult:
+    """
+    Implements First-Improvement Hill Climbing: on every iteration the neighbors are drawn lazily from
+    `LocalSearchProblem.iter_neighbors`, and the search moves to the first neighbor that is better than the
+    current state, so that most iterations only evaluate a small part of the neighborhood. Only the last
+    iteration, which finds that the current state is a local maximum, evaluates the whole neighborhood.
+    `iter_neighbors` may yield a different neighborhood than `get_neighbors` (as the one of
+    LocalDegreePlanningProblem does), and then the local maxima differ from those of `hill_climbing`.
 
-    print("******* Reached max_iterations ! *******\n")
-    return current
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param max_iter: Maximum number of iterations.
+    :type max_iter: int
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is a local maximum unless a budget ran out.
+    :rtype: LocalSearchResult
+    """
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    current = problem.get_initial_state()
+    current_fitness = problem.fitness(current)
+    tracker.observe(current, current_fitness)
+    while not tracker.exhausted():
+        evaluations = 0
+        improvement = None
+        for neighbor in problem.iter_neighbors(current):
+            evaluations += 1
+            fitness = problem.fitness(neighbor)
+            if fitness > current_fitness:
+                improvement = neighbor, fitness
+                break
+        tracker.next_iteration(evaluations)
+        if improvement is None:
+            tracker.stop('local_maximum')
+            break
+        current, current_fitness = improvement
+        tracker.observe(current, current_fitness)
+    return tracker.result(current)
+
+
+# endregion
+
+# region Random Restart Hill Climbing
+_worker_best_fitness = None
+
+
+class RestartStatistics:
+    """
+    Statistics of the restarts of a random restart Hill Climbing run.
+    """
+
+    def __init__(self, restarts: int, abandoned: int, fitnesses: list[float], valid: int, expanded: list[int]):
+        """
+        Initializes a new RestartStatistics instance.
+
+        :param restarts: Number of restarts.
+        :type restarts: int
+        :param abandoned: Number of restarts abandoned before reaching a local maximum.
+        :type abandoned: int
+        :param fitnesses: The fitness of the final state of every restart.
+        :type fitnesses: list[float]
+        :param valid: Number of restarts that ended in a valid state.
+        :type valid: int
+        :param expanded: The number of expansions of every restart.
+        :type expanded: list[int]
+        """
+        self.__restarts = restarts
+        self.__abandoned = abandoned
+        self.__fitnesses = fitnesses
+        self.__valid = valid
+        self.__expanded = expanded
+
+    @property
+    def restarts(self) -> int:
+        """
+        Returns the number of restarts.
+
+        :return: The number of restarts.
+        :rtype: int
+        """
+        return self.__restarts
+
+    @property
+    def abandoned(self) -> int:
+        """
+        Returns the number of restarts abandoned because they could not beat the best fitness found.
+
+        :return: The number of abandoned restarts.
+        :rtype: int
+        """
+        return self.__abandoned
+
+    @property
+    def fitnesses(self) -> list[float]:
+        """
+        Returns the fitness of the final state of every restart, in the order the restarts were started.
+
+        :return: The fitness of every restart.
+        :rtype: list[float]
+        """
+        return self.__fitnesses.copy()
+
+    @property
+    def valid(self) -> int:
+        """
+        Returns the number of restarts that ended in a valid state.
+
+        :return: The number of valid restarts.
+        :rtype: int
+        """
+        return self.__valid
+
+    @property
+    def expanded(self) -> list[int]:
+        """
+        Returns the number of expansions of every restart, in the order the restarts were started.
+
+        :return: The expansions of every restart.
+        :rtype: list[int]
+        """
+        return self.__expanded.copy()
+
+    def __str__(self):
+        """
+        Returns a string representation of the statistics.
+
+        :return: A summary of the restarts.
+        :rtype: str
+        """
+        return (f"Restarts: {self.__restarts}, abandoned: {self.__abandoned}, valid: {self.__valid}, "
+                f"best fitness: {max(self.__fitnesses, default=-math.inf)}, "
+                f"average expanded: {sum(self.__expanded) / max(self.__restarts, 1)}")
+
+
+def _init_restart_worker(problem: LocalSearchProblem, best_fitness):
+    """
+    Initializes a worker process of random restart Hill Climbing with its own copy of the problem and the
+    shared best fitness.
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param best_fitness: The best fitness of a valid state found by any worker, in shared memory.
+    :type best_fitness: multiprocessing.Value
+    """
+    global _worker_best_fitness
+    _init_worker(problem)
+    _worker_best_fitness = best_fitness
+
+
+def _restart_run(seed: int, max_iter: int, max_evaluations: Optional[int],
+                 deadline: Optional[float]) -> tuple[Hashable, float, bool, bool, int, int]:
+    """
+    Runs one restart of Hill Climbing from a random initial state, in a worker process. The restart is
+    abandoned once the fitness upper bound of its state is not better than the shared best fitness, and a
+    valid final state that improves the shared best fitness updates it.
+
+    :param seed: Seed for the worker's random generator, so that restarts do not share random streams.
+    :type seed: int
+    :param max_iter: Maximum number of iterations.
+    :type max_iter: int
+    :param max_evaluations: Maximum number of fitness evaluations.
+    :type max_evaluations: Optional[int]
+    :param deadline: The time (see `time.time`) at which the whole run must stop, or None.
+    :type deadline: Optional[float]
+    :return: The encoding and the fitness of the final state, whether it is valid, whether the restart was
+        abandoned, and the numbers of expansions and of evaluations.
+    :rtype: tuple[Hashable, float, bool, bool, int, int]
+    """
+    random.seed(seed)
+    problem, best_fitness = _worker_problem, _worker_best_fitness
+    expanded_before = problem.expanded
+    tracker = SearchTracker(problem, max_iter, max_evaluations, None if deadline is None else deadline - time.time())
+    current, abandoned = _climb(problem, problem.get_initial_state(), tracker,
+                                lambda state: problem.fitness_upper_bound(state) <= best_fitness.value + 1e-9)
+    fitness, valid = problem.fitness(current), problem.is_valid(current)
+    if valid:
+        with best_fitness.get_lock():
+            best_fitness.value = max(best_fitness.value, fitness)
+    return (problem.encode(current), fitness, valid, abandoned, problem.expanded - expanded_before,
+            tracker.evaluations)
+
+
+def random_restart_hill_climbing(problem: LocalSearchProblem, restarts: int = 32, max_iter=10 ** 5,
+                                 max_evaluations: Optional[int] = None, max_seconds: Optional[float] = None,
+                                 processes: Optional[int] = None) -> tuple[LocalSearchResult, RestartStatistics]:
+    """
+    Implements random restart Hill Climbing, running the restarts on a pool of worker processes.
+
+    The best fitness of a valid state found so far is shared between the workers in shared memory, and a
+    restart is abandoned as soon as the problem's fitness upper bound of its state (see
+    `LocalSearchProblem.fitness_upper_bound`) does not beat it. The restarts are collected in the order they
+    were started, so ties are broken the same way in every run, but which restarts are abandoned depends on the
+    timing of the workers.
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param restarts: Number of restarts.
+    :type restarts: int
+    :param max_iter: Maximum number of iterations of every restart.
+    :type max_iter: int
+    :param max_evaluations: Maximum number of fitness evaluations of every restart (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration of the whole run in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :param processes: Number of worker processes (default: the number of CPUs).
+    :type processes: Optional[int]
+    :return: The result of the run, where every restart counts as an iteration and its final state as a
+        visited state, and the statistics of the restarts.
+    :rtype: tuple[LocalSearchResult, RestartStatistics]
+    """
+    tracker = SearchTracker(problem)
+    deadline = None if max_seconds is None else time.time() + max_seconds
+    best_fitness = multiprocessing.Value('d', -math.inf)
+    final = None
+    abandoned, valid, fitnesses, expanded = 0, 0, [], []
+    with multiprocessing.Pool(processes, initializer=_init_restart_worker, initargs=(problem, best_fitness)) as pool:
+        runs = pool.imap(functools.partial(_restart_run, max_iter=max_iter, max_evaluations=max_evaluations,
+                                           deadline=deadline), [random.getrandbits(64) for _ in range(restarts)])
+        for encoding, fitness, is_valid, is_abandoned, run_expanded, run_evaluations in runs:
+            problem.expanded += run_expanded
+            tracker.next_iteration(run_evaluations)
+            final = problem.decode(encoding)
+            tracker.observe(final, fitness, is_valid)
+            abandoned += is_abandoned
+            valid += is_valid
+            fitnesses.append(fitness)
+            expanded.append(run_expanded)
+    if deadline is not None and time.time() >= deadline:
+        tracker.stop('max_seconds')
+    return tracker.result(final), RestartStatistics(restarts, abandoned, fitnesses, valid, expanded)
 
 
 # endregion
 
 # region Simulated Annealing
 def simulated_annealing(problem: LocalSearchProblem, schedule: Callable[[int], float], max_iter=10 ** 5,
-                        eps=1e-25):
+                        eps=1e-25, max_evaluations: Optional[int] = None,
+                        max_seconds: Optional[float] = None) -> LocalSearchResult:
     """
     Implements the Simulated Annealing algorithm.
 
     :param problem: A LocalSearchProblem object.
     :type problem: LocalSearchProblem
-    :param schedule: A function that computes the temperature based on the current iteration.
+    :param schedule: A function that computes the temperature based on the current iteration. If it has a
+        `feedback` method (see `AdaptiveSchedule`), the method is called after every move with the fitness
+        change of the move and whether it was accepted.
     :type schedule: Callable[[int], float]
     :param max_iter: Maximum number of iterations.
     :type max_iter: int
     :param eps: A small value to determine when to stop the algorithm.
     :type eps: float
-    :return: A state that is a local maximum.
-    :rtype: Any
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is the best valid state visited (or the best state visited, if
+        no valid state was visited).
+    :rtype: LocalSearchResult
     """
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    feedback = getattr(schedule, 'feedback', None)
     current = problem.get_initial_state()
-    for t in range(max_iter):
-        T = schedule(t)
+    current_fitness = problem.fitness(current)
+    tracker.observe(current, current_fitness)
+    while not tracker.exhausted():
+        T = schedule(tracker.iterations)
         if T < eps:
-            return current
-        neighbor = random.choice(problem.get_neighbors(current))
-        delta = problem.fitness(neighbor) - problem.fitness(current)
-        if delta > 0:
-            current = neighbor
-        elif random.random() < math.e ** (delta / T):
-            current = neighbor
-    print("******* Reached max_iterations ! *******\n")
-    return current
+            tracker.stop('temperature')
+            break
+        tracker.next_iteration(1)
+        neighbor = problem.get_random_neighbor(current)
+        neighbor_fitness = problem.fitness(neighbor)
+        delta = neighbor_fitness - current_fitness
+        accepted = accept_move(delta, T)
+        if feedback is not None:
+            feedback(delta, accepted)
+        if accepted:
+            current, current_fitness = neighbor, neighbor_fitness
+            tracker.observe(current, current_fitness)
+    return tracker.result(current)
+
+
+def accept_move(delta: float, T: float) -> bool:
+    """
+    Decides whether to move to a neighbor (the Metropolis criterion): improving moves are always accepted, and
+    other moves with probability e^(delta / T).
+
+    :param delta: The fitness of the neighbor minus the fitness of the current state.
+    :type delta: float
+    :param T: The current temperature.
+    :type T: float
+    :return: True if the move is accepted, False otherwise.
+    :rtype: bool
+    """
+    return delta > 0 or random.random() < math.e ** (delta / T)
 
 
 def exp_cool_schedule(t: int, T0=100000, alpha=0.95) -> float:
@@ -155,27 +961,339 @@ def log_cool_schedule(t: int, T0=100, beta=5) -> float:
     return T0 / (1 + beta * math.log(1 + t))
 
 
+class AdaptiveSchedule:
+    """
+    An adaptive cooling schedule for simulated annealing, that sets the temperature from the acceptance ratio
+    of the recent moves instead of from the iteration number.
+
+    Every `window` worsening moves, the temperature is raised if fewer of them were accepted than the target
+    ratio, and lowered otherwise. The target ratio decreases geometrically from initial_ratio to final_ratio
+    over `horizon` moves, so the search explores first and then settles. The temperature never exceeds max_T.
+
+    When the best fitness has not improved for `patience` moves, the schedule reheats: the target ratio goes
+    back half the way (on a log scale) to initial_ratio. After max_reheats reheats, the next stagnation
+    freezes the schedule, and it returns 0, which stops `simulated_annealing`.
+
+    The schedule holds the state of one run, so a new schedule is needed for every run.
+    """
+
+    def __init__(self, T0: float = 1.0, initial_ratio: float = 0.5, final_ratio: float = 0.001,
+                 horizon: int = 1000, window: int = 20, adjust: float = 0.2, patience: int = 500,
+                 max_reheats: int = 2, max_T: float = 3.0):
+        """
+        Initializes a new adaptive schedule.
+
+        :param T0: Initial temperature.
+        :type T0: float
+        :param initial_ratio: The target ratio of accepted worsening moves at the start of the run.
+        :type initial_ratio: float
+        :param final_ratio: The target ratio of accepted worsening moves at the end of the run.
+        :type final_ratio: float
+        :param horizon: Number of moves over which the target ratio decreases.
+        :type horizon: int
+        :param window: Number of worsening moves between temperature adjustments.
+        :type window: int
+        :param adjust: The relative change of the temperature in every adjustment.
+        :type adjust: float
+        :param patience: Number of moves without improvement of the best fitness before reheating.
+        :type patience: int
+        :param max_reheats: Number of reheats before the schedule freezes.
+        :type max_reheats: int
+        :param max_T: Maximum temperature. Worsening moves that are too large to ever be accepted (such as
+            breaking a complete degree plan) would otherwise keep raising the temperature.
+        :type max_T: float
+        """
+        self.__T = T0
+        self.__initial_ratio = initial_ratio
+        self.__final_ratio = final_ratio
+        self.__horizon = horizon
+        self.__window = window
+        self.__adjust = adjust
+        self.__patience = patience
+        self.__max_reheats = max_reheats
+        self.__max_T = max_T
+        self.__progress = 0.0
+        self.__worsening, self.__accepted = 0, 0
+        self.__fitness, self.__best_fitness = 0.0, 0.0
+        self.__moves_without_improvement = 0
+        self.__reheats = 0
+        self.__frozen = False
+
+    def __call__(self, t: int) -> float:
+        """
+        Returns the current temperature. The iteration number is not used.
+
+        :param t: Current iteration.
+        :type t: int
+        :return: The current temperature, or 0 once the schedule is frozen.
+        :rtype: float
+        """
+        return 0.0 if self.__frozen else self.__T
+
+    def feedback(self, delta: float, accepted: bool):
+        """
+        Updates the schedule with the outcome of a move.
+
+        :param delta: The fitness of the neighbor minus the fitness of the current state.
+        :type delta: float
+        :param accepted: Whether the move was accepted.
+        :type accepted: bool
+        """
+        self.__progress = min(1.0, self.__progress + 1 / self.__horizon)
+        if accepted:
+            self.__fitness += delta
+        if self.__fitness > self.__best_fitness + 1e-9:
+            self.__best_fitness, self.__moves_without_improvement = self.__fitness, 0
+        else:
+            self.__moves_without_improvement += 1
+            if self.__moves_without_improvement >= self.__patience:
+                self.__reheat()
+
+        if delta < 0:
+            self.__worsening += 1
+            self.__accepted += accepted
+            if self.__worsening == self.__window:
+                if self.__accepted / self.__window > self.target_ratio:
+                    self.__T *= 1 - self.__adjust
+                else:
+                    self.__T = min(self.__T * (1 + self.__adjust), self.__max_T)
+                self.__worsening, self.__accepted = 0, 0
+
+    def __reheat(self):
+        """
+        Reheats the schedule after stagnation, or freezes it if it was already reheated max_reheats times.
+        """
+        if self.__reheats == self.__max_reheats:
+            self.__frozen = True
+            return
+        self.__reheats += 1
+        self.__progress /= 2
+        self.__moves_without_improvement = 0
+
+    @property
+    def target_ratio(self) -> float:
+        """
+        Returns the current target ratio of accepted worsening moves.
+
+        :return: The target ratio.
+        :rtype: float
+        """
+        return self.__initial_ratio * (self.__final_ratio / self.__initial_ratio) ** self.__progress
+
+    @property
+    def reheats(self) -> int:
+        """
+        Returns the number of reheats so far.
+
+        :return: The number of reheats.
+        :rtype: int
+        """
+        return self.__reheats
+
+
+# endregion
+
+# region Parallel Tempering
+def _tempering_run(encoding: Hashable, T: float, steps: int, seed: int) -> (
+        tuple)[Hashable, float, Hashable, float, Optional[Hashable], float, int]:
+    """
+    Advances one replica by the given number of Metropolis steps at a fixed temperature, in a worker process.
+
+    :param encoding: The encoding of the replica's current state.
+    :type encoding: Hashable
+    :param T: The temperature of the replica.
+    :type T: float
+    :param steps: Number of steps to run.
+    :type steps: int
+    :param seed: Seed for the worker's random generator, so that replicas do not share random streams.
+    :type seed: int
+    :return: The encoding and fitness of the replica's state after the steps, the encoding and fitness of the
+        best state it visited, the encoding and fitness of the best valid state it visited, including its initial
+        state (None and -inf if none), and the number of expansions.
+    :rtype: tuple[Hashable, float, Hashable, float, Optional[Hashable], float, int]
+    """
+    random.seed(seed)
+    problem = _worker_problem
+    expanded_before = problem.expanded
+    current = problem.decode(encoding)
+    current_fitness = problem.fitness(current)
+    best, best_fitness = current, current_fitness
+    best_valid, best_valid_fitness = (current, current_fitness) if problem.is_valid(current) else (None, -math.inf)
+    for _ in range(steps):
+        neighbor = problem.get_random_neighbor(current)
+        neighbor_fitness = problem.fitness(neighbor)
+        if accept_move(neighbor_fitness - current_fitness, T):
+            current, current_fitness = neighbor, neighbor_fitness
+            if current_fitness > best_fitness:
+                best, best_fitness = current, current_fitness
+            if current_fitness > best_valid_fitness and problem.is_valid(current):
+                best_valid, best_valid_fitness = current, current_fitness
+    best_valid_encoding = problem.encode(best_valid) if best_valid is not None else None
+    return (problem.encode(current), current_fitness, problem.encode(best), best_fitness, best_valid_encoding,
+            best_valid_fitness, problem.expanded - expanded_before)
+
+
+def parallel_tempering(problem: LocalSearchProblem, temperatures: Optional[list[float]] = None,
+                       exchange_interval: int = 100, max_exchanges: int = 100, processes: Optional[int] = None,
+                       max_evaluations: Optional[int] = None, max_seconds: Optional[float] = None) -> LocalSearchResult:
+    """
+    Implements Parallel Tempering (replica exchange) Simulated Annealing on a pool of worker processes.
+
+    One replica (chain) runs at each temperature, in a worker process. Every exchange_interval steps, the
+    states of neighboring temperatures are swapped with probability min(1, e^((f_j - f_i) * (1/T_i - 1/T_j))),
+    so good states found at high temperatures move down to the colder replicas.
+
+    Every exchange round counts as an iteration, and the budgets are checked between rounds.
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param temperatures: The temperature of each replica (default: 8 temperatures from 0.05 to 50 on a
+        geometric scale).
+    :type temperatures: Optional[list[float]]
+    :param exchange_interval: Number of steps every replica runs between exchanges.
+    :type exchange_interval: int
+    :param max_exchanges: Number of exchange rounds.
+    :type max_exchanges: int
+    :param processes: Number of worker processes (default: the number of CPUs).
+    :type processes: Optional[int]
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is the best valid state visited by any replica (or the best
+        state visited, if no valid state was visited).
+    :rtype: LocalSearchResult
+    """
+    if temperatures is None:
+        temperatures = list(np.geomspace(0.05, 50, 8))
+    temperatures = sorted(temperatures)
+    tracker = SearchTracker(problem, max_exchanges, max_evaluations, max_seconds)
+    replicas = [problem.encode(problem.get_initial_state()) for _ in temperatures]
+    fitnesses = [problem.fitness(problem.decode(replica)) for replica in replicas]
+    for replica, fitness in zip(replicas, fitnesses):
+        tracker.observe(replica, fitness, problem.is_valid(problem.decode(replica)))
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(problem,)) as pool:
+        while not tracker.exhausted():
+            tracker.next_iteration(exchange_interval * len(temperatures))
+            runs = pool.starmap(_tempering_run, [(replica, T, exchange_interval, random.getrandbits(64))
+                                                 for replica, T in zip(replicas, temperatures)])
+            for i, (replica, fitness, best, best_fitness, valid, valid_fitness, expanded) in enumerate(runs):
+                replicas[i], fitnesses[i] = replica, fitness
+                problem.expanded += expanded
+                tracker.observe(best, best_fitness, best == valid)
+                if valid is not None:
+                    tracker.observe(valid, valid_fitness, True)
+            # swap neighboring temperatures, alternating between even and odd pairs
+            for i in range(tracker.iterations % 2, len(temperatures) - 1, 2):
+                log_ratio = (fitnesses[i + 1] - fitnesses[i]) * (1 / temperatures[i] - 1 / temperatures[i + 1])
+                if log_ratio >= 0 or random.random() < math.exp(log_ratio):
+                    replicas[i], replicas[i + 1] = replicas[i + 1], replicas[i]
+                    fitnesses[i], fitnesses[i + 1] = fitnesses[i + 1], fitnesses[i]
+    return tracker.result(replicas[int(np.argmax(fitnesses))], problem.decode)
+
+
 # endregion
 
 # region Stochastic Beam Search - specific to DegreePlanningProblem
-def single_beam_search(problem: LocalSearchProblem, state, all_neighbors: TSS):
+def _single_beam_search_in_worker(encoding: Hashable) -> tuple[list[Hashable], np.ndarray]:
+    """
+    Runs `single_beam_search` in a worker process, using the worker's copy of the problem.
+
+    :param encoding: The encoding of the state to expand.
+    :type encoding: Hashable
+    :return: The encodings of the state's neighbors and their fitness features.
+    :rtype: tuple[list[Hashable], np.ndarray]
+    """
+    return single_beam_search(_worker_problem, encoding)
+
+
+def single_beam_search(problem: LocalSearchProblem, encoding: Hashable) -> tuple[list[Hashable], np.ndarray]:
+    """
+    Expands a single beam member into a local collection of its neighbors.
+
+    Each worker (thread or process) builds its own collection, so no locking is needed; the partial results
+    are combined once per iteration by `merge_neighbors`.
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param encoding: The encoding of the state to expand (see `LocalSearchProblem.encode`).
+    :type encoding: Hashable
+    :return: The encodings of the state's neighbors and their fitness features (see
+        `LocalSearchProblem.fitness_features`), row by row.
+    :rtype: tuple[list[Hashable], np.ndarray]
+    """
+    neighbors = problem.get_neighbors(problem.decode(encoding))
+    return [problem.encode(neighbor) for neighbor in neighbors], problem.fitness_features(neighbors)
+
+
+def merge_neighbors(partial_neighbors: Iterable[tuple[list[Hashable], np.ndarray]]) -> (
+        tuple)[list[Hashable], np.ndarray]:
+    """
+    Merges the neighbors collected by the workers, removing duplicates.
+
+    :param partial_neighbors: The neighbors collected by each worker, with their fitness features.
+    :type partial_neighbors: Iterable[tuple[list[Hashable], np.ndarray]]
+    :return: All the distinct neighbors and their fitness features, row by row.
+    :rtype: tuple[list[Hashable], np.ndarray]
+    """
+    first_index: dict[Hashable, int] = {}
+    all_features = []
+    for encodings, features in partial_neighbors:
+        offset = sum(len(f) for f in all_features)
+        for i, encoding in enumerate(encodings):
+            first_index.setdefault(encoding, offset + i)
+        all_features.append(features)
+    if not first_index:
+        return [], np.empty((0, 0))
+    rows = np.fromiter(first_index.values(), dtype=np.intp, count=len(first_index))
+    return list(first_index.keys()), np.concatenate(all_features)[rows]
+
+
+def stochastic_beam_search(problem: LocalSearchProblem, k: int = 50, T: float = 1, max_iter=10 ** 5,
+                           threads: Optional[int] = None, max_evaluations: Optional[int] = None,
+                           max_seconds: Optional[float] = None) -> LocalSearchResult:
     """
-    Adds neighbors of the given state to a thread-safe set.
+    Implements the Stochastic Beam Search algorithm, expanding the beam members on a pool of threads.
 
     :param problem: A LocalSearchProblem object.
     :type problem: LocalSearchProblem
-    :param state: The state to generate neighbors for.
-    :type state: Any
-    :param all_neighbors: Thread-safe set to collect neighbors.
-    :type all_neighbors: TSS
+    :param k: Number of initial states and number of neighbors to sample.
+    :type k: int
+    :param T: Temperature parameter for softmax sampling.
+    :type T: float
+    :param max_iter: Maximum number of iterations.
+    :type max_iter: int
+    :param threads: Number of worker threads (default: one per beam member).
+    :type threads: Optional[int]
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run (see `_beam_search`).
+    :rtype: LocalSearchResult
     """
-    for neighbor in problem.get_neighbors(state):
-        all_neighbors.add(neighbor)
+
+    def expand(beam: list[Hashable]) -> Iterable[tuple[list[Hashable], np.ndarray]]:
+        # `expanded += 1` is not atomic across threads, so the workers expand a copy of the problem and the
+        # expansions are counted here, once per iteration
+        problem.expanded += len(beam)
+        return executor.map(functools.partial(single_beam_search, copy.copy(problem)), beam)
+
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    with ThreadPoolExecutor(threads or k) as executor:
+        return _beam_search(problem, k, T, tracker, expand)
 
 
-def stochastic_beam_search(problem: LocalSearchProblem, k: int = 50, T: float = 1, max_iter=10 ** 5):
+def process_stochastic_beam_search(problem: LocalSearchProblem, k: int = 50, T: float = 1, max_iter=10 ** 5,
+                                   processes: Optional[int] = None, max_evaluations: Optional[int] = None,
+                                   max_seconds: Optional[float] = None) -> LocalSearchResult:
     """
-    Implements the Stochastic Beam Search algorithm.
+    Implements the Stochastic Beam Search algorithm on a persistent pool of worker processes.
+
+    Every worker gets its own copy of the problem once, when the pool starts. On each iteration the beam
+    members are sent to the workers as encodings (see `LocalSearchProblem.encode`), and the workers send back
+    the encodings of their neighbors together with their fitness features, so only the best states are ever
+    decoded.
 
     :param problem: A LocalSearchProblem object.
     :type problem: LocalSearchProblem
@@ -185,52 +1303,95 @@ def stochastic_beam_search(problem: LocalSearchProblem, k: int = 50, T: float =
     :type T: float
     :param max_iter: Maximum number of iterations.
     :type max_iter: int
-    :return: The best state found after max_iter iterations.
-    :rtype: Any
-    """
-    init_states = {problem.get_initial_state() for _ in range(k)}
-    best_state = max(init_states, key=problem.fitness)
-    all_neighbors: TSS = TSS()
-    # first iteration
-    threads = create_threads(problem, init_states, all_neighbors)
+    :param processes: Number of worker processes (default: the number of CPUs).
+    :type processes: Optional[int]
+    :param max_evaluations: Maximum number of fitness evaluations (default: no limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run (see `_beam_search`).
+    :rtype: LocalSearchResult
+    """
+
+    def expand(beam: list[Hashable]) -> Iterable[tuple[list[Hashable], np.ndarray]]:
+        # the workers count expansions on their own copies of the problem
+        problem.expanded += len(beam)
+        return pool.map(_single_beam_search_in_worker, beam)
+
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    with multiprocessing.Pool(processes, initializer=_init_worker, initargs=(problem,)) as pool:
+        return _beam_search(problem, k, T, tracker, expand)
+
+
+def _beam_search(problem: LocalSearchProblem, k: int, T: float, tracker: SearchTracker,
+                 expand: Callable[[list[Hashable]], Iterable[tuple[list[Hashable], np.ndarray]]]) -> LocalSearchResult:
+    """
+    The Stochastic Beam Search loop, shared by the thread and process variants.
+
+    The fitness of the whole neighborhood is computed once per iteration as a vector, and is reused for
+    sampling, for picking the best state and for the stop condition. The best neighbor of every iteration is
+    observed by the tracker, and the final state is the best state of the last beam.
+
+    :param problem: A LocalSearchProblem object.
+    :type problem: LocalSearchProblem
+    :param k: Number of initial states and number of neighbors to sample.
+    :type k: int
+    :param T: Temperature parameter for softmax sampling.
+    :type T: float
+    :param tracker: The tracker of the run, which also holds its budgets.
+    :type tracker: SearchTracker
+    :param expand: Runs `single_beam_search` on every encoded beam member and returns the partial results.
+    :type expand: Callable[[list[Hashable]], Iterable[tuple[list[Hashable], np.ndarray]]]
+    :return: The result of the run.
+    :rtype: LocalSearchResult
+    """
+    # distinct initial states, in the order they were drawn (a set would order them by PYTHONHASHSEED)
+    init_states = list(dict.fromkeys(problem.get_initial_state() for _ in range(k)))
+    init_scores = problem.batch_fitness(init_states)
+    for state, score in zip(init_states, init_scores):
+        tracker.observe(state, float(score))
+    best_state = init_states[int(np.argmax(init_scores))]
+    beam = [problem.encode(state) for state in init_states]
     # we want to keep the results from last l iters
     last_best: collections.deque[float] = collections.deque(maxlen=10)
-    for _ in range(max_iter):
-        wait_for_all_threads(threads)
-        k_neighbors = sample_k_neighbors(problem, all_neighbors, k, T)
-        best_state = max(k_neighbors, key=problem.fitness)
-        last_best.append(problem.fitness(best_state))
+    while not tracker.exhausted():
+        encodings, features = merge_neighbors(expand(beam))
+        tracker.next_iteration(len(encodings))
+        if not encodings:
+            tracker.stop('converged')
+            break
+        scores = problem.fitness_from_features(features)
+        best_neighbor = int(np.argmax(scores))
+        if scores[best_neighbor] > tracker.best_fitness:
+            tracker.observe(problem.decode(encodings[best_neighbor]), float(scores[best_neighbor]))
+        chosen_indices = sample_k_neighbors(scores, k, T)
+        beam = [encodings[i] for i in chosen_indices]
+        best_index = chosen_indices[np.argmax(scores[chosen_indices])]
+        best_state = problem.decode(encodings[best_index])
+        last_best.append(float(scores[best_index]))
         if stop_condition(last_best):
-            return best_state
-        all_neighbors: TSS = TSS()
-        threads = create_threads(problem, k_neighbors, all_neighbors)
-    print("******* Reached max_iterations ! *******\n")
-    return best_state
+            tracker.stop('converged')
+            break
+    return tracker.result(best_state)
 
 
-def sample_k_neighbors(problem: LocalSearchProblem, all_neighbors: TSS, k: int, T: float) -> set:
+def sample_k_neighbors(scores: np.ndarray, k: int, T: float) -> np.ndarray:
     """
     Samples k neighbors based on their scores using softmax probabilities.
 
-    :param problem: A LocalSearchProblem object.
-    :type problem: LocalSearchProblem
-    :param all_neighbors: Thread-safe set of all neighbors.
-    :type all_neighbors: TSS
+    :param scores: The fitness of every neighbor.
+    :type scores: np.ndarray
     :param k: Number of neighbors to sample.
     :type k: int
     :param T: Temperature parameter for softmax sampling.
     :type T: float
-    :return: Set of sampled neighbors.
-    :rtype: set
+    :return: The indices of the sampled neighbors.
+    :rtype: np.ndarray
     """
-    all_neighbors = list(all_neighbors)
-    scores = [problem.fitness(neighbor) for neighbor in all_neighbors]
     probabilities = softmax(scores, T)
 
     # Sample k indices based on the computed probabilities
-    indices = np.arange(len(scores))
-    chosen_indices = np.random.choice(indices, size=k, p=probabilities, replace=False)
-    return {all_neighbors[i] for i in chosen_indices}
+    return np.random.choice(len(scores), size=min(k, len(scores)), p=probabilities, replace=False)
 
 
 def stop_condition(last_best: collections.deque[float]) -> bool:
@@ -248,57 +1409,29 @@ def stop_condition(last_best: collections.deque[float]) -> bool:
     return False
 
 
-def wait_for_all_threads(threads: list[Thread]):
-    """
-    Waits for all threads to finish.
-
-    :param threads: List of threads to wait for.
-    :type threads: list[Thread]
-    """
-    for thread in threads:
-        thread.join()
-
-
-def softmax(scores: list[float], T: float):
+def softmax(scores: np.ndarray, T: float):
     """
     Computes softmax probabilities from scores with temperature scaling.
 
-    :param scores: List of scores to normalize.
-    :type scores: list[float]
+    :param scores: Scores to normalize.
+    :type scores: np.ndarray
     :param T: Temperature parameter.
     :type T: float
     :return: Softmax probabilities.
     :rtype: np.ndarray
     """
-    scores = np.array(scores) / T
+    scores = np.asarray(scores) / T
     exp_scores = np.exp(scores - np.max(scores))  # Numerical stability
     return exp_scores / exp_scores.sum()
 
 
-def create_threads(problem: LocalSearchProblem, states: set, all_neighbors: TSS) -> list[Thread]:
-    """
-    Creates and starts threads for generating neighbors.
-
-    :param problem: A LocalSearchProblem object.
-    :type problem: LocalSearchProblem
-    :param states: Set of states to generate neighbors for.
-    :type states: set
-    :param all_neighbors: Thread-safe set to collect neighbors.
-    :type all_neighbors: TSS
-    :return: List of created threads.
-    :rtype: list[Thread]
-    """
-    threads = []
-    for state in states:
-        thread = Thread(target=single_beam_search, args=(problem, state, all_neighbors))
-        threads.append(thread)
-        thread.start()
-    return threads
-
-
 # endregion
 
 # Abbreviations
 hill = hill_climbing
+fhill = first_improvement_hill_climbing
+rhill = random_restart_hill_climbing
 sa = simulated_annealing
 beam = stochastic_beam_search
+pbeam = process_stochastic_beam_search
+pt = parallel_tempering
@@ -0,0 +1,252 @@
+from typing import Optional
+
+import numpy as np
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.course_catalog import CourseCatalog
+from local_search.local_degree_plan import LocalDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+
+
+# region Feasibility Repair - specific to DegreePlanningProblem
+def repair_plan(problem: LocalDegreePlanningProblem, state: LocalDegreePlan, max_rounds: int = 10) -> LocalDegreePlan:
+    """
+    Repairs a degree plan that misses the mandatory or the elective points of the degree, typically the output of
+    a local search that got stuck a course or two away from a complete plan.
+
+    Every round first moves the taken courses as early as possible (see `_pull_forward`), which makes room for
+    the courses that depend on them, and then fixes the mandatory points and then the elective points (see
+    `_repair_points`): the taken courses that no other taken course depends on may be dropped, the courses that
+    are not taken may be added at the earliest semester their prerequisites and the semester loads allow, and a
+    small knapsack picks the set of courses with exactly the required points and the highest weighted grades.
+    Courses that become available only after other courses are added are handled by the following rounds.
+
+    The prerequisites of the plan are checked again after every change, and a change that breaks them is undone,
+    so the repaired plan satisfies the same constraints as the plans of the local search neighborhoods.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param state: The plan to repair.
+    :type state: LocalDegreePlan
+    :param max_rounds: Maximum number of rounds.
+    :type max_rounds: int
+    :return: The repaired plan, or the plan itself if it is already valid. The repaired plan may still be
+        invalid if no valid plan is reachable by the repair.
+    :rtype: LocalDegreePlan
+    """
+    if problem.is_valid(state):
+        return state
+    catalog = problem.catalog
+    plan = ArrayDegreePlan.from_local_degree_plan(catalog, state).semester_of.copy()
+    for _ in range(max_rounds):
+        previous = plan.copy()
+        plan = _pull_forward(problem, plan)
+        for mandatory, required_points in ((True, problem.mandatory_points), (False, problem.elective_points)):
+            plan = _repair_points(problem, plan, mandatory, required_points)
+        features = problem.array_features(plan[None])
+        if problem.array_is_valid(features)[0] or np.array_equal(plan, previous):
+            break
+    return ArrayDegreePlan(catalog, plan).to_local_degree_plan()
+
+
+def _repair_points(problem: LocalDegreePlanningProblem, plan: np.ndarray, mandatory: bool,
+                   required_points: int) -> np.ndarray:
+    """
+    Changes the mandatory courses (or the electives) of a plan so that their points are exactly the required
+    points, with the highest weighted grades.
+
+    The options are the taken courses of the kind that can be dropped without breaking the prerequisites of other
+    courses, in their current semester, and the courses of the kind that are not taken, in the earliest semester
+    of each type they can be added to. The other taken courses of the kind are kept. If no set of options has
+    exactly the required points, the best option that gets closer to them is added instead.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param plan: The plan vector (see ArrayDegreePlan).
+    :type plan: np.ndarray
+    :param mandatory: True to repair the mandatory courses, False to repair the electives.
+    :type mandatory: bool
+    :param required_points: The required points of the courses of the kind.
+    :type required_points: int
+    :return: The repaired plan vector, or the plan itself if it cannot be repaired.
+    :rtype: np.ndarray
+    """
+    catalog = problem.catalog
+    of_kind = catalog.offered & (catalog.is_mandatory == mandatory)
+    taken = plan >= 0
+    parities = np.where(taken, plan % 2, 0)
+    taken_of_kind = taken & of_kind[np.arange(len(plan)), parities]
+    points = catalog.offering_values(catalog.points, plan)
+    if points[taken_of_kind].sum() == required_points:
+        return plan
+
+    semester_points = np.bincount(plan[taken], weights=points[taken], minlength=problem.max_semester_num)
+    semesters = _earliest_free_semesters(problem, plan, semester_points)
+    options = np.where(taken[:, None], False, of_kind & (semesters >= 0))
+    droppable = taken_of_kind & _droppable(catalog, plan)
+    options[droppable, parities[droppable]] = True
+    kept_points = int(points[taken_of_kind & ~droppable].sum())
+
+    weighted_grades = catalog.points * catalog.avg_grades
+    chosen = _best_exact_subset(catalog.points, weighted_grades, options, required_points - kept_points)
+    if chosen is None:
+        # get closer to the required points with the single best addition
+        missing = required_points - int(points[taken_of_kind].sum())
+        additions = options & ~taken[:, None] & (catalog.points <= missing)
+        if not additions.any():
+            return plan
+        course, parity = np.unravel_index(np.argmax(np.where(additions, catalog.avg_grades, -np.inf)),
+                                          additions.shape)
+        chosen = np.where(taken & droppable, parities, ArrayDegreePlan.NOT_TAKEN)
+        chosen[course] = parity
+
+    repaired = plan.copy()
+    repaired[droppable & (chosen < 0)] = ArrayDegreePlan.NOT_TAKEN
+    semester_points = np.bincount(repaired[repaired >= 0],
+                                  weights=catalog.offering_values(catalog.points, repaired)[repaired >= 0],
+                                  minlength=problem.max_semester_num)
+    added = np.flatnonzero(~taken & (chosen >= 0))
+    for course in added[np.argsort(semesters[added, chosen[added]], kind='stable')]:
+        parity = chosen[course]
+        course_points = catalog.points[course, parity]
+        # the earliest semester of the offering's type that still has room after the previous additions
+        candidates = np.arange(semesters[course, parity], problem.max_semester_num, 2)
+        candidates = candidates[semester_points[candidates] + course_points <= problem.max_semester_points]
+        if len(candidates) == 0:
+            return plan
+        repaired[course] = candidates[0]
+        semester_points[candidates[0]] += course_points
+    if catalog.unmet_prerequisites(repaired).any():
+        return plan
+    return repaired
+
+
+def _pull_forward(problem: LocalDegreePlanningProblem, plan: np.ndarray) -> np.ndarray:
+    """
+    Moves the taken courses of a plan as early as possible, semester by semester: a course is moved to an
+    earlier semester once its prerequisites are completed before it, mandatory courses first and then in the
+    order of their current semesters, as long as the semester does not exceed the maximum points.
+
+    Unlike the compaction of the genetic algorithm, a course may also move to a semester of the other type, if
+    its offering there has the same points and is mandatory in the same way, so chains of prerequisites can be
+    taken in consecutive semesters. Moving courses earlier keeps all prerequisites met.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param plan: The plan vector (see ArrayDegreePlan).
+    :type plan: np.ndarray
+    :return: The plan vector after the moves.
+    :rtype: np.ndarray
+    """
+    catalog = problem.catalog
+    plan = plan.copy()
+    points = catalog.offering_values(catalog.points, plan)
+    is_mandatory = catalog.offering_values(catalog.is_mandatory, plan)
+    semester_points = np.bincount(plan[plan >= 0], weights=points[plan >= 0], minlength=problem.max_semester_num)
+    for semester in range(problem.max_semester_num - 1):
+        parity = semester % 2
+        movable = ((plan > semester) & catalog.offered[:, parity] & (catalog.points[:, parity] == points) &
+                   (catalog.is_mandatory[:, parity] == is_mandatory) &
+                   (catalog.earliest_semesters(plan)[:, parity] <= semester))
+        for course in np.flatnonzero(movable)[np.lexsort((plan[movable], ~is_mandatory[movable]))]:
+            if semester_points[semester] + points[course] <= problem.max_semester_points:
+                semester_points[plan[course]] -= points[course]
+                semester_points[semester] += points[course]
+                plan[course] = semester
+    return plan
+
+
+def _earliest_free_semesters(problem: LocalDegreePlanningProblem, plan: np.ndarray,
+                             semester_points: np.ndarray) -> np.ndarray:
+    """
+    Finds the earliest semester of each type every course can be added to: its prerequisites are completed in
+    earlier semesters, and the semester has room for the course.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param plan: The plan vector (see ArrayDegreePlan).
+    :type plan: np.ndarray
+    :param semester_points: The points taken in every semester of the plan.
+    :type semester_points: np.ndarray
+    :return: An array of shape (len(catalog), 2) with the earliest semester of the A and B offerings of every
+        course, or -1 for offerings that cannot be added.
+    :rtype: np.ndarray
+    """
+    catalog = problem.catalog
+    earliest = catalog.earliest_semesters(plan)
+    semesters = np.arange(problem.max_semester_num)
+    # fits[course, parity, semester]: the offering can be added to the semester
+    fits = ((semesters % 2 == np.arange(2)[:, None]) & (semesters >= earliest[:, :, None]) &
+            (semester_points + catalog.points[:, :, None] <= problem.max_semester_points))
+    return np.where(fits.any(axis=2), np.argmax(fits, axis=2), ArrayDegreePlan.NOT_TAKEN)
+
+
+def _droppable(catalog: CourseCatalog, plan: np.ndarray) -> np.ndarray:
+    """
+    Finds the taken courses that can be dropped on their own without breaking the prerequisites of the other
+    courses of the plan.
+
+    :param catalog: The catalog of the degree courses.
+    :type catalog: CourseCatalog
+    :param plan: The plan vector (see ArrayDegreePlan).
+    :type plan: np.ndarray
+    :return: A boolean array, True for the courses that can be dropped.
+    :rtype: np.ndarray
+    """
+    taken = np.flatnonzero(plan >= 0)
+    # every row drops one of the taken courses
+    without = np.broadcast_to(plan, (len(taken), len(plan))).copy()
+    without[np.arange(len(taken)), taken] = ArrayDegreePlan.NOT_TAKEN
+    droppable = np.zeros(len(plan), dtype=bool)
+    droppable[taken] = ~catalog.unmet_prerequisites(without).any(axis=1)
+    return droppable
+
+
+def _best_exact_subset(points: np.ndarray, weighted_grades: np.ndarray, options: np.ndarray,
+                       total_points: int) -> Optional[np.ndarray]:
+    """
+    Solves a knapsack problem: finds the set of courses with exactly the given total points and the maximal sum
+    of weighted grades, taking at most one offering of every course.
+
+    :param points: The points of every offering, of shape (len(catalog), 2).
+    :type points: np.ndarray
+    :param weighted_grades: The points times the average grade of every offering, of shape (len(catalog), 2).
+    :type weighted_grades: np.ndarray
+    :param options: Whether every offering can be chosen, of shape (len(catalog), 2).
+    :type options: np.ndarray
+    :param total_points: The exact total points.
+    :type total_points: int
+    :return: The chosen parity of every course, or -1 for courses that are not chosen, or None if no set of
+        courses has exactly total_points.
+    :rtype: Optional[np.ndarray]
+    """
+    if total_points < 0:
+        return None
+    courses_num = len(points)
+    best = np.full(total_points + 1, -np.inf)
+    best[0] = 0
+    # choices[i, p]: the offering of course i chosen in the best set of the first i + 1 courses with p points
+    choices = np.full((courses_num, total_points + 1), ArrayDegreePlan.NOT_TAKEN, dtype=np.int8)
+    for course in range(courses_num):
+        with_course = best.copy()
+        for parity in np.flatnonzero(options[course]):
+            p, w = points[course, parity], weighted_grades[course, parity]
+            if 0 < p <= total_points:
+                better = best[:-p] + w > with_course[p:]
+                with_course[p:][better] = best[:-p][better] + w
+                choices[course, p:][better] = parity
+        best = with_course
+    if best[total_points] == -np.inf:
+        return None
+
+    chosen = np.full(courses_num, ArrayDegreePlan.NOT_TAKEN, dtype=np.int8)
+    remaining = total_points
+    for course in range(courses_num - 1, -1, -1):
+        parity = choices[course, remaining]
+        if parity >= 0:
+            chosen[course] = parity
+            remaining -= points[course, parity]
+    return chosen
+
+
+# endregion
@@ -0,0 +1,231 @@
+from collections import Counter
+from typing import Hashable, Optional
+
+import numpy as np
+
+from local_search.array_degree_plan import ArrayDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from local_search.local_search_ import LocalSearchResult, SearchTracker
+
+
+class TabuList:
+    """
+    A fixed size memory of the most recently added keys, with O(1) insertion and membership checks.
+
+    The keys are kept in a ring buffer, so adding a key to a full list forgets the oldest key, and are counted
+    in a multiset, so a key stays tabu as long as any of its copies is in the buffer.
+    """
+
+    def __init__(self, size: int):
+        """
+        Initializes an empty tabu list.
+
+        :param size: The maximum number of keys remembered.
+        :type size: int
+        """
+        self.__ring: list[Optional[Hashable]] = [None] * size
+        self.__next = 0
+        self.__counts: Counter = Counter()
+
+    def add(self, key: Hashable):
+        """
+        Adds a key to the list, forgetting the oldest key if the list is full.
+
+        :param key: The key to add.
+        :type key: Hashable
+        """
+        if not self.__ring:
+            return
+        oldest = self.__ring[self.__next]
+        if oldest is not None:
+            self.__counts[oldest] -= 1
+            if self.__counts[oldest] == 0:
+                del self.__counts[oldest]
+        self.__ring[self.__next] = key
+        self.__counts[key] += 1
+        self.__next = (self.__next + 1) % len(self.__ring)
+
+    def __contains__(self, key: Hashable) -> bool:
+        """
+        Checks if a key is in the list.
+
+        :param key: The key to check.
+        :type key: Hashable
+        :return: True if the key is one of the most recently added keys, False otherwise.
+        :rtype: bool
+        """
+        return key in self.__counts
+
+    def __len__(self) -> int:
+        """
+        Returns the number of keys currently remembered.
+
+        :return: The number of keys in the list.
+        :rtype: int
+        """
+        return sum(self.__counts.values())
+
+
+# region Tabu Search - specific to DegreePlanningProblem
+def tabu_search(problem: LocalDegreePlanningProblem, tenure: Optional[int] = None, memory_size: int = 1000,
+                max_iter=10 ** 4, patience: int = 200, max_evaluations: Optional[int] = None,
+                max_seconds: Optional[float] = None) -> LocalSearchResult:
+    """
+    Implements Tabu Search over the moves of the degree planning neighborhoods: taking a course in another
+    semester, adding it, removing it, or removing one course and adding another.
+
+    On every iteration the best admissible move is made, even if it makes the plan worse, and among moves of
+    equal fitness the move that takes a course earliest. A move is not admissible if it takes back a recent
+    move (a course returns to the semester it was just moved from, or a course that was just added is
+    removed) or leads to a recently visited plan, unless it leads to a plan better than the best plan found so
+    far (aspiration). The recent moves and the hashes of the recent plans are kept in TabuList objects.
+
+    The moves are not materialized as neighbor plans: the fitness of all the moves is computed incrementally
+    from the current plan's features (see `candidate_moves`), and only the best moves are checked against the
+    prerequisites of the other courses. Given the initial state, the search is deterministic.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param tenure: Number of iterations a move stays tabu (default: a quarter of the number of courses, and at
+        least 7).
+    :type tenure: Optional[int]
+    :param memory_size: Number of recently visited plans that are tabu.
+    :type memory_size: int
+    :param max_iter: Maximum number of iterations.
+    :type max_iter: int
+    :param patience: Number of iterations without improvement of the best plan before stopping.
+    :type patience: int
+    :param max_evaluations: Maximum number of fitness evaluations, where every scored move counts (default: no
+        limit).
+    :type max_evaluations: Optional[int]
+    :param max_seconds: Maximum wall-clock duration in seconds (default: no limit).
+    :type max_seconds: Optional[float]
+    :return: The result of the run, whose state is the best valid plan visited (or the best plan visited, if no
+        valid plan was visited).
+    :rtype: LocalSearchResult
+    """
+    catalog = problem.catalog
+    if tenure is None:
+        tenure = max(7, len(catalog) // 4)
+    tracker = SearchTracker(problem, max_iter, max_evaluations, max_seconds)
+    plan = ArrayDegreePlan.from_local_degree_plan(catalog, problem.get_initial_state()).semester_of.copy()
+    features = problem.array_features(plan[None])[0]
+    tracker.observe_batch(plan[None], problem.fitness_from_features(features[None]),
+                          problem.array_is_valid(features[None]))
+    tabu_moves, visited = TabuList(tenure), TabuList(memory_size)
+    visited.add(hash(plan.tobytes()))
+
+    iterations_without_improvement = 0
+    while not tracker.exhausted():
+        problem.expanded += 1
+        removed, courses, semesters, move_features = candidate_moves(problem, plan, features)
+        scores = problem.fitness_from_features(move_features)
+        tracker.next_iteration(len(scores))
+        best_score = tracker.best_fitness
+        move = None
+        for i in np.lexsort((semesters, -scores)):
+            course, semester = int(courses[i]), int(semesters[i])
+            candidate = plan.copy()
+            candidate[course] = semester
+            if removed[i] >= 0:
+                candidate[removed[i]] = ArrayDegreePlan.NOT_TAKEN
+            is_tabu = ((course, semester) in tabu_moves or (int(removed[i]), ArrayDegreePlan.NOT_TAKEN) in tabu_moves
+                       or hash(candidate.tobytes()) in visited)
+            if is_tabu and scores[i] <= best_score:
+                continue
+            # adding a course or taking it earlier cannot break the prerequisites of other courses
+            safe = removed[i] < 0 and (plan[course] < 0 or 0 <= semester < plan[course])
+            if safe or not catalog.unmet_prerequisites(candidate).any():
+                move = i, candidate
+                break
+        if move is None:
+            tracker.stop('no_admissible_move')
+            break
+
+        i, candidate = move
+        for course in (courses[i], removed[i]):
+            if course >= 0:
+                tabu_moves.add((int(course), int(plan[course])))
+        visited.add(hash(candidate.tobytes()))
+        plan, features = candidate, move_features[i]
+        tracker.observe_batch(plan[None], scores[i:i + 1], problem.array_is_valid(features[None]))
+        if scores[i] > best_score:
+            iterations_without_improvement = 0
+        else:
+            iterations_without_improvement += 1
+            if iterations_without_improvement >= patience:
+                tracker.stop('converged')
+                break
+
+    return tracker.result(plan, lambda vector: ArrayDegreePlan(catalog, vector).to_local_degree_plan())
+
+
+def candidate_moves(problem: LocalDegreePlanningProblem, plan: np.ndarray,
+                    features: np.ndarray) -> tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Finds the moves of a plan and computes the fitness features of the plans they lead to incrementally, from
+    the features of the plan.
+
+    Move i removes the course removed[i] (if it is not -1) and takes the course courses[i] in semester
+    semesters[i] (or removes it, if semesters[i] is -1). A course is only removed together with another course
+    that is not taken being added. Moves that break a constraint that only depends on the moved courses (the
+    semester type, the elective points, the semester's maximum points and the added course's prerequisites)
+    are left out. Moving a course later or removing a course may still break the prerequisites of other
+    courses.
+
+    :param problem: A LocalDegreePlanningProblem object.
+    :type problem: LocalDegreePlanningProblem
+    :param plan: The current plan vector (see ArrayDegreePlan).
+    :type plan: np.ndarray
+    :param features: The fitness features of the plan (see `LocalDegreePlanningProblem.array_features`).
+    :type features: np.ndarray
+    :return: The removed courses, the moved courses, their new semesters and the fitness features of the plans
+        after the moves.
+    :rtype: tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]
+    """
+    catalog = problem.catalog
+    semesters = np.arange(ArrayDegreePlan.NOT_TAKEN, problem.max_semester_num)
+    parities = semesters % 2
+    # the features each course adds to a plan in each semester, where column 0 is not taking the course
+    points = np.where(semesters >= 0, catalog.points[:, parities], 0)
+    values = np.stack([points * catalog.avg_grades[:, parities], points, points * catalog.is_mandatory[:, parities]],
+                      axis=2)
+    current = plan.astype(np.intp) + 1
+    deltas = values - values[np.arange(len(plan)), current][:, None]
+    elective_deltas = deltas[:, :, 1] - deltas[:, :, 2]
+    elective_room = problem.elective_points - (features[1] - features[2])
+    taken = plan >= 0
+    semester_points = np.bincount(plan[taken], weights=points[taken, current[taken]],
+                                  minlength=problem.max_semester_num)
+
+    allowed = (semesters != plan[:, None]) & ((semesters < 0) | catalog.offered[:, parities])
+    allowed[:, 1:] &= catalog.earliest_semesters(plan)[:, parities[1:]] <= semesters[1:]
+    fits = np.ones(allowed.shape, dtype=bool)
+    fits[:, 1:] = semester_points + points[:, 1:] <= problem.max_semester_points
+
+    # single course moves
+    courses, targets = np.nonzero(allowed & fits & (elective_deltas <= elective_room))
+    single_features = features + deltas[courses, targets]
+
+    # removing a taken course and adding a course that is not taken
+    removed = np.flatnonzero(taken)
+    added, added_targets = np.nonzero(allowed & ~taken[:, None])
+    added_targets, added = added_targets[added_targets > 0], added[added_targets > 0]
+    freed_points = np.where(plan[removed, None] == semesters[added_targets], points[removed, current[removed], None], 0)
+    swaps = ((elective_deltas[removed, 0, None] + elective_deltas[added, added_targets] <= elective_room) &
+             (semester_points[added_targets - 1] + points[added, added_targets] - freed_points <=
+              problem.max_semester_points))
+    swap_removed, swap_added = np.nonzero(swaps)
+    swap_features = (features + deltas[removed[swap_removed], 0] +
+                     deltas[added[swap_added], added_targets[swap_added]])
+
+    return (np.concatenate([np.full(len(courses), ArrayDegreePlan.NOT_TAKEN), removed[swap_removed]]),
+            np.concatenate([courses, added[swap_added]]),
+            np.concatenate([semesters[targets], semesters[added_targets[swap_added]]]),
+            np.concatenate([single_features, swap_features]))
+
+
+# endregion
+
+# Abbreviations
+tabu = tabu_search
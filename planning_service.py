@@ -0,0 +1,468 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import threading
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, TimeoutError
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Optional, Union
+
+import numpy as np
+
+from course import Course
+from dpp import (DEFAULT_INITIALIZERS, GRAPH_SEARCH_ALGORITHMS, LOCAL_SEARCH_ALGORITHMS, DegreeLoad, is_reproducible,
+                 run_graph_search_main, run_local_search_main, to_local_degree_plan)
+from input_loader import load_degree_plan
+from local_search.local_degree_plan import LocalDegreePlan
+from local_search.local_degree_planning_problem import LocalDegreePlanningProblem
+from solution_cache import SolutionCache, catalog_hash, decode_solution, encode_solution
+
+# dpp.py also lists bfs, which has no implementation
+ALGORITHMS = ["dfs", "ucs", "astar"] + LOCAL_SEARCH_ALGORITHMS
+
+# region Worker Processes
+_worker_catalogs: dict[str, tuple[float, tuple[int, int, list[Course]]]] = {}
+
+
+def _load_catalog(input_dir: str, name: str,
+                  catalogs: dict[str, tuple[float, Any]]) -> tuple[int, int, list[Course]]:
+    """
+    Returns a catalog from a dictionary of loaded catalogs, loading it again if its file changed since it was
+    loaded.
+
+    :param input_dir: The directory of the catalogs.
+    :type input_dir: str
+    :param name: The file name of the catalog.
+    :type name: str
+    :param catalogs: The loaded catalogs, by file name, with the modification time of their files.
+    :type catalogs: dict[str, tuple[float, Any]]
+    :return: The mandatory points, the target points and the courses of the catalog (see `load_degree_plan`).
+    :rtype: tuple[int, int, list[Course]]
+    """
+    path = os.path.join(input_dir, name)
+    modified = os.path.getmtime(path)
+    loaded = catalogs.get(name)
+    if loaded is None or loaded[0] != modified:
+        loaded = modified, load_degree_plan(path)
+        catalogs[name] = loaded
+    return loaded[1]
+
+
+def _plan_in_worker(input_dir: str, request: dict) -> tuple[dict, int, float, str]:
+    """
+    Runs a planning request in a worker process of the service, with the catalogs the worker keeps loaded.
+
+    :param input_dir: The directory of the catalogs.
+    :type input_dir: str
+    :param request: The normalized request (see `PlanningService.normalize`).
+    :type request: dict
+    :return: The encoded solution (see `encode_solution`), the number of expanded nodes, the duration of the
+        search in seconds and the output the search printed.
+    :rtype: tuple[dict, int, float, str]
+    """
+    mandatory_points, target_points, degree_courses = _load_catalog(input_dir, request['catalog'], _worker_catalogs)
+    min_semester_points, max_semester_points = DegreeLoad[request['load']].value
+    params = {'degree_courses': degree_courses, 'mandatory_points': mandatory_points, 'target_points': target_points,
+              'min_semester_points': min_semester_points, 'max_semester_points': max_semester_points}
+    if request['seed'] is not None:
+        random.seed(request['seed'])
+        np.random.seed(request['seed'])
+    output = io.StringIO()
+    start = time.time()
+    with contextlib.redirect_stdout(output):
+        if request['algorithm'] in GRAPH_SEARCH_ALGORITHMS:
+            solution, expanded = run_graph_search_main(request['algorithm'], params)
+        else:
+            solution, expanded = run_local_search_main(request['algorithm'], params, request['initializer'],
+                                                       request['repair'], request['budget'])
+    return encode_solution(solution), expanded, time.time() - start, output.getvalue()
+
+
+# endregion
+
+class PlanningService:
+    """
+    A long-running degree planning service that keeps the catalogs loaded and runs searches on a pool of worker
+    processes.
+
+    Both the service and its workers keep every catalog they load in memory, and only load it again if its file
+    changes. Identical requests that arrive while a computation is running share that computation instead of
+    starting another one, and reproducible requests (see `dpp.is_reproducible`) are also answered from the solution
+    cache (see `SolutionCache`).
+    """
+
+    def __init__(self, input_dir: str = "input_files", workers: Optional[int] = None,
+                 cache: Optional[SolutionCache] = None):
+        """
+        Starts the worker pool of the service.
+
+        :param input_dir: The directory of the catalogs.
+        :type input_dir: str
+        :param workers: Number of worker processes (default: the number of CPUs).
+        :type workers: Optional[int]
+        :param cache: The solution cache of reproducible requests (default: no cache).
+        :type cache: Optional[SolutionCache]
+        """
+        self.__input_dir = input_dir
+        self.__executor = ProcessPoolExecutor(workers)
+        self.__cache = cache
+        self.__catalogs: dict[str, tuple[float, tuple[tuple[int, int, list[Course]], str]]] = {}
+        self.__in_flight: dict[str, Future] = {}
+        self.__lock = threading.Lock()
+        self.__statistics = {'requests': 0, 'computed': 0, 'coalesced': 0, 'cached': 0}
+
+    def catalog(self, name: str) -> tuple[int, int, list[Course], str]:
+        """
+        Returns a catalog of the service's directory, loading it if it was not loaded or its file changed.
+
+        :param name: The file name of the catalog, e.g. 'cs.json'.
+        :type name: str
+        :return: The mandatory points, the target points, the courses and the content hash of the catalog.
+        :rtype: tuple[int, int, list[Course], str]
+        :raises ValueError: If there is no such catalog.
+        """
+        if os.path.basename(name) != name or not name.endswith(".json"):
+            raise ValueError(f"Invalid catalog name: {name}")
+        if not os.path.isfile(os.path.join(self.__input_dir, name)):
+            raise ValueError(f"No such catalog: {name}")
+        with self.__lock:
+            path = os.path.join(self.__input_dir, name)
+            loaded = self.__catalogs.get(name)
+            if loaded is None or loaded[0] != os.path.getmtime(path):
+                catalog = load_degree_plan(path)
+                loaded = os.path.getmtime(path), (catalog, catalog_hash(*catalog))
+                self.__catalogs[name] = loaded
+        (mandatory_points, target_points, degree_courses), content_hash = loaded[1]
+        return mandatory_points, target_points, degree_courses, content_hash
+
+    def catalogs(self) -> list[str]:
+        """
+        Returns the file names of the catalogs in the service's directory.
+
+        :return: The sorted file names.
+        :rtype: list[str]
+        """
+        return sorted(name for name in os.listdir(self.__input_dir) if name.endswith(".json"))
+
+    @staticmethod
+    def normalize(request: dict) -> dict:
+        """
+        Validates a planning request and fills in its defaults.
+
+        A request has the fields 'algorithm', 'catalog' (a file name in the service's directory) and 'load' (low,
+        medium or high), and optionally 'initializer', 'repair', 'seed', 'max_evaluations' and 'max_seconds'. The
+        budgets only apply to local searches.
+
+        :param request: The request, as decoded from JSON.
+        :type request: dict
+        :return: The normalized request.
+        :rtype: dict
+        :raises ValueError: If the request is not valid.
+        """
+        if not isinstance(request, dict):
+            raise ValueError("The request must be a JSON object")
+        unknown = set(request) - {'algorithm', 'catalog', 'load', 'initializer', 'repair', 'seed',
+                                  'max_evaluations', 'max_seconds'}
+        if unknown:
+            raise ValueError(f"Unknown request fields: {', '.join(sorted(unknown))}")
+        algorithm = request.get('algorithm')
+        if algorithm not in ALGORITHMS:
+            raise ValueError(f"Invalid algorithm: {algorithm}")
+        load = str(request.get('load', '')).upper()
+        if load not in DegreeLoad.__members__:
+            raise ValueError(f"Invalid load: {request.get('load')}")
+        if not isinstance(request.get('catalog'), str):
+            raise ValueError("Missing catalog")
+        seed = request.get('seed')
+        if seed is not None and (not isinstance(seed, int) or isinstance(seed, bool)):
+            raise ValueError(f"Invalid seed: {seed}")
+        repair = request.get('repair', False)
+        if not isinstance(repair, bool):
+            raise ValueError(f"Invalid repair: {repair}")
+        budget = {}
+        for name, kind in (('max_evaluations', int), ('max_seconds', (int, float))):
+            value = request.get(name)
+            if value is not None:
+                if not isinstance(value, kind) or isinstance(value, bool) or value <= 0:
+                    raise ValueError(f"Invalid {name}: {value}")
+                budget[name] = value
+
+        normalized = {'algorithm': algorithm, 'catalog': request['catalog'], 'load': load, 'seed': seed,
+                      'initializer': None, 'repair': False, 'budget': {}}
+        if algorithm in LOCAL_SEARCH_ALGORITHMS:
+            initializer = request.get('initializer') or DEFAULT_INITIALIZERS.get(algorithm, 'random')
+            if initializer not in LocalDegreePlanningProblem.INITIALIZERS:
+                raise ValueError(f"Invalid initializer: {initializer}")
+            normalized.update(initializer=initializer, repair=repair, budget=budget)
+        return normalized
+
+    def plan(self, request: dict, timeout: Optional[float] = None) -> dict:
+        """
+        Answers a planning request: from the solution cache, from a running computation of an identical
+        request, or by running the search on the worker pool.
+
+        :param request: The request (see `normalize`).
+        :type request: dict
+        :param timeout: Maximum number of seconds to wait for the search (default: no limit). The search keeps
+            running after a timeout, and its result is still cached.
+        :type timeout: Optional[float]
+        :return: The response (see `_response`).
+        :rtype: dict
+        :raises ValueError: If the request is not valid.
+        :raises TimeoutError: If the search did not finish in time.
+        """
+        request = self.normalize(request)
+        catalog = self.catalog(request['catalog'])
+        degree_courses, content_hash = catalog[2:]
+        params = SolutionCache.search_params(request['initializer'], request['repair'], request['budget'])
+        key = SolutionCache.key(content_hash, request['algorithm'], DegreeLoad[request['load']].value, params,
+                                request['seed'])
+        reproducible = is_reproducible(request['algorithm'], request['seed'], request['budget'])
+        self.__count('requests')
+
+        if self.__cache is not None and reproducible:
+            cached = self.__cache.get(key)
+            if cached is not None:
+                self.__count('cached')
+                encoded, expanded, seconds = cached
+                return self._response(request, decode_solution(encoded, degree_courses), expanded, seconds, catalog,
+                                      'cache')
+
+        with self.__lock:
+            future = self.__in_flight.get(key)
+            source = 'coalesced' if future is not None else 'computed'
+            if future is None:
+                future = self.__executor.submit(_plan_in_worker, self.__input_dir, request)
+                self.__in_flight[key] = future
+        if source == 'computed':
+            # outside the lock, since the callback runs right away if the search already finished
+            future.add_done_callback(lambda done: self.__finish(key, done, reproducible))
+        self.__count(source)
+        encoded, expanded, seconds, _ = future.result(timeout)
+        return self._response(request, decode_solution(encoded, degree_courses), expanded, seconds, catalog,
+                              source)
+
+    @staticmethod
+    def _response(request: dict, solution: Union[LocalDegreePlan, Optional[list[Course]]], expanded: int,
+                  seconds: float, catalog: tuple[int, int, list[Course], str], source: str) -> dict:
+        """
+        Builds the JSON response of a planning request.
+
+        :param request: The normalized request.
+        :type request: dict
+        :param solution: The solution of the search (see `decode_solution`).
+        :type solution: Union[LocalDegreePlan, Optional[list[Course]]]
+        :param expanded: The number of nodes expanded by the search.
+        :type expanded: int
+        :param seconds: The duration of the search in seconds.
+        :type seconds: float
+        :param catalog: The catalog of the request (see `catalog`).
+        :type catalog: tuple[int, int, list[Course], str]
+        :param source: Where the answer came from: 'computed', 'coalesced' or 'cache'.
+        :type source: str
+        :return: The response: the request, the source, the search statistics, and the plan (None if there is no
+            solution) with its points, its average grade, whether it is valid, and its courses by semester.
+        :rtype: dict
+        """
+        mandatory_points, target_points, degree_courses, _ = catalog
+        response = {'request': request, 'source': source, 'expanded': expanded, 'seconds': seconds, 'plan': None}
+        if not solution:
+            return response
+        plan = to_local_degree_plan(solution)
+        offerings = {(c.number, c.semester_type): c for c in degree_courses}
+        semesters: list[list[dict]] = [[] for _ in range(plan.semesters_num)]
+        for number, semester in sorted(plan.course_semesters.items()):
+            course = offerings[number, "A" if semester % 2 == 0 else "B"]
+            semesters[semester].append({'number': course.number, 'name': course.name, 'points': course.points,
+                                        'avg_grade': course.avg_grade, 'is_mandatory': course.is_mandatory})
+        response['plan'] = {
+            'total_points': plan.total_points,
+            'mandatory_points': plan.mandatory_points,
+            'avg_grade': plan.avg_grade,
+            'valid': plan.total_points == target_points and plan.mandatory_points == mandatory_points,
+            'semesters': semesters,
+        }
+        return response
+
+    @property
+    def statistics(self) -> dict[str, int]:
+        """
+        Returns the number of requests the service answered, and how many of them were computed, coalesced with
+        a running computation or answered from the cache.
+
+        :return: The counts, by name.
+        :rtype: dict[str, int]
+        """
+        with self.__lock:
+            return dict(self.__statistics, in_flight=len(self.__in_flight), catalogs=len(self.__catalogs))
+
+    def close(self):
+        """
+        Stops the worker pool, after the running searches finish.
+        """
+        self.__executor.shutdown()
+
+    def __count(self, name: str):
+        """
+        Increments a statistics counter.
+
+        :param name: The name of the counter.
+        :type name: str
+        """
+        with self.__lock:
+            self.__statistics[name] += 1
+
+    def __finish(self, key: str, future: Future, reproducible: bool):
+        """
+        Called when a computation finishes: stops coalescing requests into it, and caches its result.
+
+        :param key: The cache key of the request.
+        :type key: str
+        :param future: The finished computation.
+        :type future: Future
+        :param reproducible: Whether the result can be cached (see `dpp.is_reproducible`).
+        :type reproducible: bool
+        """
+        # cache before dropping the computation, so identical requests find one or the other
+        if self.__cache is not None and reproducible and future.exception() is None:
+            encoded, expanded, seconds, _ = future.result()
+            self.__cache.put(key, encoded, expanded, seconds)
+        with self.__lock:
+            self.__in_flight.pop(key, None)
+
+
+# region HTTP Server
+class PlanningRequestHandler(BaseHTTPRequestHandler):
+    """
+    Handles the HTTP requests of a planning server (see `serve`):
+
+    - GET /health: the statistics of the service (see `PlanningService.statistics`).
+    - GET /catalogs: the file names of the catalogs in the service's directory.
+    - POST /plan: a planning request as a JSON object (see `PlanningService.normalize`), answered with the JSON
+      response of `PlanningService.plan`.
+    """
+    service: PlanningService
+    grace_seconds: float
+
+    def do_GET(self):
+        """
+        Handles the GET requests.
+        """
+        if self.path == "/health":
+            self.__send(200, dict(self.service.statistics, status="ok"))
+        elif self.path == "/catalogs":
+            self.__send(200, {'catalogs': self.service.catalogs()})
+        else:
+            self.__send(404, {'error': f"Not found: {self.path}"})
+
+    def do_POST(self):
+        """
+        Handles the POST requests. A request that waits longer than its 'max_seconds' budget plus the grace
+        period is answered with 504, and its search keeps running in the background. A request whose search
+        fails is answered with 500.
+        """
+        if self.path != "/plan":
+            self.__send(404, {'error': f"Not found: {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            request = json.loads(self.rfile.read(length) or b"{}")
+            max_seconds = request.get('max_seconds') if isinstance(request, dict) else None
+            timeout = max_seconds + self.grace_seconds if isinstance(max_seconds, (int, float)) else None
+            self.__send(200, self.service.plan(request, timeout))
+        except (ValueError, TypeError) as e:
+            self.__send(400, {'error': str(e)})
+        except TimeoutError:
+            self.__send(504, {'error': "The search did not finish in time"})
+        except Exception as e:
+            self.log_error("Failed to answer a planning request: %r", e)
+            self.__send(500, {'error': f"Internal error: {type(e).__name__}: {e}"})
+
+    def log_message(self, format: str, *args):
+        """
+        Logs the requests only in verbose mode.
+        """
+        if getattr(self.server, 'verbose', False):
+            super().log_message(format, *args)
+
+    def __send(self, status: int, body: dict):
+        """
+        Sends a JSON response.
+
+        :param status: The HTTP status code.
+        :type status: int
+        :param body: The response body.
+        :type body: dict
+        """
+        encoded = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+
+def serve(service: PlanningService, host: str = "127.0.0.1", port: int = 8765, grace_seconds: float = 5.0,
+          verbose: bool = False) -> ThreadingHTTPServer:
+    """
+    Creates an HTTP server of a planning service, which handles every request in its own thread. Call
+    `serve_forever` on the server to start it.
+
+    :param service: The planning service.
+    :type service: PlanningService
+    :param host: The host name to listen on.
+    :type host: str
+    :param port: The port to listen on.
+    :type port: int
+    :param grace_seconds: Seconds to wait for a search beyond its 'max_seconds' budget.
+    :type grace_seconds: float
+    :param verbose: Whether to log every request.
+    :type verbose: bool
+    :return: The server.
+    :rtype: ThreadingHTTPServer
+    """
+    handler = type('BoundPlanningRequestHandler', (PlanningRequestHandler,),
+                   {'service': service, 'grace_seconds': grace_seconds})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.verbose = verbose
+    return server
+
+
+# endregion
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Runs the planning server until it is interrupted.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    """
+    parser = argparse.ArgumentParser(description="Long-running degree planning service.")
+    parser.add_argument('--host', default="127.0.0.1", help="host name to listen on")
+    parser.add_argument('--port', type=int, default=8765, help="port to listen on")
+    parser.add_argument('--workers', type=int, default=None, help="number of worker processes")
+    parser.add_argument('--input-dir', default="input_files", help="directory of the catalogs")
+    parser.add_argument('--preload', nargs='*', default=[], metavar='CATALOG', help="catalogs to load on start")
+    parser.add_argument('--no-cache', action='store_true', help="do not use the persistent solution cache")
+    parser.add_argument('--verbose', action='store_true', help="log every request")
+    args = parser.parse_args(argv)
+
+    service = PlanningService(args.input_dir, args.workers, None if args.no_cache else SolutionCache())
+    for name in args.preload:
+        service.catalog(name)
+    server = serve(service, args.host, args.port, verbose=args.verbose)
+    print(f"Serving degree plans on http://{args.host}:{server.server_address[1]}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        service.close()
+
+
+if __name__ == '__main__':
+    main()
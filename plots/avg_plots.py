@@ -1,94 +1,77 @@
-import pandas as pd
-import matplotlib.pyplot as plt
-
-# Load the Excel file into a DataFrame
-file_path = '../Documents/results.xlsx'  # Replace with the actual file path of your Excel file
-df = pd.read_excel(file_path)
-
-# Function to add labels on bars
-def add_value_labels(ax):
-    for p in ax.patches:
-        if not pd.isna(p.get_height()):
-            ax.annotate(f'{p.get_height():.2f}',
-                        (p.get_x() + p.get_width() / 2., p.get_height()),
-                        ha='center', va='bottom', xytext=(0, 10), textcoords='offset points')
-
-load_order = ['Low', 'Medium', 'High']
-algorithm_order = ['DFS', 'Astar', 'UCS']  # Ensure these match the names in your data
-
-# Convert 'Load' to a categorical type with the specified ordering
-df['Load'] = pd.Categorical(df['Load'], categories=load_order, ordered=True)
-
-# List of unique data sets
-data_sets = df['Data set'].unique()
-
-for data_set in data_sets:
-    plt.figure(figsize=(12, 8))  # Increase the figure size to allow more space for the legend
-
-    # Filter the data for the current data set
-    subset = df[df['Data set'] == data_set].copy()  # Use copy to avoid SettingWithCopyWarning
-
-    # Ensure 'Avg' is numeric
-    subset['Avg'] = pd.to_numeric(subset['Avg'], errors='coerce')
-
-    # Check if 'Upper Bound' row exists in the subset
-    if 'Upper Bound' in subset['Algorithm'].values:
-        # Extract the upper bound value
-        upper_bound_row = subset[subset['Algorithm'] == 'Upper Bound']
-        upper_bound = upper_bound_row['Avg'].values[0]
-
-        # Remove the 'Upper Bound' row from the subset
-        subset_without_upper_bound = subset[subset['Algorithm'] != 'Upper Bound']
-    else:
-        # If no 'Upper Bound' row, proceed without removing any row
-        upper_bound = subset['Avg'].max()
-        subset_without_upper_bound = subset
-
-    # Check if there's any data left after removing the upper bound row
-    if subset_without_upper_bound.empty:
-        print(f"No data to plot for {data_set} after removing the upper bound row.")
-        continue  # Skip this plot if no data is left
+import argparse
+import os
+from typing import Optional
 
-    # Calculate dynamic lower bound based on the data
-    lower_bound = max(40, subset_without_upper_bound['Avg'].min() - 5)  # Set lower bound to the minimum value of Avg or 40
-
-    # Determine the algorithms present in this subset
-    algorithms_present = subset_without_upper_bound['Algorithm'].unique()
-
-    # Create ordered list of algorithms present, preserving the order specified in algorithm_order
-    algorithms_present_ordered = [alg for alg in algorithm_order if alg in algorithms_present]
-
-    # Set 'Algorithm' as categorical with the ordered categories
-    subset_without_upper_bound['Algorithm'] = pd.Categorical(
-        subset_without_upper_bound['Algorithm'],
-        categories=algorithms_present_ordered,
-        ordered=True
-    )
-
-    # Group the remaining data (without the upper bound row) for plotting
-    subset_grouped = subset_without_upper_bound.groupby(['Load', 'Algorithm'])['Avg'].mean().unstack()
-
-    # Plot the bar plot (excluding the upper bound row)
-    ax = subset_grouped.plot(kind='bar', ax=plt.gca())
-
-    plt.title(f'Average grade for "{data_set}" by semester load')
-    plt.ylabel('Average Grade')
-    plt.xlabel('Semester Load')
-    plt.xticks(rotation=0)
-
-    # Set the dynamic y-axis limits
-    plt.ylim(60, 92)  # Set upper limit slightly above the upper bound
-
-    # Adding a horizontal line to indicate the "upper bound" from the data
-    plt.axhline(y=upper_bound, color='red', linestyle='--', label=f'Upper Bound ({upper_bound:.2f})')  # Dashed red line
-
-    plt.grid(True)
-
-    # Adding value labels on each bar
-    add_value_labels(ax)
-
-    # Positioning the legend
-    plt.legend(title='Algorithm', loc='upper right', borderaxespad=0.1)
+import matplotlib.pyplot as plt
 
-    # Show the plot
-    plt.show()
+from benchmarks.results_store import ResultsStore
+from dpp import GRAPH_SEARCH_ALGORITHMS
+from graph_search.degree_planning_problem import get_upper_bound_avg
+from input_loader import load_degree_plan
+from plots.plot_utils import (DEFAULT_DASHBOARD_DIR, INPUT_DIR, add_store_arguments, group_runs, plot_by_load,
+                              save_figure)
+
+
+def catalog_upper_bound(file_name: str) -> Optional[float]:
+    """
+    Computes the upper bound of the average grade of a catalog of the input_files directory.
+
+    :param file_name: The file name of the catalog.
+    :type file_name: str
+    :return: The upper bound (see `get_upper_bound_avg`), or None if the catalog is not in input_files.
+    :rtype: Optional[float]
+    """
+    path = os.path.join(INPUT_DIR, file_name)
+    if not os.path.isfile(path):
+        return None
+    _, target_points, degree_courses = load_degree_plan(path)
+    return get_upper_bound_avg(frozenset(degree_courses), target_points)
+
+
+def plot_average_grades(runs: list[dict], output_dir: str, algorithms: list[str] = GRAPH_SEARCH_ALGORITHMS,
+                        show: bool = False) -> list[str]:
+    """
+    Plots the average grade of the valid plans of the algorithms by semester load, for every catalog.
+
+    :param runs: The runs, as the results store returns them.
+    :type runs: list[dict]
+    :param output_dir: The directory of the plots.
+    :type output_dir: str
+    :param algorithms: The algorithms to plot (default: the graph searches).
+    :type algorithms: list[str]
+    :param show: Whether to keep the figures open, to show them with plt.show().
+    :type show: bool
+    :return: The paths of the plots.
+    :rtype: list[str]
+    """
+    paths = []
+    valid_runs = [run for run in runs if run['valid']]
+    for file_name, by_algorithm in group_runs(valid_runs, algorithms, 'avg_grade').items():
+        upper_bound = catalog_upper_bound(file_name)
+        values = [value for by_load in by_algorithm.values() for value in by_load.values()]
+        top = max(values + ([upper_bound] if upper_bound is not None else []))
+        figure = plot_by_load(by_algorithm, f'Average grade for "{file_name}" by semester load', 'Average Grade',
+                              upper_bound, (max(40, min(values) - 5), min(100, top + 3)))
+        paths.append(save_figure(figure, output_dir, os.path.splitext(file_name)[0], show))
+    return paths
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Plots the average grades of the latest runs of the results store.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    """
+    parser = argparse.ArgumentParser(description="Plots the average grades of the graph searches.")
+    add_store_arguments(parser, os.path.join(DEFAULT_DASHBOARD_DIR, "graph"))
+    args = parser.parse_args(argv)
+    runs = ResultsStore(args.store).latest_runs(None if args.all_hosts else args.hostname)
+    for path in plot_average_grades(runs, args.output_dir, show=args.show):
+        print(f"Wrote {path}")
+    if args.show:
+        plt.show()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import platform
+from typing import Optional
+
+import matplotlib.pyplot as plt
+
+from benchmarks.results_store import ResultsStore
+from plots.avg_plots import plot_average_grades
+from plots.local_plots import plot_local_searches
+from plots.plot_utils import DEFAULT_DASHBOARD_DIR, add_store_arguments
+from plots.trend_plots import plot_trends
+
+
+def generate_dashboards(store: ResultsStore, output_dir: str = DEFAULT_DASHBOARD_DIR,
+                        hostname: Optional[str] = platform.node(), show: bool = False) -> list[str]:
+    """
+    Regenerates all the plots of the results store: the average grades of the graph searches ('graph'), the
+    execution times and average grades of the local searches ('local'), from the latest runs of every combination,
+    and the trends across commits ('trends'), from all the runs.
+
+    :param store: The results store.
+    :type store: ResultsStore
+    :param output_dir: The directory of the plots.
+    :type output_dir: str
+    :param hostname: Only plot the results of this machine (default: of the current machine). None plots the
+        results of all machines.
+    :type hostname: Optional[str]
+    :param show: Whether to keep the figures open, to show them with plt.show().
+    :type show: bool
+    :return: The paths of the plots.
+    :rtype: list[str]
+    """
+    latest = store.latest_runs(hostname)
+    return (plot_average_grades(latest, os.path.join(output_dir, "graph"), show=show) +
+            plot_local_searches(latest, os.path.join(output_dir, "local"), show) +
+            plot_trends(store.runs(hostname), os.path.join(output_dir, "trends"), show))
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Regenerates all the plots of the results store.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    """
+    parser = argparse.ArgumentParser(description="Regenerates the performance dashboards from the results store.")
+    add_store_arguments(parser, DEFAULT_DASHBOARD_DIR)
+    args = parser.parse_args(argv)
+    store = ResultsStore(args.store)
+    for path in generate_dashboards(store, args.output_dir, None if args.all_hosts else args.hostname, args.show):
+        print(f"Wrote {path}")
+    if args.show:
+        plt.show()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import argparse
+import os
+import platform
+import statistics
+from typing import Callable, Optional
+
+import matplotlib.pyplot as plt
+
+from benchmarks.results_store import DEFAULT_STORE_PATH
+from dpp import DegreeLoad
+
+PLOTS_DIR = os.path.dirname(os.path.abspath(__file__))
+INPUT_DIR = os.path.join(os.path.dirname(PLOTS_DIR), "input_files")
+DEFAULT_DASHBOARD_DIR = os.path.join(PLOTS_DIR, "dashboards")
+
+# the labels of the algorithms in the plots
+ALGORITHM_LABELS = {'dfs': 'DFS', 'astar': 'Astar', 'ucs': 'UCS', 'sa': 'Simulated Annealing',
+                    'hill': 'Hill Climbing', 'beam': 'Stochastic Beam Search'}
+
+
+def algorithm_label(algorithm: str) -> str:
+    """
+    Returns the label of an algorithm in the plots.
+
+    :param algorithm: The algorithm name, as given to dpp.py.
+    :type algorithm: str
+    :return: The label of the algorithm.
+    :rtype: str
+    """
+    return ALGORITHM_LABELS.get(algorithm, algorithm.upper())
+
+
+def group_runs(runs: list[dict], algorithms: list[str], statistic: str,
+               aggregate: Callable[[list[float]], float] = statistics.mean) -> dict[str, dict[str, dict[str, float]]]:
+    """
+    Aggregates a statistic of the runs of every algorithm and load, by catalog file.
+
+    :param runs: The runs, as the results store returns them.
+    :type runs: list[dict]
+    :param algorithms: The algorithms to aggregate, in the order of the plots.
+    :type algorithms: list[str]
+    :param statistic: The statistic of the runs, e.g. 'avg_grade' or 'wall_seconds'.
+    :type statistic: str
+    :param aggregate: The aggregate of the values of the statistic.
+    :type aggregate: Callable[[list[float]], float]
+    :return: The aggregates, by file, algorithm and load.
+    :rtype: dict[str, dict[str, dict[str, float]]]
+    """
+    values: dict[str, dict[str, dict[str, list[float]]]] = {}
+    for run in runs:
+        if run['algorithm'] in algorithms and run['status'] == 'ok' and run[statistic] is not None:
+            by_algorithm = values.setdefault(run['file'], {})
+            by_algorithm.setdefault(run['algorithm'], {}).setdefault(run['load'], []).append(run[statistic])
+    return {file: {algorithm: {load: aggregate(by_load[load]) for load in by_load}
+                   for algorithm, by_load in sorted(by_algorithm.items(), key=lambda item: algorithms.index(item[0]))}
+            for file, by_algorithm in sorted(values.items())}
+
+
+def plot_by_load(by_algorithm: dict[str, dict[str, float]], title: str, ylabel: str,
+                 upper_bound: Optional[float] = None, ylim: Optional[tuple[float, float]] = None) -> plt.Figure:
+    """
+    Draws a bar chart of a statistic by semester load, with a bar for every algorithm.
+
+    :param by_algorithm: The values of the statistic, by algorithm and load name.
+    :type by_algorithm: dict[str, dict[str, float]]
+    :param title: The title of the chart.
+    :type title: str
+    :param ylabel: The label of the statistic.
+    :type ylabel: str
+    :param upper_bound: An upper bound of the statistic, drawn as a dashed red line.
+    :type upper_bound: Optional[float]
+    :param ylim: The limits of the y axis (default: matplotlib's).
+    :type ylim: Optional[tuple[float, float]]
+    :return: The figure.
+    :rtype: plt.Figure
+    """
+    loads = [load.name for load in DegreeLoad]
+    width = 0.8 / max(len(by_algorithm), 1)
+    figure, ax = plt.subplots(figsize=(12, 8))
+    for i, (algorithm, by_load) in enumerate(by_algorithm.items()):
+        positions = [j + (i - (len(by_algorithm) - 1) / 2) * width for j, load in enumerate(loads) if load in by_load]
+        heights = [by_load[load] for load in loads if load in by_load]
+        bars = ax.bar(positions, heights, width, label=algorithm_label(algorithm))
+        ax.bar_label(bars, fmt='%.2f', padding=10)
+    if upper_bound is not None:
+        ax.axhline(y=upper_bound, color='red', linestyle='--', label=f'Upper Bound ({upper_bound:.2f})')
+    ax.set_title(title)
+    ax.set_ylabel(ylabel)
+    ax.set_xlabel('Semester Load')
+    ax.set_xticks(range(len(loads)), [load.capitalize() for load in loads])
+    if ylim is not None:
+        ax.set_ylim(*ylim)
+    ax.grid(True)
+    ax.legend(title='Algorithm', loc='upper right', borderaxespad=0.1)
+    return figure
+
+
+def save_figure(figure: plt.Figure, output_dir: str, name: str, show: bool = False) -> str:
+    """
+    Writes a figure to a PNG file, and closes it unless it should be shown.
+
+    :param figure: The figure.
+    :type figure: plt.Figure
+    :param output_dir: The directory of the file, which is created if needed.
+    :type output_dir: str
+    :param name: The file name, without the extension.
+    :type name: str
+    :param show: Whether to keep the figure open, to show it with plt.show().
+    :type show: bool
+    :return: The path of the file.
+    :rtype: str
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    path = os.path.join(output_dir, f"{name}.png")
+    figure.savefig(path, bbox_inches='tight')
+    if not show:
+        plt.close(figure)
+    return path
+
+
+def add_store_arguments(parser: argparse.ArgumentParser, output_dir: str):
+    """
+    Adds the arguments of the results store and of the output to the parser of a plotting script.
+
+    :param parser: The parser of the script.
+    :type parser: argparse.ArgumentParser
+    :param output_dir: The default directory of the plots.
+    :type output_dir: str
+    """
+    parser.add_argument('--store', default=DEFAULT_STORE_PATH, help="results store to read")
+    parser.add_argument('--output-dir', default=output_dir, help="directory of the plots")
+    parser.add_argument('--hostname', default=platform.node(), help="plot the results of this machine")
+    parser.add_argument('--all-hosts', action='store_true', help="plot the results of all machines")
+    parser.add_argument('--show', action='store_true', help="also show the plots")
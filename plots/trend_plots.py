@@ -0,0 +1,89 @@
+import argparse
+import os
+import statistics
+from typing import Optional
+
+import matplotlib.pyplot as plt
+
+from benchmarks.results_store import ResultsStore
+from plots.plot_utils import DEFAULT_DASHBOARD_DIR, add_store_arguments, algorithm_label, save_figure
+
+# the statistics of the trend plots: (statistic, aggregate, label)
+TREND_STATISTICS = [('wall_seconds', statistics.median, 'Median Execution Time (seconds)'),
+                    ('expanded', statistics.mean, 'Mean Expanded Nodes')]
+
+
+def commit_label(run: dict) -> str:
+    """
+    Returns the label of the commit a run measured: its abbreviated hash, with a '+' if the tree had uncommitted
+    changes.
+
+    :param run: The run, as the results store returns it.
+    :type run: dict
+    :return: The label of the commit.
+    :rtype: str
+    """
+    return f"{(run['git_commit'] or 'unknown')[:8]}{'+' if run['git_dirty'] else ''}"
+
+
+def plot_trends(runs: list[dict], output_dir: str, show: bool = False) -> list[str]:
+    """
+    Plots the execution time and the expanded nodes of every algorithm across the commits the runs measured, for
+    every catalog and semester load. The commits are ordered by their commit time.
+
+    :param runs: The runs, as the results store returns them.
+    :type runs: list[dict]
+    :param output_dir: The directory of the plots.
+    :type output_dir: str
+    :param show: Whether to keep the figures open, to show them with plt.show().
+    :type show: bool
+    :return: The paths of the plots.
+    :rtype: list[str]
+    """
+    runs = sorted((run for run in runs if run['status'] == 'ok'),
+                  key=lambda run: (run['commit_time'] or run['created'], run['created']))
+    commits = list(dict.fromkeys(commit_label(run) for run in runs))
+    groups: dict[tuple[str, str], dict[str, dict[str, list[dict]]]] = {}
+    for run in runs:
+        by_algorithm = groups.setdefault((run['file'], run['load']), {})
+        by_algorithm.setdefault(run['algorithm'], {}).setdefault(commit_label(run), []).append(run)
+
+    paths = []
+    for (file_name, load), by_algorithm in sorted(groups.items()):
+        figure, axes = plt.subplots(len(TREND_STATISTICS), 1, figsize=(12, 8), sharex=True)
+        for ax, (statistic, aggregate, label) in zip(axes, TREND_STATISTICS):
+            for algorithm, by_commit in by_algorithm.items():
+                points = [(commits.index(commit), aggregate(values)) for commit, commit_runs in by_commit.items()
+                          if (values := [run[statistic] for run in commit_runs if run[statistic] is not None])]
+                if points:
+                    ax.plot(*zip(*points), marker='o', label=algorithm_label(algorithm))
+            ax.set_ylabel(label)
+            ax.grid(True)
+        axes[0].set_title(f'Trends for "{file_name}" with a {load.lower()} semester load')
+        axes[0].legend(title='Algorithm', loc='upper right', borderaxespad=0.1)
+        axes[-1].set_xticks(range(len(commits)), commits, rotation=45, ha='right')
+        axes[-1].set_xlabel('Commit')
+        name = f"{os.path.splitext(file_name)[0]}_{load.lower()}"
+        paths.append(save_figure(figure, output_dir, name, show))
+    return paths
+
+
+def main(argv: Optional[list[str]] = None):
+    """
+    Plots the trends of all the runs of the results store.
+
+    :param argv: The command line arguments (default: sys.argv[1:]).
+    :type argv: Optional[list[str]]
+    """
+    parser = argparse.ArgumentParser(description="Plots the execution time and expansion trends across commits.")
+    add_store_arguments(parser, os.path.join(DEFAULT_DASHBOARD_DIR, "trends"))
+    args = parser.parse_args(argv)
+    runs = ResultsStore(args.store).runs(None if args.all_hosts else args.hostname)
+    for path in plot_trends(runs, args.output_dir, args.show):
+        print(f"Wrote {path}")
+    if args.show:
+        plt.show()
+
+
+if __name__ == '__main__':
+    main()
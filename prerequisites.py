@@ -21,6 +21,17 @@ class Prerequisites:
         """
         self.__cnf_course_numbers = cnf_course_numbers
 
+    @property
+    def cnf_course_numbers(self) -> set[frozenset[int]]:
+        """
+        Returns the clauses of the prerequisites.
+
+        :return: A set of frozensets, each representing a clause of course numbers, or None if there are no
+            prerequisites.
+        :rtype: set[frozenset[int]]
+        """
+        return self.__cnf_course_numbers
+
     def meets_prerequisites(self, course_numbers: set[int]) -> bool:
         """
         Checks if the given set of courses satisfies the prerequisites.
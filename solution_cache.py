@@ -0,0 +1,262 @@
+import contextlib
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from typing import Any, Iterator, Optional, Union
+
+from compiled_catalog import catalog_arrays, content_hash
+from course import Course
+from local_search.local_degree_plan import LocalDegreePlan
+
+DEFAULT_CACHE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".dpp_cache.sqlite")
+
+
+class SolutionCache:
+    """
+    A persistent cache of search results in a local SQLite database.
+
+    Every entry holds the solution of one run, its number of expanded nodes and its duration, under a key that
+    identifies the inputs of the run (see `key`). The cache is bounded by the total size of the stored solutions:
+    when it grows beyond max_bytes, the least recently used entries are evicted.
+    """
+
+    # the version of the searches' results, which is part of every key: bump it when a change to the searches
+    # changes the plans or the expanded nodes of runs with the same inputs, so older results are never returned
+    SEARCH_VERSION = 3
+
+    def __init__(self, path: str = DEFAULT_CACHE_PATH, max_bytes: int = 64 * 2 ** 20):
+        """
+        Opens the cache database, creating it if it does not exist.
+
+        :param path: The path of the SQLite database.
+        :type path: str
+        :param max_bytes: The maximal total size of the stored solutions, in bytes.
+        :type max_bytes: int
+        """
+        self.__path = path
+        self.__max_bytes = max_bytes
+        with self.__connect() as connection:
+            connection.execute("""CREATE TABLE IF NOT EXISTS solutions (
+                                      key TEXT PRIMARY KEY,
+                                      inputs TEXT NOT NULL,
+                                      solution TEXT NOT NULL,
+                                      expanded INTEGER NOT NULL,
+                                      seconds REAL NOT NULL,
+                                      size INTEGER NOT NULL,
+                                      created REAL NOT NULL,
+                                      last_used REAL NOT NULL)""")
+            connection.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+
+    @staticmethod
+    def key(catalog_hash: str, algorithm: str, semester_points: tuple[int, int], params: dict[str, Any],
+            seed: Optional[int]) -> str:
+        """
+        Builds the cache key of a run from all of its inputs and the version of the searches (see SEARCH_VERSION).
+
+        :param catalog_hash: The content hash of the catalog (see `catalog_hash`).
+        :type catalog_hash: str
+        :param algorithm: The algorithm name, as given to dpp.py.
+        :type algorithm: str
+        :param semester_points: The minimum and maximum points of a semester (the DegreeLoad bounds).
+        :type semester_points: tuple[int, int]
+        :param params: The parameters of the algorithm, which must be JSON serializable.
+        :type params: dict[str, Any]
+        :param seed: The random seed of the run, or None for deterministic algorithms.
+        :type seed: Optional[int]
+        :return: The hexadecimal SHA-256 hash of the inputs.
+        :rtype: str
+        """
+        inputs = json.dumps([SolutionCache.SEARCH_VERSION, catalog_hash, algorithm, list(semester_points), params,
+                             seed], sort_keys=True)
+        return hashlib.sha256(inputs.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def search_params(initializer: Optional[str] = None, repair: bool = False,
+                      budget: Optional[dict[str, Union[int, float]]] = None) -> dict[str, Any]:
+        """
+        Builds the search parameters of a cache key (see `key`). Every caller (the command line and the planning
+        service) builds them here, so the same run has the same key wherever it is started from.
+
+        :param initializer: The resolved initializer of a local search, or None for graph searches.
+        :type initializer: Optional[str]
+        :param repair: Whether the plan of a local search is repaired.
+        :type repair: bool
+        :param budget: The budgets of a local search, e.g. {'max_evaluations': 1000} (default: none).
+        :type budget: Optional[dict[str, Union[int, float]]]
+        :return: The search parameters.
+        :rtype: dict[str, Any]
+        """
+        return {'initializer': initializer, 'repair': repair, 'budget': budget or {}}
+
+    def get(self, key: str) -> Optional[tuple[dict, int, float]]:
+        """
+        Looks up a run in the cache, and marks it as recently used.
+
+        :param key: The cache key of the run (see `key`).
+        :type key: str
+        :return: The encoded solution (see `encode_solution`), the number of expanded nodes and the duration of
+            the run in seconds, or None if the run is not in the cache.
+        :rtype: Optional[tuple[dict, int, float]]
+        """
+        with self.__connect() as connection:
+            row = connection.execute("SELECT solution, expanded, seconds FROM solutions WHERE key = ?",
+                                     (key,)).fetchone()
+            if row is None:
+                return None
+            connection.execute("UPDATE solutions SET last_used = ? WHERE key = ?", (time.time(), key))
+        solution, expanded, seconds = row
+        return json.loads(solution), expanded, seconds
+
+    def put(self, key: str, solution: dict, expanded: int, seconds: float, inputs: Optional[dict] = None):
+        """
+        Stores a run in the cache, replacing an older run with the same key, and evicts the least recently used
+        runs if the cache is too large.
+
+        :param key: The cache key of the run (see `key`).
+        :type key: str
+        :param solution: The encoded solution (see `encode_solution`).
+        :type solution: dict
+        :param expanded: The number of nodes expanded by the run.
+        :type expanded: int
+        :param seconds: The duration of the run in seconds.
+        :type seconds: float
+        :param inputs: A readable description of the inputs of the run, stored for inspection only.
+        :type inputs: Optional[dict]
+        """
+        encoded = json.dumps(solution)
+        now = time.time()
+        with self.__connect() as connection:
+            connection.execute("INSERT OR REPLACE INTO solutions VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                               (key, json.dumps(inputs or {}), encoded, expanded, seconds, len(encoded), now, now))
+            self.__evict(connection)
+
+    def clear(self):
+        """
+        Removes all the runs from the cache.
+        """
+        with self.__connect() as connection:
+            connection.execute("DELETE FROM solutions")
+
+    def __len__(self) -> int:
+        """
+        Returns the number of runs in the cache.
+
+        :return: The number of cached runs.
+        :rtype: int
+        """
+        with self.__connect() as connection:
+            return connection.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+    @property
+    def path(self) -> str:
+        """
+        Returns the path of the cache database.
+
+        :return: The path of the SQLite database.
+        :rtype: str
+        """
+        return self.__path
+
+    @property
+    def size(self) -> int:
+        """
+        Returns the total size of the stored solutions.
+
+        :return: The size in bytes.
+        :rtype: int
+        """
+        with self.__connect() as connection:
+            return connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+
+    def __evict(self, connection: sqlite3.Connection):
+        """
+        Deletes the least recently used runs until the total size of the stored solutions is at most max_bytes.
+
+        :param connection: An open connection to the cache database.
+        :type connection: sqlite3.Connection
+        """
+        total = connection.execute("SELECT COALESCE(SUM(size), 0) FROM solutions").fetchone()[0]
+        if total <= self.__max_bytes:
+            return
+        evicted = []
+        for key, size in connection.execute("SELECT key, size FROM solutions ORDER BY last_used"):
+            if total <= self.__max_bytes:
+                break
+            evicted.append((key,))
+            total -= size
+        connection.executemany("DELETE FROM solutions WHERE key = ?", evicted)
+
+    @contextlib.contextmanager
+    def __connect(self) -> Iterator[sqlite3.Connection]:
+        """
+        Opens a connection to the cache database, which commits and closes when the context exits.
+
+        :return: A context manager of the connection.
+        :rtype: Iterator[sqlite3.Connection]
+        """
+        directory = os.path.dirname(self.__path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        connection = sqlite3.connect(self.__path, timeout=30)
+        try:
+            with connection:
+                yield connection
+        finally:
+            connection.close()
+
+
+def catalog_hash(mandatory_points: int, target_points: int, degree_courses: list[Course]) -> str:
+    """
+    Computes the content hash of a catalog, the same way as the compiled catalogs do (see
+    `compiled_catalog.content_hash`).
+
+    :param mandatory_points: Total mandatory points required for the degree.
+    :type mandatory_points: int
+    :param target_points: Total points required to complete the degree.
+    :type target_points: int
+    :param degree_courses: List of available courses (offerings) for the degree.
+    :type degree_courses: list[Course]
+    :return: The hexadecimal SHA-256 hash.
+    :rtype: str
+    """
+    return content_hash(mandatory_points, target_points, catalog_arrays(degree_courses))
+
+
+def encode_solution(solution: Union[LocalDegreePlan, Optional[list[Course]]]) -> dict:
+    """
+    Encodes a solution of dpp.py as a JSON serializable dictionary that only holds course numbers.
+
+    :param solution: The solution: a LocalDegreePlan, a list of Course objects (from a graph search), or None.
+    :type solution: Union[LocalDegreePlan, Optional[list[Course]]]
+    :return: The encoded solution.
+    :rtype: dict
+    """
+    if isinstance(solution, LocalDegreePlan):
+        return {'kind': 'plan', 'semesters': sorted(solution.course_semesters.items())}
+    if solution:
+        return {'kind': 'courses', 'courses': [[c.number, c.semester_type] for c in solution]}
+    return {'kind': 'none'}
+
+
+def decode_solution(encoded: dict, degree_courses: list[Course]) -> Union[LocalDegreePlan, Optional[list[Course]]]:
+    """
+    Decodes a solution encoded by `encode_solution`, with the Course objects of the catalog.
+
+    :param encoded: The encoded solution.
+    :type encoded: dict
+    :param degree_courses: List of available courses (offerings) for the degree.
+    :type degree_courses: list[Course]
+    :return: The solution, of the same type as the encoded one.
+    :rtype: Union[LocalDegreePlan, Optional[list[Course]]]
+    """
+    offerings = {(c.number, c.semester_type): c for c in degree_courses}
+    if encoded['kind'] == 'plan':
+        semesters: list[set[Course]] = [set() for _ in range(max((s for _, s in encoded['semesters']), default=-1) + 1)]
+        for number, semester in encoded['semesters']:
+            semesters[semester].add(offerings[number, "A" if semester % 2 == 0 else "B"])
+        return LocalDegreePlan.from_semesters(semesters)
+    if encoded['kind'] == 'courses':
+        return [offerings[number, semester_type] for number, semester_type in encoded['courses']]
+    return None